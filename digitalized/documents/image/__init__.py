@@ -1,27 +1,192 @@
-from typing import Union, Callable, Any
+from typing import Union, Callable, Any, IO
+from functools import partial
 from io import BytesIO
 import zipfile
 from .image import (
     ImageObject, BuilderInterfaceImage, LibImage,
-    image_bytes_to_opencv, image_opencv_to_bytes, ImageExtension
+    image_bytes_to_opencv, image_opencv_to_bytes, ImageExtension, ImageMetadata,
+    image_opencv_to_pil, image_pil_to_opencv, ColorMode, probe_image_format,
+)
+from .preprocess import PreprocessPipeline, MorphologyOp
+from .parallel import run_parallel, apply_operations
+from .cache import PreprocessCache, CacheStats, get_preprocess_cache, set_preprocess_cache
+from .tiles import TiledExecutor, get_tiled_executor, set_tiled_executor
+from .crop import CropBox, find_content_box
+from .orientation import OrientationEstimate, estimate_orientation, estimate_skew
+from .spill import SpillStore, SpillStats
+from .codec import CodecPreset, CODEC_PRESETS, CodecOptions, get_codec_options
+from .phash import ImageHash, HashMethod, DuplicateIndex, compute_hash, hamming_distance
+from .shared import (
+    SharedImageHandle, SharedImageStore, share_image, load_shared_image, run_shared_item, run_shared_stage,
+)
+from .lazy import ImageSource, FileImageSource, LazyImageStream
+from .tiff import TiffImageSource, TiffWriter, iter_tiff_frames, write_tiff
+from .loader import BulkImageLoader, LoadResult, LoaderInput
+from .blank import BlankPageDetector, BlankPageStats, BlankPageReport, PageClass, BlankPagePolicy
+from .binarize import (
+    threshold_local_mean, local_mean, integral_image, local_mean_std,
+    threshold_local, threshold_sauvola, threshold_niblack, BinarizeMethod,
 )
 from digitalized.types.array import ArrayList, T
 from soup_files import File, Directory, InputFiles
 
 
 class ImageStream(ArrayList[ImageObject]):
+    """
+        Lista de ImageObject. Com um SpillStore (spill_store=...) as imagens mais antigas
+    são gravadas em disco quando a memória passa do limite e carregadas de volta no
+    acesso, a API de lista não muda.
+    """
 
-    def __init__(self, items: list[ImageObject] = None, lib_image: LibImage = "opencv", **kwargs) -> None:
+    def __init__(
+                self,
+                items: list[ImageObject] = None,
+                lib_image: LibImage = "opencv", *,
+                spill_store: SpillStore | None = None,
+                **kwargs
+            ) -> None:
         super().__init__(items)
         self.__lib_img: LibImage = lib_image
+        self.__spill_store: SpillStore | None = None
+        if spill_store is not None:
+            self.set_spill_store(spill_store)
+
+    # -------------------------------------------------------------------------#
+    # Spill em disco
+    # -------------------------------------------------------------------------#
+    def get_spill_store(self) -> SpillStore | None:
+        return self.__spill_store
+
+    def set_spill_store(self, store: SpillStore | None):
+        """Passa a usar store (None desativa) para todas as imagens da lista."""
+        self.__spill_store = store
+        if store is not None:
+            for img in super().__iter__():
+                store.add(img.get_implementation())
+
+    def get_memory_stats(self) -> SpillStats:
+        """Bytes/imagens em memória e em disco, quantidade de gravações e leituras."""
+        if self.__spill_store is not None:
+            return self.__spill_store.get_stats()
+        stats = SpillStats()
+        for img in super().__iter__():
+            stats.resident_items += 1
+            stats.resident_bytes += img.get_resident_bytes()
+        return stats
+
+    def __track(self, img: ImageObject):
+        if self.__spill_store is not None and isinstance(img, ImageObject):
+            self.__spill_store.add(img.get_implementation())
+
+    def append(self, img: ImageObject):
+        super().append(img)
+        self.__track(img)
+
+    def insert(self, index: int, img: ImageObject):
+        super().insert(index, img)
+        self.__track(img)
+
+    def extend(self, images):
+        for img in images:
+            self.append(img)
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        if isinstance(index, slice):
+            for img in value:
+                self.__track(img)
+        else:
+            self.__track(value)
+
+    def __getitem__(self, index):
+        item = super().__getitem__(index)
+        if self.__spill_store is not None and isinstance(item, ImageObject):
+            # A imagem lida pode ser carregada de volta, outra vai para o disco.
+            self.__spill_store.enforce(keep=item.get_implementation())
+        return item
+
+    def __iter__(self):
+        if self.__spill_store is None:
+            return super().__iter__()
+        return self.__iter_spilled()
+
+    def __iter_spilled(self):
+        for img in super().__iter__():
+            yield img
+            self.__spill_store.enforce(keep=img.get_implementation())
 
     def apply(self, func: Callable[[ImageObject], Any]) -> ArrayList[Any]:
         return ArrayList([func(item) for item in self])
 
+    def parallel_apply(
+                self,
+                func: Callable[[ImageObject], Any], *,
+                workers: int = None,
+                return_exceptions: bool = False,
+                shared_memory: bool = False,
+            ) -> ArrayList[Any]:
+        """
+            Igual a apply(), porém cada imagem é processada em um pool de processos.
+        As imagens são enviadas como pixels brutos (sem PNG) e a ordem é mantida.
+
+        :param func: Função no nível do módulo (serializável com pickle).
+        :param workers: Quantidade de processos, padrão os.cpu_count().
+        :param return_exceptions: Retorna a exceção na posição do item em vez de propagar.
+        :param shared_memory: Os pixels vão e voltam por memória compartilhada (ver
+            SharedImageStore), os processos trocam apenas handles.
+        """
+        if not shared_memory:
+            return run_parallel(func, self, workers=workers, return_exceptions=return_exceptions)
+        with SharedImageStore() as store:
+            handles = [store.put(img) for img in self]
+            results = run_parallel(
+                partial(run_shared_item, func), handles, workers=workers, return_exceptions=return_exceptions
+            )
+            for result in results:
+                if isinstance(result, SharedImageHandle):
+                    store.adopt(result)
+            # As imagens carregadas continuam válidas após close() (segmentos já mapeados).
+            return ArrayList([
+                store.load(r) if isinstance(r, SharedImageHandle) else r for r in results
+            ])
+
+    def parallel_apply_operations(self, *, workers: int = None, shared_memory: bool = False):
+        """
+            Executa as operações pendentes (rotação, fundo, desfoque...) de todas
+        as imagens em paralelo, substituindo os itens pelos resultados.
+        """
+        results = self.parallel_apply(apply_operations, workers=workers, shared_memory=shared_memory)
+        for num, img in enumerate(results):
+            self[num] = img
+
     def set_landscape(self):
         for num, img in enumerate(self):
             self[num].set_landscape()
 
+    def get_duplicates(
+                self, *, method: HashMethod = "dhash", max_distance: int = 4, size: int = 8
+            ) -> list[int | None]:
+        """
+            Para cada imagem, o índice da primeira imagem anterior quase igual
+        (distância de Hamming do hash perceptual <= max_distance), ou None.
+        """
+        index = DuplicateIndex(max_distance=max_distance, method=method, size=size)
+        return [index.match_or_add(num, img.get_hash(method, size)) for num, img in enumerate(self)]
+
+    def get_unique(
+                self, *, method: HashMethod = "dhash", max_distance: int = 4, size: int = 8
+            ) -> "ImageStream":
+        """Nova lista sem as imagens repetidas (mantém a primeira de cada grupo)."""
+        duplicates = self.get_duplicates(method=method, max_distance=max_distance, size=size)
+        return ImageStream(
+            [img for img, dup in zip(self, duplicates) if dup is None], lib_image=self.get_current_library()
+        )
+
+    def set_codec_preset(self, preset: CodecPreset):
+        """Preset de codificação (fast, balanced, smallest) de todas as imagens da lista."""
+        for img in self:
+            img.set_codec_preset(preset)
+
     def get_current_library(self) -> LibImage:
         return self.__lib_img
 
@@ -49,20 +214,79 @@ class ImageStream(ArrayList[ImageObject]):
         _imgs = InputFiles(dir_img).images
         self.add_files_image(_imgs)
 
-    def to_zip(self, prefix: str = None) -> BytesIO:
+    def add_tiff_file(self, file: File):
+        """Adiciona as páginas de um TIFF, decodificadas uma de cada vez."""
+        for img in iter_tiff_frames(file, library=self.get_current_library()):
+            self.add_image(img)
+
+    def load_files_image(self, files: LoaderInput, *, concurrency: int = 8) -> list[LoadResult]:
+        """
+            Igual a add_files_image()/add_dir_image(), porém os arquivos são lidos e
+        decodificados em paralelo (no máximo concurrency ao mesmo tempo). As imagens
+        são adicionadas na ordem dos arquivos, arquivos com erro são ignorados.
+
+        :param files: Lista de arquivos, InputFiles ou Directory.
+        :return: Os arquivos que não puderam ser lidos (LoadResult.error).
+        """
+        errors: list[LoadResult] = []
+        loader = BulkImageLoader(concurrency=concurrency, library=self.get_current_library())
+        for result in loader.iter_load(files):
+            if result.is_ok():
+                self.add_image(result.image)
+            else:
+                errors.append(result)
+        return errors
+
+    @classmethod
+    def create_lazy_from_files(
+                cls, files: list[File], *, lib_image: LibImage = "opencv", prefetch: int = 2
+            ) -> LazyImageStream:
+        """Igual a add_files_image(), porém as imagens são lidas apenas durante a iteração."""
+        return LazyImageStream.create_from_files(files, library=lib_image, prefetch=prefetch)
+
+    @classmethod
+    def create_lazy_from_dir(
+                cls, dir_img: Directory, *, lib_image: LibImage = "opencv", prefetch: int = 2
+            ) -> LazyImageStream:
+        """Igual a add_dir_image(), porém as imagens são lidas apenas durante a iteração."""
+        return LazyImageStream.create_from_dir(dir_img, library=lib_image, prefetch=prefetch)
+
+    @classmethod
+    def create_lazy_from_tiff(
+                cls, file: File, *, lib_image: LibImage = "opencv", prefetch: int = 2
+            ) -> LazyImageStream:
+        """Páginas de um TIFF lidas apenas durante a iteração."""
+        return LazyImageStream(TiffImageSource(file, library=lib_image), prefetch=prefetch)
+
+    def to_zip(self, prefix: str = None, *, extension: ImageExtension | None = None) -> BytesIO:
+        """
+        :param extension: Formato das imagens (png, jpg, webp, tiff), None mantém os bytes
+            originais das imagens não alteradas e usa get_output_extension() nas demais.
+        """
         if prefix is None:
             prefix = 'imagem'
         # Salvar em zip
         buff_zip = BytesIO()
         with zipfile.ZipFile(buff_zip, "w") as zipf:
             for num, img in enumerate(self):
+                img_bytes = img.encode(extension)
+                # Extensão do formato real dos bytes (ex: JPEG original sem recodificar).
                 zipf.writestr(
-                    f'{prefix}-{num+1}.{img.get_output_extension()}',
-                    img.to_bytes(),
+                    f'{prefix}-{num+1}.{probe_image_format(img_bytes) or "png"}',
+                    img_bytes,
                 )
         # Salvar o zip em disco para download
         buff_zip.seek(0)
         return buff_zip
 
+    def to_tiff(self, output: Union[File, IO[bytes], None] = None, *, preset: CodecPreset = "balanced") -> IO[bytes]:
+        """
+            Grava as imagens em um TIFF com várias páginas (Group 4 nas páginas binárias,
+        LZW/Deflate do preset nas demais), uma página de cada vez.
+
+        :param output: Arquivo ou buffer, None retorna um novo BytesIO.
+        """
+        return write_tiff(self, output, preset=preset)
+
     def to_files(self, output_dir: Directory, *, prefix: str = None):
         pass
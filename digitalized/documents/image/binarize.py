@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+#
+"""
+    Binarização de imagens em escala de cinza com NumPy.
+
+- Tabelas (LUT) de 256 entradas para inversão/threshold global, combinadas em
+  uma única tabela para o Image.point() do PIL (uma única passagem).
+- Threshold adaptativo (média local) calculado com imagem integral, custo O(1)
+  por pixel independente do tamanho do bloco.
+- Sauvola e Niblack (média e desvio padrão locais, também por imagens integrais),
+  com execução em faixas paralelas para páginas grandes.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Literal, Sequence
+import math
+import os
+import numpy as np
+
+BinarizeMethod = Literal["sauvola", "niblack"]
+
+# Páginas com mais pixels que isso são processadas em faixas paralelas (modo automático).
+TILE_MIN_PIXELS: int = 4_000_000
+TILE_ROWS: int = 512
+
+Lut = list[int]
+
+# Tabela de inversão (255 - x).
+LUT_INVERT: Lut = [255 - x for x in range(256)]
+
+
+def create_threshold_lut(threshold: int = 128, *, above: int = 255, below: int = 0) -> Lut:
+    """Threshold global: x > threshold => above, senão below."""
+    return [above if x > threshold else below for x in range(256)]
+
+
+def combine_luts(*luts: Sequence[int]) -> Lut:
+    """
+        Combina as tabelas na ordem em que seriam aplicadas, o resultado
+    aplica todas elas em um único Image.point().
+    """
+    result: Lut = list(range(256))
+    for lut in luts:
+        result = [lut[x] for x in result]
+    return result
+
+
+def integral_image(gray: np.ndarray, dtype: type = np.uint32) -> np.ndarray:
+    """
+        Imagem integral com uma linha/coluna de zeros no início: ii[y, x] é a soma
+    de gray[:y, :x].
+
+        Com inteiros sem sinal a soma total pode estourar, mas a diferença usada
+    em box_sum() continua correta (aritmética modular) enquanto a soma de um único
+    bloco couber no tipo.
+    """
+    h, w = gray.shape[:2]
+    ii = np.zeros((h + 1, w + 1), dtype=dtype)
+    np.cumsum(gray, axis=0, dtype=dtype, out=ii[1:, 1:])
+    np.cumsum(ii[1:, 1:], axis=1, dtype=dtype, out=ii[1:, 1:])
+    return ii
+
+
+def box_sum(ii: np.ndarray, block_size: int, shape: tuple) -> np.ndarray:
+    """
+        Soma de cada bloco block_size x block_size de uma imagem integral calculada
+    sobre a imagem com borda de block_size // 2 pixels.
+    """
+    h, w = shape[:2]
+    b = block_size
+    return ii[b:b + h, b:b + w] - ii[0:h, b:b + w] - ii[b:b + h, 0:w] + ii[0:h, 0:w]
+
+
+def check_block_size(block_size: int):
+    if block_size < 3 or block_size % 2 == 0:
+        raise ValueError(f'block_size deve ser ímpar e >= 3, não {block_size}')
+
+
+def local_mean(gray: np.ndarray, block_size: int = 11) -> np.ndarray:
+    """Média de cada vizinhança block_size x block_size (borda replicada), em float32."""
+    check_block_size(block_size)
+    padded = np.pad(gray, block_size // 2, mode='edge')
+    total = box_sum(integral_image(padded), block_size, gray.shape)
+    return total.astype(np.float32) / np.float32(block_size * block_size)
+
+
+def threshold_local_mean(
+            gray: np.ndarray,
+            block_size: int = 11,
+            c: float = 2, *,
+            max_value: int = 255,
+            invert: bool = False,
+        ) -> np.ndarray:
+    """
+        Threshold adaptativo pela média local (mesmo resultado de cv2.ADAPTIVE_THRESH_MEAN_C):
+    pixel > média - c => max_value, senão 0. Com invert=True o resultado é invertido.
+    """
+    # Média arredondada e c arredondado para cima, como no OpenCV.
+    limit = np.rint(local_mean(gray, block_size)).astype(np.int16) - np.int16(math.ceil(c))
+    mask = gray > limit
+    if invert:
+        np.logical_not(mask, out=mask)
+    return mask.astype(np.uint8) * np.uint8(max_value)
+
+
+def _mean_std_padded(padded: np.ndarray, block_size: int, shape: tuple) -> tuple[np.ndarray, np.ndarray]:
+    # As somas são inteiras (exatas), apenas média/variância usam float32.
+    area = np.float32(block_size * block_size)
+    mean = box_sum(integral_image(padded), block_size, shape).astype(np.float32)
+    mean /= area
+    # Soma dos quadrados de um bloco pode passar de 32 bits, usa 64 bits.
+    var = box_sum(
+        integral_image(np.square(padded, dtype=np.uint32), np.uint64), block_size, shape
+    ).astype(np.float32)
+    var /= area
+    var -= mean * mean
+    np.maximum(var, 0, out=var)
+    return mean, np.sqrt(var, out=var)
+
+
+def local_mean_std(gray: np.ndarray, block_size: int = 25) -> tuple[np.ndarray, np.ndarray]:
+    """Média e desvio padrão de cada vizinhança block_size x block_size (borda replicada)."""
+    check_block_size(block_size)
+    padded = np.pad(gray, block_size // 2, mode='edge')
+    return _mean_std_padded(padded, block_size, gray.shape)
+
+
+def _create_threshold_function(
+            method: BinarizeMethod, block_size: int, k: float, r: float
+        ) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """Retorna f(faixa com borda, faixa original) => faixa binarizada (texto 0, fundo 255)."""
+
+    def _run(padded: np.ndarray, gray: np.ndarray) -> np.ndarray:
+        mean, std = _mean_std_padded(padded, block_size, gray.shape)
+        if method == "sauvola":
+            # T = m * (1 + k * (s / R - 1))
+            limit = mean * (1 + np.float32(k) * (std / np.float32(r) - 1))
+        else:
+            # T = m + k * s
+            limit = mean + np.float32(k) * std
+        return (gray > limit).astype(np.uint8) * np.uint8(255)
+    return _run
+
+
+def threshold_local(
+            gray: np.ndarray,
+            method: BinarizeMethod = "sauvola",
+            block_size: int = 25,
+            k: float | None = None,
+            r: float = 128, *,
+            tile_rows: int | None = None,
+            workers: int | None = None,
+        ) -> np.ndarray:
+    """
+        Binarização Sauvola ou Niblack: pixel > T => 255 (fundo), senão 0 (texto).
+
+    :param k: Padrão 0.2 (sauvola) ou -0.2 (niblack).
+    :param r: Faixa dinâmica do desvio padrão (apenas sauvola).
+    :param tile_rows: Altura das faixas processadas em paralelo. None = automático
+        (faixas de TILE_ROWS linhas para páginas com mais de TILE_MIN_PIXELS pixels),
+        0 = página inteira de uma vez.
+    :param workers: Threads usadas nas faixas, padrão os.cpu_count().
+    """
+    if method not in ("sauvola", "niblack"):
+        raise ValueError(f'Use {BinarizeMethod}, não {method}')
+    check_block_size(block_size)
+    if k is None:
+        k = 0.2 if method == "sauvola" else -0.2
+    if tile_rows is None:
+        tile_rows = TILE_ROWS if gray.size > TILE_MIN_PIXELS else 0
+
+    func = _create_threshold_function(method, block_size, k, r)
+    halo = block_size // 2
+    padded = np.pad(gray, halo, mode='edge')
+    height = gray.shape[0]
+    if tile_rows <= 0 or tile_rows >= height:
+        return func(padded, gray)
+
+    # Cada faixa recebe halo linhas acima e abaixo, o resultado é idêntico ao da página inteira.
+    out = np.empty_like(gray, dtype=np.uint8)
+
+    def _run_tile(y: int):
+        end = min(y + tile_rows, height)
+        out[y:end] = func(padded[y:end + 2 * halo], gray[y:end])
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        list(executor.map(_run_tile, range(0, height, tile_rows)))
+    return out
+
+
+def threshold_sauvola(gray: np.ndarray, block_size: int = 25, k: float = 0.2, r: float = 128, **kwargs) -> np.ndarray:
+    return threshold_local(gray, "sauvola", block_size, k, r, **kwargs)
+
+
+def threshold_niblack(gray: np.ndarray, block_size: int = 25, k: float = -0.2, **kwargs) -> np.ndarray:
+    return threshold_local(gray, "niblack", block_size, k, **kwargs)
+
+
+__all__ = [
+    'Lut', 'LUT_INVERT', 'create_threshold_lut', 'combine_luts', 'BinarizeMethod',
+    'integral_image', 'box_sum', 'local_mean', 'threshold_local_mean', 'local_mean_std',
+    'threshold_local', 'threshold_sauvola', 'threshold_niblack',
+]
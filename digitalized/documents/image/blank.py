@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+#
+"""
+    Detecção de páginas em branco (ou quase em branco) com estatísticas de uma
+versão reduzida da imagem, para evitar OCR/filtros/conversão de páginas vazias.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Literal
+import cv2
+import numpy as np
+from digitalized.documents.image.crop import reduce_gray, create_ink_mask
+
+PageClass = Literal["blank", "near_blank", "content"]
+# skip: a página é descartada, downgrade: mantida sem OCR/em baixa resolução.
+BlankPagePolicy = Literal["skip", "downgrade"]
+
+
+@dataclass
+class BlankPageStats:
+    """Estatísticas da amostra reduzida da página."""
+    page_class: PageClass
+    ink_ratio: float
+    background: int
+    std: float
+
+    def is_blank(self) -> bool:
+        return self.page_class == "blank"
+
+
+@dataclass
+class BlankPageReport:
+    checked: int = 0
+    blank: int = 0
+    near_blank: int = 0
+    skipped: int = 0
+    downgraded: int = 0
+
+
+class BlankPageDetector(object):
+    """
+        Classifica páginas pela proporção de tinta: pixels que diferem do fundo
+    (tom mais frequente) em mais de ink_delta, medida em uma amostra de até
+    sample_size pixels no maior lado. A redução usa o mínimo (ou máximo para
+    fundo escuro) de cada bloco, então traços finos não desaparecem na amostra.
+
+    :param blank_ratio: Até essa proporção de tinta a página é 'blank'.
+    :param near_blank_ratio: Até essa proporção de tinta a página é 'near_blank'.
+    :param margin: Fração de cada borda ignorada (sombras e bordas do scanner).
+    :param render_dpi: DPI usado para renderizar páginas PDF antes da análise.
+    :param policy: O que os pipelines fazem com páginas sinalizadas (skip|downgrade).
+    :param flag_near_blank: Se True, páginas 'near_blank' também são sinalizadas.
+    :param downgrade_dpi: DPI usado na conversão de páginas rebaixadas (policy=downgrade).
+    """
+
+    def __init__(
+                self, *,
+                sample_size: int = 256,
+                ink_delta: int = 64,
+                blank_ratio: float = 0.0002,
+                near_blank_ratio: float = 0.002,
+                margin: float = 0.05,
+                render_dpi: int = 50,
+                policy: BlankPagePolicy = "skip",
+                flag_near_blank: bool = False,
+                downgrade_dpi: int = 72,
+            ):
+        if policy not in ("skip", "downgrade"):
+            raise ValueError(f'{__class__.__name__} Use {BlankPagePolicy}, não {policy}')
+        self.sample_size: int = sample_size
+        self.ink_delta: int = ink_delta
+        self.blank_ratio: float = blank_ratio
+        self.near_blank_ratio: float = near_blank_ratio
+        self.margin: float = margin
+        self.render_dpi: int = render_dpi
+        self.policy: BlankPagePolicy = policy
+        self.flag_near_blank: bool = flag_near_blank
+        self.downgrade_dpi: int = downgrade_dpi
+        self.__report: BlankPageReport = BlankPageReport()
+
+    def get_report(self) -> BlankPageReport:
+        return BlankPageReport(**vars(self.__report))
+
+    @property
+    def skipped(self) -> int:
+        return self.__report.skipped
+
+    def reset(self):
+        self.__report = BlankPageReport()
+
+    def __create_sample(self, gray: np.ndarray) -> np.ndarray:
+        h, w = gray.shape[:2]
+        my, mx = int(h * self.margin), int(w * self.margin)
+        if (h - 2 * my) > 0 and (w - 2 * mx) > 0:
+            gray = gray[my:h - my, mx:w - mx]
+        return reduce_gray(gray, self.sample_size)[0]
+
+    def analyze(self, img: np.ndarray) -> BlankPageStats:
+        """Classifica uma imagem numpy (escala de cinza ou BGR)."""
+        if img.ndim == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+        sample = self.__create_sample(img)
+        if sample.size == 0:
+            return self.__count(BlankPageStats("blank", 0.0, 255, 0.0))
+
+        # Pixels de tinta isolados (poeira, ruído do scanner) não contam.
+        mask, background = create_ink_mask(sample, self.ink_delta)
+        ink_ratio = int(np.count_nonzero(mask)) / sample.size
+        if ink_ratio <= self.blank_ratio:
+            page_class: PageClass = "blank"
+        elif ink_ratio <= self.near_blank_ratio:
+            page_class: PageClass = "near_blank"
+        else:
+            page_class: PageClass = "content"
+        return self.__count(BlankPageStats(page_class, ink_ratio, background, float(sample.std())))
+
+    def create_empty_stats(self) -> BlankPageStats:
+        """Página sem nenhum conteúdo (ex: PDF sem objetos), classificada sem renderizar."""
+        return self.__count(BlankPageStats("blank", 0.0, 255, 0.0))
+
+    def __count(self, stats: BlankPageStats) -> BlankPageStats:
+        self.__report.checked += 1
+        if stats.page_class == "blank":
+            self.__report.blank += 1
+        elif stats.page_class == "near_blank":
+            self.__report.near_blank += 1
+        return stats
+
+    def is_flagged(self, stats: BlankPageStats) -> bool:
+        """True se os pipelines devem descartar/rebaixar a página."""
+        if stats.page_class == "blank":
+            return True
+        return self.flag_near_blank and stats.page_class == "near_blank"
+
+    def add_skipped(self):
+        self.__report.skipped += 1
+
+    def add_downgraded(self):
+        self.__report.downgraded += 1
+
+    def register_flagged(self):
+        """Registra uma página sinalizada de acordo com a política (skip ou downgrade)."""
+        if self.policy == "skip":
+            self.add_skipped()
+        else:
+            self.add_downgraded()
+
+
+__all__ = [
+    'BlankPageDetector', 'BlankPageStats', 'BlankPageReport', 'PageClass', 'BlankPagePolicy',
+]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+#
+"""
+    Cache dos resultados de pré-processamento (ImageInvertColor), indexado pelo
+conteúdo da imagem, biblioteca e cadeia de operações com os parâmetros.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha1
+from threading import Lock
+import os
+import numpy as np
+from soup_files import Directory
+
+
+def create_cache_key(digest: str, library: str, operation: str) -> str:
+    """Chave do cache: (digest do conteúdo, biblioteca, operações e parâmetros)."""
+    return sha1(f'{digest}|{library}|{operation}'.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    items: int = 0
+    size: int = 0
+
+
+class PreprocessCache(object):
+    """
+        LRU em memória limitado pelo total de bytes, com cache em disco opcional.
+    Os valores são os pixels da imagem já processada (numpy, somente leitura), nada
+    é codificado: gravar e ler o cache custa apenas uma cópia de memória (.npy em disco).
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, *, cache_dir: Directory | None = None):
+        if max_bytes < 0:
+            raise ValueError(f'{__class__.__name__} max_bytes deve ser >= 0, não {max_bytes}')
+        self.__max_bytes: int = max_bytes
+        self.__cache_dir: Directory | None = cache_dir
+        self.__items: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.__size: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__disk_hits: int = 0
+        self.__lock: Lock = Lock()
+        if self.__cache_dir is not None:
+            self.__cache_dir.mkdir()
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def get_cache_dir(self) -> Directory | None:
+        return self.__cache_dir
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(self.__hits, self.__misses, self.__disk_hits, len(self.__items), self.__size)
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__items
+
+    def __get_disk_path(self, key: str) -> str:
+        return self.__cache_dir.join_file(f'{key}.npy').absolute()
+
+    def __read_disk(self, key: str) -> np.ndarray | None:
+        if self.__cache_dir is None:
+            return None
+        try:
+            data = np.load(self.__get_disk_path(key), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        data.setflags(write=False)
+        return data
+
+    def __write_disk(self, key: str, data: np.ndarray):
+        if self.__cache_dir is None:
+            return
+        path = self.__get_disk_path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'wb') as file:
+                np.save(file, data, allow_pickle=False)
+            # Troca atômica, outro processo nunca lê um arquivo incompleto.
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def __store(self, key: str, data: np.ndarray):
+        if data.nbytes > self.__max_bytes:
+            return
+        old = self.__items.pop(key, None)
+        if old is not None:
+            self.__size -= old.nbytes
+        self.__items[key] = data
+        self.__size += data.nbytes
+        while self.__size > self.__max_bytes:
+            _, removed = self.__items.popitem(last=False)
+            self.__size -= removed.nbytes
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Pixels em cache (somente leitura, copie antes de alterar) ou None."""
+        with self.__lock:
+            data = self.__items.get(key)
+            if data is not None:
+                self.__items.move_to_end(key)
+                self.__hits += 1
+                return data
+        data = self.__read_disk(key)
+        with self.__lock:
+            if data is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            self.__disk_hits += 1
+            self.__store(key, data)
+        return data
+
+    def put(self, key: str, data: np.ndarray):
+        # Cópia: a imagem de origem pode continuar sendo alterada.
+        data = np.array(data, copy=True)
+        data.setflags(write=False)
+        with self.__lock:
+            self.__store(key, data)
+        self.__write_disk(key, data)
+
+    def clear(self, *, disk: bool = False):
+        """Limpa o cache em memória (e os arquivos em disco se disk=True) e zera os contadores."""
+        with self.__lock:
+            self.__items.clear()
+            self.__size = 0
+            self.__hits = self.__misses = self.__disk_hits = 0
+        if disk and self.__cache_dir is not None:
+            for name in os.listdir(self.__cache_dir.absolute()):
+                if name.endswith('.npy'):
+                    os.remove(self.__cache_dir.join_file(name).absolute())
+
+
+# Cache global usado por ImageInvertColor, desativado por padrão.
+_PREPROCESS_CACHE: PreprocessCache | None = None
+
+
+def get_preprocess_cache() -> PreprocessCache | None:
+    return _PREPROCESS_CACHE
+
+
+def set_preprocess_cache(cache: PreprocessCache | None) -> PreprocessCache | None:
+    """
+        Ativa (ou desativa com None) o cache global de pré-processamento.
+    Retorna o cache que estava ativo.
+    """
+    global _PREPROCESS_CACHE
+    old = _PREPROCESS_CACHE
+    _PREPROCESS_CACHE = cache
+    return old
+
+
+__all__ = [
+    'PreprocessCache', 'CacheStats', 'create_cache_key',
+    'get_preprocess_cache', 'set_preprocess_cache',
+]
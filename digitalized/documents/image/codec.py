@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+#
+"""
+    Presets de codificação das imagens exportadas (to_file, to_zip...).
+
+- fast: codificação mais rápida, arquivos maiores.
+- balanced: padrão, bom tamanho sem custo alto de CPU.
+- smallest: menores arquivos, codificação mais lenta.
+
+    Imagens binárias (0 e 255) são gravadas com 1 bit por pixel: PNG bilevel e
+TIFF CCITT Group 4.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Literal, Tuple
+import cv2
+import numpy as np
+from PIL import Image
+
+CodecPreset = Literal["fast", "balanced", "smallest"]
+CODEC_PRESETS: Tuple[str, ...] = ("fast", "balanced", "smallest")
+# Formatos de saída suportados (extensão normalizada).
+CODEC_FORMATS: Tuple[str, ...] = ("png", "jpg", "webp", "tiff")
+
+
+@dataclass(frozen=True)
+class CodecOptions:
+    """
+    :param png_compression: Nível zlib (0 a 9).
+    :param png_strategy: Estratégia zlib (cv2.IMWRITE_PNG_STRATEGY_*), RLE é rápida em documentos.
+    :param png_optimize: PIL testa os filtros PNG para gerar o menor arquivo (mais lento).
+    :param jpeg_quality: Qualidade JPEG (0 a 100).
+    :param jpeg_progressive: JPEG progressivo (em geral alguns % menor).
+    :param jpeg_optimize: Tabelas Huffman otimizadas.
+    :param webp_quality: Qualidade WebP (0 a 100).
+    :param webp_method: Esforço do codificador WebP no PIL (0 rápido a 6 menor).
+    :param tiff_compression: Compressão TIFF de imagens não binárias (tiff_lzw ou tiff_adobe_deflate).
+    """
+    png_compression: int
+    png_strategy: int
+    png_optimize: bool
+    jpeg_quality: int
+    jpeg_progressive: bool
+    jpeg_optimize: bool
+    webp_quality: int
+    webp_method: int
+    tiff_compression: str
+
+
+_CODEC_OPTIONS: dict[str, CodecOptions] = {
+    "fast": CodecOptions(
+        1, cv2.IMWRITE_PNG_STRATEGY_RLE, False, 85, False, False, 80, 0, "tiff_lzw"
+    ),
+    "balanced": CodecOptions(
+        6, cv2.IMWRITE_PNG_STRATEGY_DEFAULT, False, 85, True, True, 80, 4, "tiff_lzw"
+    ),
+    "smallest": CodecOptions(
+        9, cv2.IMWRITE_PNG_STRATEGY_DEFAULT, True, 75, True, True, 75, 6, "tiff_adobe_deflate"
+    ),
+}
+
+_TIFF_COMPRESSION_OPENCV: dict[str, int] = {
+    "tiff_lzw": cv2.IMWRITE_TIFF_COMPRESSION_LZW,
+    "tiff_adobe_deflate": cv2.IMWRITE_TIFF_COMPRESSION_ADOBE_DEFLATE,
+}
+
+
+def get_codec_options(preset: CodecPreset) -> CodecOptions:
+    if preset not in _CODEC_OPTIONS:
+        raise ValueError(f'Preset de codificação inválido: {preset}, use: {CODEC_PRESETS}')
+    return _CODEC_OPTIONS[preset]
+
+
+def _get_format(extension: str) -> str:
+    fmt = extension.lower().lstrip('.')
+    return {"jpeg": "jpg", "tif": "tiff"}.get(fmt, fmt)
+
+
+def is_codec_extension(extension: str) -> bool:
+    """True se a extensão tem codificação com preset (CODEC_FORMATS)."""
+    return _get_format(extension) in CODEC_FORMATS
+
+
+def normalize_extension(extension: str) -> str:
+    """Extensão (ex: .JPEG, tif) => formato de CODEC_FORMATS."""
+    fmt = _get_format(extension)
+    if fmt not in CODEC_FORMATS:
+        raise ValueError(f'Formato de imagem não suportado: {extension}, use: {CODEC_FORMATS}')
+    return fmt
+
+
+def _encode_tiff_g4(img: Image.Image) -> bytes:
+    buff = BytesIO()
+    img.convert("1", dither=Image.Dither.NONE).save(buff, format="TIFF", compression="group4")
+    return buff.getvalue()
+
+
+def encode_opencv(
+            img: cv2.typing.MatLike, extension: str, preset: CodecPreset = "balanced", *, bilevel: bool = False
+        ) -> bytes:
+    """
+        Codifica um MatLike (BGR ou cinza) no formato extension.
+    bilevel=True: imagem com apenas 0 e 255, gravada com 1 bit por pixel (PNG/TIFF).
+    """
+    fmt = normalize_extension(extension)
+    options = get_codec_options(preset)
+    if fmt == "tiff" and bilevel:
+        # O TIFF do OpenCV grava 8 bits por pixel, o Group 4 exige 1 bit.
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return _encode_tiff_g4(Image.fromarray(np.ascontiguousarray(gray)))
+
+    if fmt == "png":
+        params = [
+            cv2.IMWRITE_PNG_COMPRESSION, options.png_compression,
+            cv2.IMWRITE_PNG_STRATEGY, options.png_strategy,
+        ]
+        if bilevel:
+            params += [cv2.IMWRITE_PNG_BILEVEL, 1]
+    elif fmt == "jpg":
+        params = [
+            cv2.IMWRITE_JPEG_QUALITY, options.jpeg_quality,
+            cv2.IMWRITE_JPEG_PROGRESSIVE, int(options.jpeg_progressive),
+            cv2.IMWRITE_JPEG_OPTIMIZE, int(options.jpeg_optimize),
+        ]
+    elif fmt == "webp":
+        params = [cv2.IMWRITE_WEBP_QUALITY, options.webp_quality]
+    else:
+        params = [cv2.IMWRITE_TIFF_COMPRESSION, _TIFF_COMPRESSION_OPENCV[options.tiff_compression]]
+    _status, buffer = cv2.imencode(f'.{fmt}', img, params)
+    if not _status:
+        raise ValueError(f'Falha ao codificar a imagem OpenCV em {fmt}')
+    return buffer.tobytes()
+
+
+def encode_pil(
+            img: Image.Image, extension: str, preset: CodecPreset = "balanced", *, bilevel: bool = False
+        ) -> bytes:
+    """Igual a encode_opencv() para imagens PIL."""
+    fmt = normalize_extension(extension)
+    options = get_codec_options(preset)
+    if bilevel and fmt == "tiff":
+        return _encode_tiff_g4(img)
+    if bilevel and fmt == "png" and img.mode != "1":
+        img = img.convert("1", dither=Image.Dither.NONE)
+
+    buff = BytesIO()
+    if fmt == "png":
+        img.save(buff, format="PNG", compress_level=options.png_compression, optimize=options.png_optimize)
+    elif fmt == "jpg":
+        # JPEG aceita apenas L, RGB e CMYK.
+        if img.mode not in ("L", "RGB", "CMYK"):
+            img = img.convert("L" if img.mode in ("1", "LA", "I", "F") else "RGB")
+        img.save(
+            buff, format="JPEG", quality=options.jpeg_quality,
+            progressive=options.jpeg_progressive, optimize=options.jpeg_optimize,
+        )
+    elif fmt == "webp":
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        img.save(buff, format="WEBP", quality=options.webp_quality, method=options.webp_method)
+    else:
+        img.save(buff, format="TIFF", compression=options.tiff_compression)
+    return buff.getvalue()
+
+
+__all__ = [
+    'CodecPreset', 'CODEC_PRESETS', 'CODEC_FORMATS', 'CodecOptions',
+    'get_codec_options', 'is_codec_extension', 'normalize_extension', 'encode_opencv', 'encode_pil',
+]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+#
+"""
+    Recorte automático de bordas do scanner e margens em branco.
+
+    A caixa do conteúdo é obtida com perfis de projeção (proporção de tinta por
+linha/coluna) de uma amostra reduzida da imagem, depois o recorte é aplicado na
+imagem em resolução original. CropBox guarda a posição do recorte na imagem de
+origem para que as coordenadas do OCR possam ser mapeadas de volta.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Tuple
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CropBox:
+    """
+        Área recortada (x, y, width, height) dentro da imagem de origem
+    (source_width x source_height).
+    """
+    x: int
+    y: int
+    width: int
+    height: int
+    source_width: int
+    source_height: int
+
+    def get_offset(self) -> Tuple[int, int]:
+        return self.x, self.y
+
+    def is_full(self) -> bool:
+        """True se o recorte cobre a imagem inteira."""
+        return (self.x, self.y, self.width, self.height) == (0, 0, self.source_width, self.source_height)
+
+    def map_point(self, x: float, y: float) -> Tuple[float, float]:
+        """Converte um ponto da imagem recortada para a imagem de origem."""
+        return x + self.x, y + self.y
+
+    def compose(self, inner: CropBox) -> CropBox:
+        """Recorte inner (feito sobre esta área) expresso na imagem de origem."""
+        return CropBox(
+            self.x + inner.x, self.y + inner.y, inner.width, inner.height,
+            self.source_width, self.source_height,
+        )
+
+    def rotate(self, angle: int) -> CropBox:
+        """Mesma área após rotacionar origem e recorte no sentido anti-horário (90, 180, 270)."""
+        sw, sh = self.source_width, self.source_height
+        if angle == 90:
+            return CropBox(self.y, sw - self.x - self.width, self.height, self.width, sh, sw)
+        elif angle == 180:
+            return CropBox(
+                sw - self.x - self.width, sh - self.y - self.height, self.width, self.height, sw, sh
+            )
+        elif angle == 270:
+            return CropBox(sh - self.y - self.height, self.x, self.height, self.width, sh, sw)
+        return self
+
+    def scale(self, width: int, height: int) -> CropBox:
+        """Mesma área após redimensionar o recorte para width x height."""
+        if (width, height) == (self.width, self.height):
+            return self
+        sx, sy = width / self.width, height / self.height
+        return CropBox(
+            round(self.x * sx), round(self.y * sy), width, height,
+            max(width, round(self.source_width * sx)), max(height, round(self.source_height * sy)),
+        )
+
+
+def reduce_gray(gray: np.ndarray, sample_size: int) -> Tuple[np.ndarray, int]:
+    """
+        Reduz a imagem em escala de cinza para até sample_size pixels no maior lado.
+    Cada pixel da amostra é o mínimo (ou máximo para fundo escuro) de um bloco
+    factor x factor, então traços finos não desaparecem. Retorna (amostra, factor).
+    """
+    factor = max(1, -(-max(gray.shape[:2]) // sample_size))
+    if factor == 1:
+        return gray, 1
+    # Amostra por média (barata) apenas para saber a polaridade do fundo.
+    small = cv2.resize(
+        gray, (max(1, gray.shape[1] // factor), max(1, gray.shape[0] // factor)),
+        interpolation=cv2.INTER_AREA,
+    )
+    kernel = np.ones((factor, factor), np.uint8)
+    if np.median(small) >= 128:
+        pooled = cv2.erode(gray, kernel, anchor=(0, 0), borderType=cv2.BORDER_REPLICATE)
+    else:
+        pooled = cv2.dilate(gray, kernel, anchor=(0, 0), borderType=cv2.BORDER_REPLICATE)
+    return pooled[::factor, ::factor], factor
+
+
+def create_ink_mask(sample: np.ndarray, ink_delta: int = 64) -> Tuple[np.ndarray, int]:
+    """
+        Máscara (uint8 0/1) dos pixels que diferem do fundo (tom mais frequente) em
+    mais de ink_delta, sem pixels isolados (poeira, ruído). Retorna (máscara, fundo).
+    """
+    hist = np.bincount(sample.ravel(), minlength=256)
+    background = int(np.argmax(hist))
+    low, high = max(0, background - ink_delta), min(255, background + ink_delta)
+    mask = ((sample < low) | (sample > high)).astype(np.uint8)
+    if mask.any():
+        neighbors = cv2.boxFilter(mask, -1, (3, 3), normalize=False, borderType=cv2.BORDER_CONSTANT)
+        mask &= (neighbors > 1).astype(np.uint8)
+    return mask, background
+
+
+def _strip_borders(profile: np.ndarray, border_ratio: float) -> Tuple[int, int]:
+    """Remove das pontas as linhas/colunas quase inteiramente escuras (bordas do scanner)."""
+    start, end = 0, len(profile)
+    while start < end and profile[start] >= border_ratio:
+        start += 1
+    while end > start and profile[end - 1] >= border_ratio:
+        end -= 1
+    return start, end
+
+
+def _get_content_range(profile: np.ndarray, noise_ratio: float) -> Tuple[int, int] | None:
+    idx = np.flatnonzero(profile > noise_ratio)
+    if len(idx) == 0:
+        return None
+    return int(idx[0]), int(idx[-1]) + 1
+
+
+def find_content_box(
+            gray: np.ndarray, *,
+            sample_size: int = 512,
+            ink_delta: int = 64,
+            border_ratio: float = 0.6,
+            noise_ratio: float = 0.002,
+            padding: int = 8,
+        ) -> CropBox | None:
+    """
+        Caixa do conteúdo de uma imagem em escala de cinza (ou BGR), em coordenadas
+    da imagem original. Retorna None se não houver conteúdo (página em branco).
+
+    :param sample_size: Maior lado da amostra usada nos perfis de projeção.
+    :param border_ratio: Linhas/colunas nas pontas com essa proporção de tinta são bordas do scanner.
+    :param noise_ratio: Linhas/colunas com até essa proporção de tinta são consideradas vazias.
+    :param padding: Margem (pixels da imagem original) mantida ao redor do conteúdo.
+    """
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_BGRA2GRAY if gray.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape[:2]
+    if height == 0 or width == 0:
+        return None
+    sample, factor = reduce_gray(gray, sample_size)
+    mask, _ = create_ink_mask(sample, ink_delta)
+
+    # Bordas: primeiro as linhas, depois as colunas restantes.
+    top, bottom = _strip_borders(mask.mean(axis=1), border_ratio)
+    left, right = _strip_borders(mask[top:bottom].mean(axis=0), border_ratio) if bottom > top else (0, 0)
+    inner = mask[top:bottom, left:right]
+    if inner.size == 0:
+        return None
+    rows = _get_content_range(inner.mean(axis=1), noise_ratio)
+    cols = _get_content_range(inner.mean(axis=0), noise_ratio)
+    if rows is None or cols is None:
+        return None
+
+    # Amostra => imagem original (cada pixel da amostra cobre factor x factor pixels).
+    x0 = max(0, (left + cols[0]) * factor - padding)
+    y0 = max(0, (top + rows[0]) * factor - padding)
+    x1 = min(width, (left + cols[1]) * factor + padding)
+    y1 = min(height, (top + rows[1]) * factor + padding)
+    return CropBox(x0, y0, x1 - x0, y1 - y0, width, height)
+
+
+__all__ = ['CropBox', 'find_content_box', 'reduce_gray', 'create_ink_mask']
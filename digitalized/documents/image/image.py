@@ -2,9 +2,15 @@
 #
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Tuple, Literal, Any, Union
+from typing import Tuple, Literal, Any, Union, Callable
+from dataclasses import dataclass
 from io import BytesIO
-from PIL import Image, ImageOps, ImageFilter
+from hashlib import md5
+import struct
+import zlib
+import pickle
+import weakref
+from PIL import Image, ImageFilter
 from cv2.typing import MatLike
 import cv2
 import numpy as np
@@ -13,25 +19,259 @@ from digitalized.documents.erros import (
     InvalidSourceImageError, NotImplementedInvertColor, NotImplementedModuleImageError
 )
 from digitalized.types.core import ObjectAdapter, BuilderInterface
+from digitalized.io import MappedFile, BufferReader
+from digitalized.documents.image.preprocess import PreprocessPipeline, bgr_to_gray
+from digitalized.documents.image.cache import get_preprocess_cache, create_cache_key
+from digitalized.documents.image.tiles import run_tiled
+from digitalized.documents.image.blank import BlankPageDetector, BlankPageStats
+from digitalized.documents.image.crop import CropBox, find_content_box
+from digitalized.documents.image.orientation import OrientationEstimate, estimate_orientation
+from digitalized.documents.image.phash import ImageHash, HashMethod, compute_hash
+from digitalized.documents.image.spill import SpilledData, SpillKind, remove_spill_file
+from digitalized.documents.image.codec import (
+    CodecPreset, CODEC_PRESETS, encode_opencv, encode_pil, is_codec_extension, normalize_extension
+)
+from digitalized.documents.image.binarize import (
+    LUT_INVERT, create_threshold_lut, combine_luts, threshold_local_mean, threshold_local
+)
+from digitalized.documents.image.transform import (
+    ImageOperation, GEOMETRIC_OPERATIONS, collapse_operations, get_operations_size, fit_size
+)
 
 LibImage = Literal["opencv", "pil"]
-BackgroundColor = Literal["gray", "black"]
-ImageExtension = Literal["jpg", "jpeg", "png"]
+BackgroundColor = Literal["gray", "black", "sauvola", "niblack"]
+BACKGROUND_COLORS: Tuple[str, ...] = ("gray", "black", "sauvola", "niblack")
+ImageExtension = Literal["jpg", "jpeg", "png", "webp", "tif", "tiff"]
 RotationAngle = Literal[90, 180, 270]
+# gray: 8 bits 1 canal, bgr: colorida (BGR no OpenCV, RGB no PIL), binary: apenas 0 e 255.
+ColorMode = Literal["gray", "bgr", "binary"]
+COLOR_MODES: Tuple[str, ...] = ("gray", "bgr", "binary")
+
+# Dimensões máximas das imagens na criação do ImageObject (None: sem redução, ex: plantas A0).
+DEFAULT_MAX_SIZE: Tuple[int, int] = (1980, 720)
+
+# Tipo de cor (PNG IHDR) => (canais, modo)
+_PNG_COLOR_TYPES: dict[int, Tuple[int, str]] = {
+    0: (1, "L"), 2: (3, "RGB"), 3: (1, "P"), 4: (2, "LA"), 6: (4, "RGBA"),
+}
+# Número de componentes (JPEG SOF) => modo
+_JPEG_COMPONENTS: dict[int, str] = {1: "L", 3: "RGB", 4: "CMYK"}
+
+# Fundo gray no PIL: inversão + threshold(128) invertido em uma única tabela.
+_LUT_BACKGROUND_GRAY = combine_luts(LUT_INVERT, create_threshold_lut(128, above=0, below=150))
+
 
+@dataclass
+class ImageMetadata:
+    """Dimensões e formato de pixel de uma imagem."""
+    width: int
+    height: int
+    channels: int
+    mode: str
 
-def image_bytes_to_opencv(img_bytes: bytes) -> cv2.typing.MatLike:
+    @classmethod
+    def create_from_opencv(cls, img: cv2.typing.MatLike) -> ImageMetadata:
+        if img.ndim == 2:
+            return cls(img.shape[1], img.shape[0], 1, "L")
+        channels = img.shape[2]
+        return cls(img.shape[1], img.shape[0], channels, "BGRA" if channels == 4 else "BGR")
+
+    @classmethod
+    def create_from_pil(cls, img: Image.Image) -> ImageMetadata:
+        return cls(img.width, img.height, len(img.getbands()), img.mode)
+
+    def get_color_mode(self) -> ColorMode:
+        if self.mode == "1":
+            return "binary"
+        return "gray" if self.channels in (1, 2) and self.mode not in ("P", "PA") else "bgr"
+
+    def to_opencv(self) -> ImageMetadata:
+        """
+            Metadados do cabeçalho convertidos para o que o OpenCV terá após decodificar
+        (IMREAD_ANYCOLOR): escala de cinza com 1 canal, demais (P, RGBA, CMYK) em BGR.
+        """
+        if self.get_color_mode() == "bgr":
+            return ImageMetadata(self.width, self.height, 3, "BGR")
+        return ImageMetadata(self.width, self.height, 1, "L")
+
+
+def image_bytes_to_opencv(img_bytes: Union[bytes, memoryview]) -> cv2.typing.MatLike:
     """Converte os bytes de uma imagem em objeto opencv MatLike"""
     nparr = np.frombuffer(img_bytes, np.uint8)
     return cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
 
 
-def image_opencv_to_bytes(img: cv2.typing.MatLike, image_extension: ImageExtension = "png") -> bytes:
-    """Convert um objeto opencv MatLike em bytes de imagem"""
-    _, buffer = cv2.imencode(f'.{image_extension}', img)  # Codifica como PNG (ou use '.jpg' para JPEG)
+def image_opencv_to_bytes(
+            img: cv2.typing.MatLike, image_extension: ImageExtension = "png", *, bilevel: bool = False
+        ) -> bytes:
+    """
+        Convert um objeto opencv MatLike em bytes de imagem.
+    Com bilevel=True (imagem com apenas 0 e 255) o PNG é gravado com 1 bit por pixel.
+    """
+    params = [cv2.IMWRITE_PNG_BILEVEL, 1] if (bilevel and image_extension == "png") else []
+    _, buffer = cv2.imencode(f'.{image_extension}', img, params)  # Codifica como PNG (ou use '.jpg' para JPEG)
     return buffer.tobytes()  # Obtém os bytes da imagem
 
 
+def image_opencv_to_pil(img: cv2.typing.MatLike) -> Image.Image:
+    """
+        Converte um objeto opencv MatLike em imagem PIL sem codificar a imagem.
+    Em escala de cinza o buffer numpy é compartilhado (a imagem PIL é somente
+    leitura, o PIL copia antes de alterar), em cores é feita apenas a troca BGR => RGB.
+    """
+    img = np.ascontiguousarray(img)
+    h, w = img.shape[:2]
+    if img.ndim == 2:
+        return Image.frombuffer("L", (w, h), img, "raw", "L", 0, 1)
+    if img.shape[2] == 4:
+        return Image.frombuffer("RGBA", (w, h), img, "raw", "BGRA", 0, 1)
+    return Image.frombuffer("RGB", (w, h), img, "raw", "BGR", 0, 1)
+
+
+def image_pil_to_opencv(img: Image.Image) -> cv2.typing.MatLike:
+    """
+        Converte uma imagem PIL em objeto opencv MatLike (L => cinza, RGB => BGR)
+    sem codificar a imagem.
+    """
+    if img.mode not in ("L", "RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() else ("L" if img.mode in ("1", "I", "F") else "RGB"))
+    arr = np.asarray(img)
+    if img.mode == "RGB":
+        return cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+    if img.mode == "RGBA":
+        return cv2.cvtColor(arr, cv2.COLOR_RGBA2BGRA)
+    return arr
+
+
+def get_pixels_digest(img: Union[cv2.typing.MatLike, Image.Image]) -> str:
+    """Digest MD5 dos pixels decodificados (inclui formato e dimensões)."""
+    if isinstance(img, Image.Image):
+        h = md5(f'{img.mode}{img.size}'.encode())
+        h.update(img.tobytes())
+    else:
+        img = np.ascontiguousarray(img)
+        h = md5(f'{img.dtype}{img.shape}'.encode())
+        h.update(img.data)
+    return h.hexdigest().upper()
+
+
+def get_reduced_flag(width: int, height: int, target_size: Tuple[int, int], *, gray: bool = False) -> int:
+    """
+        Retorna a flag cv2.IMREAD_REDUCED_COLOR_* (ou GRAYSCALE_* se gray=True) com o
+    maior fator de redução (2, 4, 8) que ainda mantém a imagem decodificada maior ou
+    igual a target_size. Para JPEG a redução acontece durante a decodificação (escala
+    DCT), economizando memória e CPU.
+    """
+    for factor, flag_color, flag_gray in (
+                (8, cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+                (4, cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+                (2, cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+            ):
+        if (width // factor) >= target_size[0] and (height // factor) >= target_size[1]:
+            return flag_gray if gray else flag_color
+    return cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR
+
+
+def probe_image_format(img_bytes: bytes) -> str | None:
+    """Formato (extensão) dos bytes de uma imagem pela assinatura, None se desconhecido."""
+    if img_bytes[:8] == b'\x89PNG\r\n\x1a\n':
+        return "png"
+    if img_bytes[:3] == b'\xff\xd8\xff':
+        return "jpg"
+    if img_bytes[:4] == b'RIFF' and img_bytes[8:12] == b'WEBP':
+        return "webp"
+    if img_bytes[:4] in (b'II*\x00', b'MM\x00*'):
+        return "tiff"
+    if img_bytes[:2] == b'BM':
+        return "bmp"
+    if img_bytes[:6] in (b'GIF87a', b'GIF89a'):
+        return "gif"
+    return None
+
+
+def is_same_format(extension: str, img_format: str | None) -> bool:
+    """Compara uma extensão de arquivo com o formato de probe_image_format()."""
+    aliases = {"jpeg": "jpg", "tif": "tiff"}
+    extension = extension.lower().lstrip('.')
+    return img_format is not None and aliases.get(extension, extension) == img_format
+
+
+def fit_max_size(width: int, height: int, max_size: Tuple[int, int] | None) -> Tuple[int, int]:
+    """fit_size() com as dimensões máximas da criação, None mantém o tamanho original."""
+    if max_size is None:
+        return width, height
+    return fit_size(width, height, max_size[0], max_size[1])
+
+
+def is_image_complete(img_bytes: Union[bytes, memoryview]) -> bool:
+    """
+        Validação estrutural sem decodificar os pixels: PNG com todos os chunks
+    íntegros (tamanho e CRC) até o IEND, JPEG terminado no marcador EOI. Detecta
+    arquivos truncados/corrompidos antes de manter os bytes para decodificação tardia.
+    Outros formatos retornam True (são decodificados na criação).
+    """
+    view = memoryview(img_bytes).cast('B')
+    size = len(view)
+    if view[:8] == b'\x89PNG\r\n\x1a\n':
+        pos = 8
+        while pos + 12 <= size:
+            (length,) = struct.unpack_from('>I', view, pos)
+            end = pos + 12 + length
+            if end > size:
+                return False
+            (crc,) = struct.unpack_from('>I', view, end - 4)
+            if zlib.crc32(view[pos + 4:end - 4]) != crc:
+                return False
+            if view[pos + 4:pos + 8] == b'IEND':
+                return True
+            pos = end
+        return False
+    if view[:2] == b'\xff\xd8':
+        # Alguns arquivos têm bytes nulos após o EOI.
+        return bytes(view[-32:]).rstrip(b'\x00').endswith(b'\xff\xd9')
+    return True
+
+
+def probe_image_header(img_bytes: bytes) -> ImageMetadata | None:
+    """
+        Lê apenas o cabeçalho PNG (IHDR) ou JPEG (SOF) para obter as dimensões
+    da imagem, sem decodificar os pixels. Retorna None para outros formatos.
+    """
+    if img_bytes[:8] == b'\x89PNG\r\n\x1a\n' and img_bytes[12:16] == b'IHDR':
+        width, height, depth, color_type = struct.unpack_from('>IIBB', img_bytes, 16)
+        channels, mode = _PNG_COLOR_TYPES.get(color_type, (None, None))
+        if channels is None:
+            return None
+        if color_type == 0 and depth == 1:
+            mode = "1"
+        return ImageMetadata(width, height, channels, mode)
+
+    if img_bytes[:2] != b'\xff\xd8':
+        return None
+    # Percorre os segmentos JPEG até o primeiro marcador SOF.
+    pos, size = 2, len(img_bytes)
+    while pos + 4 <= size:
+        if img_bytes[pos] != 0xFF:
+            return None
+        marker = img_bytes[pos + 1]
+        if marker == 0xFF:
+            # Bytes de preenchimento
+            pos += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            # Marcadores sem segmento
+            pos += 2
+            continue
+        (length,) = struct.unpack_from('>H', img_bytes, pos + 2)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            if pos + 10 > size:
+                return None
+            height, width, components = struct.unpack_from('>HHB', img_bytes, pos + 5)
+            return ImageMetadata(width, height, components, _JPEG_COMPONENTS.get(components, "RGB"))
+        pos += 2 + length
+    return None
+
+
 class InterfaceInvertColor(ABC):
 
     @abstractmethod
@@ -52,35 +292,100 @@ class InterfaceInvertColor(ABC):
 
     @abstractmethod
     def set_background(self, background: BackgroundColor = "gray"):
+        """
+        - gray: texto preto, fundo branco.
+        - black: texto branco, fundo preto.
+        - sauvola/niblack: binarização local (texto preto, fundo branco), indicada
+          para digitalizações com iluminação irregular.
+        """
         pass
 
     @abstractmethod
     def set_gaussian_blur(self):
         pass
 
+    @abstractmethod
+    def apply_pipeline(self, pipeline: PreprocessPipeline):
+        """Executa uma cadeia de pré-processamento sobre a imagem decodificada."""
+        pass
+
+    @abstractmethod
+    def set_adaptive_threshold(self, block_size: int = 11, c: float = 2):
+        """
+            Threshold adaptativo pela média local: pixel > média - c => branco,
+        senão preto (texto preto, fundo branco).
+        """
+        pass
+
     @abstractmethod
     def get_real_module(self) -> Union[cv2.typing.MatLike, Image]:
         pass
 
+    @abstractmethod
+    def set_real_module(self, module: Union[cv2.typing.MatLike, Image]):
+        """
+            Substitui a imagem decodificada, os bytes serão gerados apenas
+        quando forem solicitados.
+        """
+        pass
+
+    def get_digest(self) -> str:
+        """
+            Digest dos pixels decodificados: o mesmo conteúdo tem sempre a mesma
+        chave, esteja a imagem em bytes ou já decodificada.
+        """
+        return get_pixels_digest(self.get_real_module())
+
+    @abstractmethod
+    def _get_cache_pixels(self) -> np.ndarray | None:
+        """Pixels atuais para o cache, None se o formato não pode ser recriado."""
+        pass
+
+    @abstractmethod
+    def _set_cache_pixels(self, data: np.ndarray):
+        pass
+
+    def _run_cached(self, operation: str, func: Callable[[], None]):
+        """
+            Executa func() consultando antes o cache de pré-processamento (se ativo).
+        Em caso de acerto os pixels processados substituem a imagem sem executar func(),
+        nada é codificado (PNG) em nenhum dos casos.
+        """
+        cache = get_preprocess_cache()
+        if cache is None:
+            func()
+            return
+        key = create_cache_key(self.get_digest(), self.get_lib_image(), operation)
+        data = cache.get(key)
+        if data is not None:
+            self._set_cache_pixels(data)
+            return
+        func()
+        pixels = self._get_cache_pixels()
+        if pixels is not None:
+            cache.put(key, pixels)
+
     def to_file(self, output_path: File):
         if self.get_lib_image() == "opencv":
-            cv2.imwrite(
-                output_path.absolute(), image_bytes_to_opencv(self.get_image_bytes())
-            )
+            cv2.imwrite(output_path.absolute(), self.get_real_module())
         elif self.get_lib_image() == "pil":
-            img: Image.Image = Image.open(self.get_image_bytes())
+            img: Image.Image = self.get_real_module()
             img.save(output_path.absolute(), 'png')
 
     def to_bytes(self) -> bytes:
         return self.get_image_bytes()
 
     def to_pil(self) -> Image.Image:
-        """Converte a propriedade bytes em imagem PIL"""
-        return Image.open(BytesIO(self.get_image_bytes()))
+        """Converte a imagem em PIL, sem passar por bytes codificados"""
+        if self.get_lib_image() == "opencv":
+            return image_opencv_to_pil(self.get_real_module())
+        return self.get_real_module().copy()
 
     def to_opencv(self) -> cv2.typing.MatLike:
-        """Converte a propriedade bytes em imagem objeto opencv"""
-        return image_bytes_to_opencv(self.get_image_bytes())
+        """Converte a imagem em objeto opencv (escala de cinza), sem passar por bytes codificados"""
+        if self.get_lib_image() == "opencv":
+            return self.get_real_module().copy()
+        return np.asarray(self.get_real_module().convert("L"))
 
 
 # =============================================================================#
@@ -89,79 +394,98 @@ class InterfaceInvertColor(ABC):
 class ImplementInvertColorOpenCv(InterfaceInvertColor):
     """
         Escurecer texto em imagens.
+
+        A imagem é mantida decodificada (MatLike em escala de cinza), os bytes
+    PNG só são gerados em get_image_bytes()/to_bytes().
     """
 
-    def __init__(self, image_bytes: bytes):
+    def __init__(self, image: Union[bytes, cv2.typing.MatLike]):
         super().__init__()
-        if not isinstance(image_bytes, bytes):
+        self.__image_bytes: bytes | None = None
+        self.__image_opencv: cv2.typing.MatLike | None = None
+        if isinstance(image, bytes):
+            self.__image_bytes = image
+        elif isinstance(image, np.ndarray):
+            self.set_real_module(image)
+        else:
             raise InvalidSourceImageError(
-                f'{__class__.__name__} Use: bytes, não {type(image_bytes)}'
+                f'{__class__.__name__} Use: bytes|MatLike, não {type(image)}'
             )
-        self.__image_bytes: bytes = image_bytes
         self.__gaussian_blur: bool = False
 
     def get_real_module(self) -> "cv2.typing.MatLike":
-        return image_bytes_to_opencv(self.get_image_bytes())
+        if self.__image_opencv is None:
+            self.__image_opencv = image_bytes_to_opencv(self.__image_bytes)
+        return self.__image_opencv
+
+    def set_real_module(self, module: cv2.typing.MatLike):
+        self.__image_opencv = bgr_to_gray(module)
+        self.__image_bytes = None
 
     def get_lib_image(self) -> LibImage:
         return "opencv"
 
     def set_image_bytes(self, img_bytes: bytes):
         self.__image_bytes = img_bytes
+        self.__image_opencv = None
 
     def get_image_bytes(self) -> bytes:
+        if self.__image_bytes is None:
+            self.__image_bytes = image_opencv_to_bytes(self.__image_opencv)
         return self.__image_bytes
 
+    def _get_cache_pixels(self) -> np.ndarray | None:
+        return self.get_real_module()
+
+    def _set_cache_pixels(self, data: np.ndarray):
+        self.set_real_module(data.copy())
+
     def is_gaussian_blur(self) -> bool:
         return self.__gaussian_blur
 
     def set_gaussian_blur(self):
         if self.is_gaussian_blur():
             return
-        # Aplica um filtro Gaussiano para reduzir o ruído
-        #_blurred: MatLike = cv2.GaussianBlur(image_bytes_to_opencv(self.__image_bytes), (5, 5), 0)
-        _blurred = cv2.bilateralFilter(image_bytes_to_opencv(self.__image_bytes), d=9, sigmaColor=75, sigmaSpace=75)
-        self.__image_bytes = image_opencv_to_bytes(_blurred)
+        # Aplica um filtro bilateral para reduzir o ruído
+        self.apply_pipeline(PreprocessPipeline().add_bilateral(9, 75, 75))
         self.__gaussian_blur = True
 
-    def set_background(self, background: BackgroundColor = "gray"):
-        if background == "gray":
-            self.__set_background_gray()
-        elif background == "black":
-            self.__set_background_black()
-        else:
-            raise ValueError(f'{__class__.__name__} Use {BackgroundColor}, não {background}')
+    def apply_pipeline(self, pipeline: PreprocessPipeline):
+        self._run_cached(
+            repr(pipeline),
+            lambda: self.set_real_module(run_tiled(self.get_real_module(), pipeline.run, pipeline.get_halo()))
+        )
 
-    def __set_background_black(self):
-        self.set_gaussian_blur()
-        # Aplica binarização adaptativa (texto branco, fundo preto)
-        binary: MatLike = cv2.adaptiveThreshold(
-            image_bytes_to_opencv(self.__image_bytes),
-            150,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            11,
-            2
+    def set_adaptive_threshold(self, block_size: int = 11, c: float = 2):
+        def _threshold(img: cv2.typing.MatLike) -> cv2.typing.MatLike:
+            return cv2.adaptiveThreshold(
+                img, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, block_size, c
+            )
+        self._run_cached(
+            f'adaptive_mean({block_size}, {c})',
+            lambda: self.set_real_module(run_tiled(self.get_real_module(), _threshold, block_size // 2))
         )
-        self.__image_bytes = image_opencv_to_bytes(binary)
-        _result: MatLike = cv2.bitwise_not(image_bytes_to_opencv(self.__image_bytes))
-        self.__image_bytes = image_opencv_to_bytes(_result)
 
-    def __set_background_gray(self):
-        self.set_gaussian_blur()
-        # Aplica binarização adaptativa (texto preto, fundo branco)
-        _img: cv2.typing.MatLike = image_bytes_to_opencv(self.__image_bytes)
-        _binary = cv2.adaptiveThreshold(
-            _img,
-            255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,  # Inverte o texto para ser branco inicialmente
-            11,
-            2
+    def set_background(self, background: BackgroundColor = "gray"):
+        """
+            Desfoque, binarização adaptativa e inversão executados em uma única
+        passagem sobre o mesmo buffer, os bytes são codificados apenas no final.
+        - gray: texto preto, fundo branco.
+        - black: texto branco, fundo preto.
+        - sauvola/niblack: binarização local sem desfoque.
+        """
+        if background not in BACKGROUND_COLORS:
+            raise ValueError(f'{__class__.__name__} Use {BackgroundColor}, não {background}')
+        if background in ("sauvola", "niblack"):
+            self._run_cached(
+                f'{background}()',
+                lambda: self.set_real_module(threshold_local(self.get_real_module(), background))
+            )
+            return
+        self.apply_pipeline(
+            PreprocessPipeline.create_background(background, blur=not self.is_gaussian_blur())
         )
-        self.__image_bytes = image_opencv_to_bytes(_binary)
-        #_result: MatLike = cv2.bitwise_not(image_bytes_to_opencv(self.__image_bytes))
-        #self.__image_bytes = image_opencv_to_bytes(_result)
+        self.__gaussian_blur = True
 
 
 class ImplementInvertColorPIL(InterfaceInvertColor):
@@ -169,17 +493,28 @@ class ImplementInvertColorPIL(InterfaceInvertColor):
         Implementação da inversão de cores usando PIL (Pillow).
     """
 
-    def __init__(self, image_bytes: bytes):
+    def __init__(self, image: Union[bytes, Image.Image]):
         super().__init__()
-        if not isinstance(image_bytes, bytes):
+        self.__img_bytes: bytes | None = None
+        self.__img_pil: Image.Image | None = None
+        if isinstance(image, bytes):
+            self.__img_bytes = image
+        elif isinstance(image, Image.Image):
+            self.set_real_module(image)
+        else:
             raise InvalidSourceImageError(
-                f'{__class__.__name__} Use: bytes, não {type(image_bytes)}'
+                f'{__class__.__name__} Use: bytes|Image, não {type(image)}'
             )
-        self.__img_bytes: bytes = image_bytes
         self.__gaussian_blur: bool = False
 
     def get_real_module(self) -> "Image.Image":
-        return Image.open(BytesIO(self.get_image_bytes()))
+        if self.__img_pil is None:
+            self.__img_pil = Image.open(BytesIO(self.__img_bytes))
+        return self.__img_pil
+
+    def set_real_module(self, module: Image.Image):
+        self.__img_pil = module
+        self.__img_bytes = None
 
     def get_lib_image(self) -> LibImage:
         return "pil"
@@ -189,55 +524,74 @@ class ImplementInvertColorPIL(InterfaceInvertColor):
 
     def set_image_bytes(self, img_bytes: bytes):
         self.__img_bytes = img_bytes
+        self.__img_pil = None
 
     def get_image_bytes(self) -> bytes:
+        if self.__img_bytes is None:
+            buff = BytesIO()
+            self.__img_pil.save(buff, 'png')
+            self.__img_bytes = buff.getvalue()
+            buff.close()
         return self.__img_bytes
 
+    def _get_cache_pixels(self) -> np.ndarray | None:
+        img = self.get_real_module()
+        # Image.fromarray() recria estes modos a partir do array (1 => bool).
+        if img.mode not in ("1", "L", "RGB", "RGBA"):
+            return None
+        return np.asarray(img)
+
+    def _set_cache_pixels(self, data: np.ndarray):
+        self.set_real_module(Image.fromarray(data))
+
     def set_gaussian_blur(self):
         if self.is_gaussian_blur():
             return
-        img_pil = Image.open(BytesIO(self.__img_bytes))
         # Aplicar um desfoque semelhante ao cv2.GaussianBlur
-        blurred: Image.Image = img_pil.filter(ImageFilter.GaussianBlur(radius=1))
-        buff = BytesIO()
-        blurred.save(buff, 'png')
-        self.__img_bytes = buff.getvalue()
-        buff.close()
+        self._run_cached(
+            'pil_gaussian(1,)',
+            lambda: self.set_real_module(self.get_real_module().filter(ImageFilter.GaussianBlur(radius=1)))
+        )
         self.__gaussian_blur = True
 
+    def apply_pipeline(self, pipeline: PreprocessPipeline):
+        def _run():
+            _gray = np.asarray(self.__get_gray())
+            self.set_real_module(Image.fromarray(run_tiled(_gray, pipeline.run, pipeline.get_halo())))
+        self._run_cached(repr(pipeline), _run)
+
+    def set_adaptive_threshold(self, block_size: int = 11, c: float = 2):
+        def _run():
+            _gray = np.asarray(self.__get_gray())
+            self.set_real_module(Image.fromarray(
+                run_tiled(_gray, lambda img: threshold_local_mean(img, block_size, c), block_size // 2)
+            ))
+        self._run_cached(f'adaptive_mean({block_size}, {c})', _run)
+
     def set_background(self, background: BackgroundColor = "gray"):
         if background == "gray":
-            self.__set_background_gray()
+            self._run_cached('pil_background(gray)', self.__set_background_gray)
         elif background == "black":
-            self.__set_background_black()
+            self._run_cached('pil_background(black)', self.__set_background_black)
+        elif background in ("sauvola", "niblack"):
+            self._run_cached(
+                f'{background}()',
+                lambda: self.set_real_module(
+                    Image.fromarray(threshold_local(np.asarray(self.__get_gray()), background))
+                )
+            )
+
+    def __get_gray(self) -> Image.Image:
+        img = self.get_real_module()
+        return img if img.mode == "L" else img.convert("L")
 
     def __set_background_black(self):
-        img_pil = Image.open(BytesIO(self.__img_bytes))
-        _result = ImageOps.invert(img_pil.convert("L"))  # Converte para escala de cinza
-        buff = BytesIO()
-        _result.save(buff, 'png')
-        self.__img_bytes = buff.getvalue()
-        buff.close()
+        # Escala de cinza e inversão via tabela (LUT)
+        self.set_real_module(self.__get_gray().point(LUT_INVERT))
 
     def __set_background_gray(self):
-        # Abrir a imagem a partir dos bytes
-        img_pil = Image.open(BytesIO(self.__img_bytes))
-
-        # Converter para escala de cinza
-        gray_img = img_pil.convert("L")
-
-        # Inverter as cores
-        inverted_img = ImageOps.invert(gray_img)
-
-        # Aplicar um threshold invertido: força fundo branco e texto preto
-        threshold = 128  # Ajuste conforme necessário
-        binary_img = inverted_img.point(lambda x: 0 if x > threshold else 150)  # Invertido aqui!
-
-        # Salvar de volta para bytes
-        buff = BytesIO()
-        binary_img.save(buff, 'PNG')
-        self.__img_bytes = buff.getvalue()
-        buff.close()
+        # Inversão + threshold invertido (fundo branco e texto preto) em uma única passagem.
+        self.set_real_module(self.__get_gray().point(_LUT_BACKGROUND_GRAY))
 
 
 class ImageInvertColor(ObjectAdapter):
@@ -253,7 +607,11 @@ class ImageInvertColor(ObjectAdapter):
         return self._invert_color
 
     def hash(self) -> int:
-        return hash(self.get_image_bytes())
+        return hash(self.get_digest())
+
+    def get_digest(self) -> str:
+        """Digest do conteúdo, usado como chave do cache de pré-processamento."""
+        return self._invert_color.get_digest()
 
     def get_lib_image(self) -> LibImage:
         return self._invert_color.get_lib_image()
@@ -267,12 +625,24 @@ class ImageInvertColor(ObjectAdapter):
     def get_image_bytes(self) -> bytes:
         return self._invert_color.get_image_bytes()
 
+    def get_real_module(self) -> Union[cv2.typing.MatLike, Image.Image]:
+        return self._invert_color.get_real_module()
+
+    def set_real_module(self, module: Union[cv2.typing.MatLike, Image.Image]):
+        self._invert_color.set_real_module(module)
+
     def set_gaussian_blur(self):
         self._invert_color.set_gaussian_blur()
 
     def set_background(self, background: BackgroundColor = "gray"):
         self._invert_color.set_background(background)
 
+    def apply_pipeline(self, pipeline: PreprocessPipeline):
+        self._invert_color.apply_pipeline(pipeline)
+
+    def set_adaptive_threshold(self, block_size: int = 11, c: float = 2):
+        self._invert_color.set_adaptive_threshold(block_size, c)
+
     def to_file(self, output_path: File):
         return self._invert_color.to_file(output_path)
 
@@ -280,7 +650,23 @@ class ImageInvertColor(ObjectAdapter):
         return self._invert_color.to_bytes()
 
     @classmethod
-    def create_from_file(cls, f: File, *, library: LibImage = "opencv") -> ImageInvertColor:
+    def create_from_file(cls, f: File, *, library: LibImage = "opencv", use_mmap: bool = True) -> ImageInvertColor:
+        """
+        :param use_mmap: Decodifica direto do arquivo mapeado em memória, sem ler o
+            arquivo inteiro em um objeto bytes.
+        """
+        if use_mmap:
+            with MappedFile(f) as mapped:
+                if library == "opencv":
+                    return cls(ImplementInvertColorOpenCv(image_bytes_to_opencv(mapped.get_view())))
+                elif library == "pil":
+                    img = Image.open(BufferReader(mapped.get_view()))
+                    img.load()
+                    return cls(ImplementInvertColorPIL(img))
+                raise NotImplementedInvertColor(
+                    f'{__class__.__name__} Use: {LibImage}, não {type(library)}'
+                )
+
         bt = None
         with open(f.absolute(), 'rb') as file:
             bt = file.read()
@@ -307,6 +693,16 @@ class ImageInvertColor(ObjectAdapter):
             )
         return cls(invert_color)
 
+    @classmethod
+    def create_from_opencv(cls, img: cv2.typing.MatLike) -> ImageInvertColor:
+        """Cria o objeto a partir de uma imagem já decodificada, sem codificar em PNG."""
+        return cls(ImplementInvertColorOpenCv(img))
+
+    @classmethod
+    def create_from_pil(cls, img: Image.Image) -> ImageInvertColor:
+        """Cria o objeto a partir de uma imagem PIL já decodificada, sem codificar em PNG."""
+        return cls(ImplementInvertColorPIL(img))
+
 
 # =============================================================================#
 # Manipulação de imagens
@@ -316,11 +712,106 @@ class ImageInvertColor(ObjectAdapter):
 class InterfaceImageObject(ABC):
     """
     Classe abstrata base para objetos de imagem.
+
+        As transformações (rotação, fundo, desfoque, otimização, redução) são
+    apenas agendadas, a fila é reduzida e executada quando os pixels ou os
+    bytes da imagem forem lidos.
     """
 
     def __init__(self):
         self.__output_extension: ImageExtension = "png"
+        self.__codec_preset: CodecPreset = "balanced"
         self.__invert_color: ImageInvertColor = None
+        self.__metadata: ImageMetadata | None = None
+        self.__operations: list[ImageOperation] = []
+        # None: obtido dos metadados (cabeçalho ou pixels) quando for solicitado.
+        self.__color_mode: ColorMode | None = None
+        # Posição da imagem atual dentro da imagem de origem, None se não houve recorte.
+        self.__crop_box: CropBox | None = None
+        # Conteúdo gravado em disco por SpillStore (None: imagem em memória).
+        self.__spilled: SpilledData | None = None
+        self.__spill_finalizer: weakref.finalize | None = None
+
+    def __getstate__(self) -> dict:
+        # A cópia enviada a outro processo não depende do arquivo em disco.
+        self.load_spilled()
+        state = self.__dict__.copy()
+        # O cache de ImageInvertColor é recriado sob demanda, não precisa ser enviado.
+        state['_InterfaceImageObject__invert_color'] = None
+        state['_InterfaceImageObject__spill_finalizer'] = None
+        return state
+
+    # -------------------------------------------------------------------------#
+    # Spill (conteúdo em disco)
+    # -------------------------------------------------------------------------#
+    def is_spilled(self) -> bool:
+        return self.__spilled is not None
+
+    def get_spilled_bytes(self) -> int:
+        return 0 if self.__spilled is None else self.__spilled.size
+
+    @abstractmethod
+    def get_resident_bytes(self) -> int:
+        """Memória ocupada pelos pixels e bytes da imagem (0 se estiver em disco)."""
+        pass
+
+    @abstractmethod
+    def _dump_data(self) -> Tuple[SpillKind, Union[bytes, np.ndarray], tuple, str]:
+        """Conteúdo atual para gravar em disco: (tipo, dados, shape, dtype/modo)."""
+        pass
+
+    @abstractmethod
+    def _drop_data(self):
+        """Libera os pixels e bytes após a gravação em disco."""
+        pass
+
+    @abstractmethod
+    def _load_data(self, kind: SpillKind, data: Union[bytes, np.ndarray], spilled: SpilledData):
+        pass
+
+    def spill(self, path: str) -> int:
+        """
+            Grava o conteúdo atual (bytes codificados, se existirem, senão os pixels
+        brutos) em path e libera a memória. As operações pendentes e os metadados
+        continuam em memória. Retorna o total de bytes gravados.
+        """
+        if self.__spilled is not None:
+            return 0
+        kind, data, shape, dtype = self._dump_data()
+        with open(path, 'wb') as file:
+            if isinstance(data, np.ndarray):
+                data.tofile(file)
+                size = data.nbytes
+            else:
+                file.write(data)
+                size = len(data)
+        self.__spilled = SpilledData(path, kind, shape, dtype, size)
+        # O arquivo é removido se a imagem for descartada sem ser carregada de volta.
+        self.__spill_finalizer = weakref.finalize(self, remove_spill_file, path)
+        self.__invert_color = None
+        self._drop_data()
+        return size
+
+    def load_spilled(self):
+        """Carrega de volta o conteúdo gravado em disco (chamado em todo acesso aos pixels/bytes)."""
+        if self.__spilled is None:
+            return
+        spilled = self.__spilled
+        if spilled.kind == "array":
+            data = np.fromfile(spilled.path, dtype=np.dtype(spilled.dtype)).reshape(spilled.shape)
+        else:
+            with open(spilled.path, 'rb') as file:
+                data = file.read()
+        self.__spilled = None
+        self._load_data(spilled.kind, data, spilled)
+        self._discard_spill()
+
+    def _discard_spill(self):
+        """Descarta o conteúdo em disco (imagem substituída ou carregada de volta)."""
+        self.__spilled = None
+        if self.__spill_finalizer is not None:
+            self.__spill_finalizer()
+            self.__spill_finalizer = None
 
     def is_landscape(self) -> bool:
         return self.get_width() > self.get_height()
@@ -328,77 +819,326 @@ class InterfaceImageObject(ABC):
     def is_vertical(self) -> bool:
         return self.get_height() > self.get_width()
 
+    def is_paisagem(self) -> bool:
+        """
+        Retorna True se a imagem estiver em modo paisagem.
+        """
+        return self.is_landscape()
+
     @abstractmethod
-    def set_landscape(self):
+    def _probe_metadata(self) -> ImageMetadata:
+        """
+            Obtém os metadados da imagem atual, se possível apenas com o
+        cabeçalho dos bytes, sem decodificar os pixels.
+        """
         pass
 
+    def get_metadata(self) -> ImageMetadata:
+        if len(self.__operations) > 0:
+            if any(op.name not in GEOMETRIC_OPERATIONS for op in self.__operations):
+                self.apply_operations()
+            else:
+                # Rotações/reduções pendentes: calcula as dimensões sem processar os pixels.
+                if self.__metadata is None:
+                    self.__metadata = self._probe_metadata()
+                _w, _h = get_operations_size(
+                    self.__metadata.width, self.__metadata.height, self.__operations
+                )
+                return ImageMetadata(_w, _h, self.__metadata.channels, self.__metadata.mode)
+        if self.__metadata is None:
+            self.__metadata = self._probe_metadata()
+        return self.__metadata
+
+    def clear_metadata(self):
+        """Invalida os metadados em cache, use sempre que a imagem for alterada."""
+        self.__metadata = None
+
+    def get_width(self) -> int:
+        """Retorna a largura da imagem."""
+        return self.get_metadata().width
+
+    def get_height(self) -> int:
+        """Retorna a altura da imagem."""
+        return self.get_metadata().height
+
+    def get_channels(self) -> int:
+        """Retorna o número de canais da imagem."""
+        return self.get_metadata().channels
+
+    def get_mode(self) -> str:
+        """Retorna o modo de cor da imagem (L, RGB, BGR, ...)."""
+        return self.get_metadata().mode
+
+    def get_color_mode(self) -> ColorMode:
+        """Retorna o modo de cor atual: gray, bgr ou binary."""
+        if any(op.name not in GEOMETRIC_OPERATIONS for op in self.__operations):
+            self.apply_operations()
+        if self.__color_mode is None:
+            self.__color_mode = self.get_metadata().get_color_mode()
+        return self.__color_mode
+
+    def _update_color_mode(self, mode: ColorMode | None):
+        """Usado pelas implementações após alterar os pixels (None: obter dos metadados)."""
+        self.__color_mode = mode
+
+    def set_color_mode(self, mode: ColorMode):
+        """
+            Converte a imagem para gray, bgr ou binary (threshold Otsu). Os canais só
+        são ampliados (gray => bgr) quando solicitado aqui.
+        """
+        if mode not in COLOR_MODES:
+            raise ValueError(f'{__class__.__name__} Use {ColorMode}, não {mode}')
+        self.add_operation(ImageOperation.color(mode))
+
+    def get_crop_box(self) -> CropBox | None:
+        """
+            Área da imagem de origem que corresponde à imagem atual (após set_autocrop()),
+        usada para mapear coordenadas do OCR. None se a imagem não foi recortada.
+        """
+        # Rotação/redução pendentes também alteram a posição do recorte.
+        if any(op.name in ("autocrop", *GEOMETRIC_OPERATIONS) for op in self.__operations):
+            self.apply_operations()
+        return self.__crop_box
+
+    def _reset_crop_box(self):
+        """Usado pelas implementações quando a imagem é substituída."""
+        self.__crop_box = None
+
+    def set_autocrop(self, padding: int = 8):
+        """
+            Recorta bordas do scanner e margens em branco. A caixa do conteúdo é obtida
+        em uma amostra reduzida e o recorte é feito na resolução atual.
+
+        :param padding: Margem (pixels) mantida ao redor do conteúdo.
+        """
+        if padding < 0:
+            raise ValueError(f'{__class__.__name__} padding deve ser >= 0, não {padding}')
+        self.add_operation(ImageOperation.autocrop(padding))
+
+    def get_orientation(self, *, rotation: int | None = None) -> OrientationEstimate:
+        """
+            Estima a rotação (0, 90, 180, 270) e a inclinação do texto com perfis de
+        projeção de uma amostra reduzida.
+
+        :param rotation: Rotação já conhecida (ex: tesseract OSD), estima apenas a inclinação.
+        """
+        self.apply_operations()
+        return estimate_orientation(self._get_gray_pixels(), rotation=rotation)
+
+    def get_hash(self, method: HashMethod = "dhash", size: int = 8) -> ImageHash:
+        """Hash perceptual (ahash, dhash, phash) da imagem atual, para encontrar duplicatas."""
+        self.apply_operations()
+        return compute_hash(self._get_gray_pixels(), method, size)
+
+    def set_orientation(
+                self,
+                estimate: OrientationEstimate | None = None, *,
+                min_confidence: float = 0.1,
+                min_skew: float = 0.2,
+                min_skew_confidence: float = 0.1,
+            ) -> OrientationEstimate:
+        """
+            Agenda a rotação e a correção de inclinação estimadas (get_orientation()), as
+        duas são executadas junto com as demais operações. Retorna a estimativa usada.
+        """
+        if estimate is None:
+            estimate = self.get_orientation()
+        if estimate.rotation != 0 and estimate.confidence >= min_confidence:
+            self.set_rotation(estimate.rotation)
+        if abs(estimate.skew) >= min_skew and estimate.skew_confidence >= min_skew_confidence:
+            self.set_deskew(estimate.skew)
+        return estimate
+
+    def set_deskew(self, angle: float):
+        """Rotaciona angle graus (anti-horário), a imagem é ampliada para não cortar os cantos."""
+        self.add_operation(ImageOperation.deskew(angle))
+
+    # -------------------------------------------------------------------------#
+    # Fila de operações
+    # -------------------------------------------------------------------------#
+    def add_operation(self, op: ImageOperation):
+        self.__operations.append(op)
+
+    def get_operations(self) -> list[ImageOperation]:
+        return list(self.__operations)
+
+    def has_operations(self) -> bool:
+        return len(self.__operations) > 0
+
+    def clear_operations(self):
+        """Descarta as operações pendentes sem executá-las."""
+        self.__operations.clear()
+
+    def apply_operations(self):
+        """Reduz a fila de operações pendentes e executa o resultado."""
+        if len(self.__operations) == 0:
+            return
+        operations = collapse_operations(self.__operations)
+        self.__operations = []
+        for op in operations:
+            if op.name == "rotation":
+                self._run_rotation(op.params[0])
+                if self.__crop_box is not None:
+                    self.__crop_box = self.__crop_box.rotate(op.params[0])
+            elif op.name == "resize":
+                self._run_resize(*op.params)
+                if self.__crop_box is not None:
+                    self.__crop_box = self.__crop_box.scale(self.get_width(), self.get_height())
+            elif op.name == "background":
+                self._run_background(op.params[0])
+            elif op.name == "gaussian":
+                self._run_gaussian()
+            elif op.name == "optimize":
+                self._run_optimize()
+            elif op.name == "color":
+                self._run_color(op.params[0])
+            elif op.name == "autocrop":
+                self._run_autocrop(op.params[0])
+            elif op.name == "deskew":
+                self._run_deskew(op.params[0])
+                # Um recorte inclinado não é mais uma caixa na imagem de origem.
+                self.__crop_box = None
+
+    def _run_autocrop(self, padding: int):
+        box = find_content_box(self._get_gray_pixels(), padding=padding)
+        # Página sem conteúdo é mantida inteira.
+        if box is None or box.is_full():
+            return
+        self._run_crop(box.x, box.y, box.width, box.height)
+        self.__crop_box = box if self.__crop_box is None else self.__crop_box.compose(box)
+
     @abstractmethod
-    def set_vertical(self):
+    def _get_gray_pixels(self) -> np.ndarray:
+        """Pixels atuais em escala de cinza, sem executar a fila de operações."""
         pass
 
     @abstractmethod
-    def get_real_module(self) -> Union["Image.Image", "cv2.typing.MatLike"]:
+    def _run_crop(self, x: int, y: int, width: int, height: int):
         pass
 
     @abstractmethod
-    def get_width(self) -> int:
-        """Retorna a largura da imagem."""
+    def _run_deskew(self, angle: float):
         pass
 
     @abstractmethod
-    def get_height(self) -> int:
-        """Retorna a altura da imagem."""
+    def _run_rotation(self, rotation: int):
+        """Rotaciona a imagem no sentido anti-horário (90, 180, 270)."""
         pass
 
     @abstractmethod
-    def set_image_bytes(self, img_bytes: bytes):
+    def _run_resize(self, max_width: int, max_height: int):
         pass
 
     @abstractmethod
-    def get_image_bytes(self) -> bytes:
+    def _run_background(self, color: BackgroundColor):
         pass
 
     @abstractmethod
-    def get_current_library(self) -> LibImage:
+    def _run_gaussian(self):
         pass
 
     @abstractmethod
-    def set_optimize(self):
+    def _run_optimize(self):
         pass
 
     @abstractmethod
+    def _run_color(self, mode: ColorMode):
+        pass
+
+    def set_landscape(self):
+        if self.is_vertical():
+            self.set_rotation(90)
+
+    def set_vertical(self):
+        if self.is_landscape():
+            self.set_rotation(90)
+
     def set_paisagem(self):
+        if not self.is_paisagem():
+            # Rotaciona -90 graus
+            self.set_rotation(90)
+
+    def set_rotation(self, rotation: RotationAngle):
+        if rotation not in (90, 180, 270):
+            return
+        self.add_operation(ImageOperation.rotation(rotation))
+
+    def set_max_size(self, max_width: int, max_height: int):
+        """Reduz a imagem para caber em max_width x max_height, mantendo a proporção."""
+        self.add_operation(ImageOperation.resize(max_width, max_height))
+
+    def set_background(self, color: BackgroundColor = "gray"):
+        if color not in BACKGROUND_COLORS:
+            return
+        self.add_operation(ImageOperation("background", (color,)))
+
+    def set_gaussian(self):
+        self.add_operation(ImageOperation("gaussian"))
+
+    def set_optimize(self):
+        """
+            Reduz o tamanho da imagem, e salva a imagen reduzida na propriedade bytes.
+        As exportações (to_file, encode) passam a usar o preset smallest.
+        """
+        self.add_operation(ImageOperation("optimize"))
+        self.__codec_preset = "smallest"
+
+    @abstractmethod
+    def get_real_module(self) -> Union["Image.Image", "cv2.typing.MatLike"]:
         pass
 
     @abstractmethod
-    def set_rotation(self, rotation: RotationAngle):
+    def set_real_module(self, module: Union["Image.Image", "cv2.typing.MatLike"]):
+        """
+            Substitui a imagem decodificada, os bytes serão gerados apenas
+        quando forem solicitados.
+        """
         pass
 
     @abstractmethod
-    def set_background(self, color: BackgroundColor = "gray"):
+    def set_image_bytes(self, img_bytes: bytes):
         pass
 
     @abstractmethod
-    def set_gaussian(self):
+    def get_image_bytes(self) -> bytes:
+        pass
+
+    @abstractmethod
+    def get_current_library(self) -> LibImage:
         pass
 
+    @abstractmethod
+    def is_passthrough(self) -> bool:
+        """
+            True se get_image_bytes() retorna os bytes originais (JPEG, PNG...) sem
+        recodificar, ou seja, nenhuma operação alterou os pixels.
+        """
+        pass
+
+    def get_bytes_format(self) -> str:
+        """Formato (extensão) dos bytes retornados por get_image_bytes()/to_bytes()."""
+        return probe_image_format(self.get_image_bytes()) or "png"
+
+    def get_blank_stats(self, detector: BlankPageDetector | None = None) -> BlankPageStats:
+        """Classifica a imagem como blank, near_blank ou content (ver BlankPageDetector)."""
+        if detector is None:
+            detector = BlankPageDetector()
+        return detector.analyze(self.to_image_opencv())
+
+    def is_blank(self, detector: BlankPageDetector | None = None) -> bool:
+        return self.get_blank_stats(detector).is_blank()
+
     def get_invert_color(self) -> ImageInvertColor:
         if self.__invert_color is None:
-            self.__invert_color = ImageInvertColor.create_from_bytes(
-                self.get_image_bytes(), library=self.get_current_library()
-            )
+            if self.get_current_library() == "pil":
+                self.__invert_color = ImageInvertColor.create_from_pil(self.get_real_module())
+            else:
+                self.__invert_color = ImageInvertColor.create_from_opencv(self.get_real_module())
         return self.__invert_color
 
     def set_invert_color(self, invert: ImageInvertColor):
         self.__invert_color = invert
 
-    @abstractmethod
-    def is_paisagem(self) -> bool:
-        """
-        Retorna True se a imagem estiver em modo paisagem.
-        """
-        pass
-
     def is_gaussian(self) -> bool:
         return self.get_invert_color().is_gaussian_blur()
 
@@ -408,6 +1148,35 @@ class InterfaceImageObject(ABC):
     def set_output_extension(self, fmt: ImageExtension):
         self.__output_extension = fmt
 
+    def get_codec_preset(self) -> CodecPreset:
+        return self.__codec_preset
+
+    def set_codec_preset(self, preset: CodecPreset):
+        """Preset de codificação (fast, balanced, smallest) usado em encode() e to_file()."""
+        if preset not in CODEC_PRESETS:
+            raise ValueError(f'{__class__.__name__} preset inválido: {preset}, use: {CODEC_PRESETS}')
+        self.__codec_preset = preset
+
+    @abstractmethod
+    def _encode_pixels(self, fmt: str) -> bytes:
+        """Codifica os pixels atuais em fmt (png, jpg, webp, tiff) com o preset atual."""
+        pass
+
+    def encode(self, extension: ImageExtension | None = None) -> bytes:
+        """
+            Bytes da imagem no formato extension, codificados com get_codec_preset().
+        Se os pixels não foram alterados, os bytes originais são retornados quando
+        extension é None ou o formato é o mesmo (sem recodificar).
+
+        :param extension: Formato de saída, None usa get_output_extension() (ou o formato original).
+        """
+        self.apply_operations()
+        if self.is_passthrough():
+            img_bytes = self.get_image_bytes()
+            if extension is None or is_same_format(extension, probe_image_format(img_bytes)):
+                return img_bytes
+        return self._encode_pixels(normalize_extension(extension or self.get_output_extension()))
+
     def to_image_pil(self) -> Image.Image:
         return Image.open(BytesIO(self.get_image_bytes()))
 
@@ -419,17 +1188,24 @@ class InterfaceImageObject(ABC):
     def to_bytes(self) -> bytes:
         return self.get_image_bytes()
 
+    @abstractmethod
+    def _write_file(self, path: str):
+        """Grava os pixels atuais com o codificador da biblioteca (formatos sem preset, ex: bmp)."""
+        pass
+
     def to_file(self, filepath: File):
-        if self.get_current_library() == "pil":
-            try:
-                self.to_image_pil().save(filepath.absolute(), format=self.get_output_extension())
-            except Exception as e:
-                raise Exception(f"{__class__.__name__} Erro ao salvar imagem PIL: {e}")
-        elif self.get_current_library() == "opencv":
-            try:
-                cv2.imwrite(filepath.absolute(), self.to_image_opencv())
-            except Exception as e:
-                raise Exception(f"Erro ao salvar imagem OpenCV: {e}")
+        """
+            Grava a imagem no formato da extensão do arquivo (ou get_output_extension()).
+        Formatos sem preset (ex: bmp, ppm) são gravados pela própria biblioteca.
+        """
+        extension = filepath.extension() or self.get_output_extension()
+        if not is_codec_extension(extension):
+            self.apply_operations()
+            self._write_file(filepath.absolute())
+            return
+        img_bytes = self.encode(extension)
+        with open(filepath.absolute(), 'wb') as file:
+            file.write(img_bytes)
 
     @classmethod
     def builder(cls) -> BuilderInterface:
@@ -439,86 +1215,196 @@ class InterfaceImageObject(ABC):
 class ImageObjectPIL(InterfaceImageObject):
     """
         Implementação de ImageObject usando PIL.
+
+        A imagem PIL decodificada é o estado principal do objeto, os bytes
+    só são (re)gerados quando to_bytes()/get_image_bytes() for chamado.
     """
 
-    def __init__(self, image_bytes: bytes):
+    def __init__(
+                self, image_bytes: Union[bytes, memoryview, Image.Image], *,
+                max_size: Tuple[int, int] | None = DEFAULT_MAX_SIZE,
+            ):
         super().__init__()
-        if not isinstance(image_bytes, bytes):
+        # Dimensões máximas, None mantém imagens grandes (processadas em blocos, ver tiles).
+        self.max_size: Tuple[int, int] | None = max_size
+        # Preset usado nos bytes gerados a partir dos pixels (None: bytes originais ou ainda não gerados).
+        self.__bytes_preset: CodecPreset | None = None
+        if isinstance(image_bytes, (bytes, memoryview)) and not is_image_complete(image_bytes):
+            # Image.open() só lê o cabeçalho, arquivos truncados são rejeitados aqui.
+            raise ValueError(f"{__class__.__name__}\nPIL: bytes de imagem incompletos")
+        if isinstance(image_bytes, Image.Image):
+            # Imagem já decodificada (ex: vinda de image_opencv_to_pil()).
+            img = image_bytes
+            self.__img_bytes: bytes | None = None
+        elif isinstance(image_bytes, memoryview):
+            # Arquivo mapeado em memória: os bytes são copiados apenas se forem mantidos
+            # (sem redução), senão a imagem é decodificada direto do buffer.
+            try:
+                img = Image.open(BufferReader(image_bytes))
+                self.__img_bytes: bytes | None = None
+                if fit_max_size(img.width, img.height, self.max_size) == img.size:
+                    self.__img_bytes = image_bytes.tobytes()
+                    img = Image.open(BytesIO(self.__img_bytes))
+            except Exception as e:
+                raise ValueError(f"{__class__.__name__}\nPIL: {e}")
+        elif isinstance(image_bytes, bytes):
+            # Os bytes originais são mantidos até que os pixels sejam alterados.
+            self.__img_bytes: bytes | None = image_bytes
+            try:
+                img = Image.open(BytesIO(image_bytes))
+            except Exception as e:
+                raise ValueError(f"{__class__.__name__}\nPIL: {e}")
+        else:
             raise InvalidSourceImageError(
-                f'{__class__.__name__} Use: bytes, não {type(image_bytes)}'
+                f'{__class__.__name__} Use: bytes|Image, não {type(image_bytes)}'
             )
 
-        self.__img_bytes = image_bytes
-        self.max_size: Tuple[int, int] = (1980, 720)  # Dimensões máximas, altere se necessário.
-        try:
-            img = Image.open(BytesIO(image_bytes))
-        except Exception as e:
-            raise ValueError(f"{__class__.__name__}\nPIL: {e}")
-
         # Redimensionar, se as dimensões forem maior que self.max_size.
-        if img.width > self.max_size[0] or img.height > self.max_size[1]:
-            buff_image: BytesIO = BytesIO()
-            img.save(buff_image, format='PNG', optimize=True, quality=80)
-            self.__img_bytes = buff_image.getvalue()
-            buff_image.seek(0)
-            buff_image.close()
-        del img
-
-    def set_landscape(self):
-        if self.is_vertical():
-            self.set_rotation(90)
-
-    def set_vertical(self):
-        if self.is_landscape():
-            self.set_rotation(90)
+        new_size = fit_max_size(img.width, img.height, self.max_size)
+        if new_size != img.size:
+            if getattr(img, "format", None) == "JPEG":
+                # O libjpeg decodifica direto em 1/2, 1/4 ou 1/8 do tamanho original.
+                img.draft(img.mode, new_size)
+            img = img.resize(new_size, Image.Resampling.LANCZOS)
+            # Os bytes serão gerados novamente (PNG) na próxima leitura.
+            self.__img_bytes = None
+        self.__img_pil: Image.Image | None = img
+        self.__passthrough: bool = self.__img_bytes is not None
+        self._update_color_mode(ImageMetadata.create_from_pil(img).get_color_mode())
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        if self.__passthrough and self.__img_bytes is not None:
+            # Bytes originais: envia apenas os bytes, os pixels são decodificados se necessário.
+            state['_ImageObjectPIL__img_pil'] = None
+        elif self.__img_pil is not None:
+            # Envia apenas os pixels (buffer bruto), os bytes são gerados de novo se necessário
+            # com o mesmo preset (ex: smallest após set_optimize()), o resultado é o mesmo.
+            state['_ImageObjectPIL__img_bytes'] = None
+            state['_ImageObjectPIL__bytes_preset'] = None
+        return state
+
+    def __get_module(self) -> Image.Image:
+        self.load_spilled()
+        if self.__img_pil is None:
+            self.__img_pil = Image.open(BytesIO(self.__img_bytes))
+        return self.__img_pil
+
+    def __set_module(self, module: Image.Image):
+        self.__img_pil = module
+        self.__img_bytes = None
+        self.__bytes_preset = None
+        self.__passthrough = False
+        self.clear_metadata()
 
     def get_real_module(self) -> Union["Image.Image", "cv2.typing.MatLike"]:
-        return Image.open(BytesIO(self.get_image_bytes()))
-
-    def get_width(self) -> int:
-        return self.to_image_pil().width
-
-    def get_height(self) -> int:
-        return self.to_image_pil().height
+        self.apply_operations()
+        return self.__get_module()
+
+    def set_real_module(self, module: Image.Image):
+        self.clear_operations()
+        self._discard_spill()
+        self.__set_module(module)
+        self._update_color_mode(None)
+        self._reset_crop_box()
+
+    def _probe_metadata(self) -> ImageMetadata:
+        self.load_spilled()
+        if self.__img_pil is None:
+            _meta = probe_image_header(self.__img_bytes)
+            if _meta is not None:
+                return _meta
+        # Image.open() lê apenas o cabeçalho até que os pixels sejam usados.
+        return ImageMetadata.create_from_pil(self.__get_module())
 
     def set_image_bytes(self, img_bytes: bytes):
+        self.clear_operations()
+        self._discard_spill()
         self.__img_bytes = img_bytes
+        self.__img_pil = None
+        self.__bytes_preset = None
+        self.__passthrough = True
+        self.clear_metadata()
+        self._update_color_mode(None)
+        self._reset_crop_box()
 
     def get_image_bytes(self) -> bytes:
+        """Bytes originais ou PNG gerado dos pixels com get_codec_preset()."""
+        self.apply_operations()
+        self.load_spilled()
+        if self.__img_bytes is not None and self.__bytes_preset not in (None, self.get_codec_preset()):
+            if self.__img_pil is not None:
+                # O preset mudou depois que os bytes foram gerados.
+                self.__img_bytes = None
+        if self.__img_bytes is None:
+            self.__img_bytes = self._encode_pixels("png")
+            self.__bytes_preset = self.get_codec_preset()
         return self.__img_bytes
 
     def get_current_library(self) -> LibImage:
         return "pil"
 
-    def set_background(self, color: BackgroundColor = "gray"):
-        if color == "gray":
-            self.__set_background_gray()
-        elif color == "black":
-            self.__set_background_black()
+    def is_passthrough(self) -> bool:
+        self.apply_operations()
+        return self.__passthrough
+
+    def get_resident_bytes(self) -> int:
+        size = 0 if self.__img_bytes is None else len(self.__img_bytes)
+        if self.__img_pil is not None:
+            # Estimativa dos pixels decodificados (a imagem pode ainda não ter sido carregada).
+            size += self.__img_pil.width * self.__img_pil.height * len(self.__img_pil.getbands())
+        return size
+
+    def _dump_data(self) -> Tuple[SpillKind, Union[bytes, np.ndarray], tuple, str]:
+        if self.__img_bytes is not None:
+            return "bytes", self.__img_bytes, (), ""
+        # pickle da imagem PIL: buffer bruto + modo + paleta, sem codificar.
+        return "pil", pickle.dumps(self.__img_pil, protocol=pickle.HIGHEST_PROTOCOL), (), ""
+
+    def _drop_data(self):
+        self.__img_bytes = None
+        self.__img_pil = None
+
+    def _load_data(self, kind: SpillKind, data: Union[bytes, np.ndarray], spilled: SpilledData):
+        if kind == "bytes":
+            self.__img_bytes = data
+        else:
+            # Arquivo temporário gravado por este mesmo objeto em spill().
+            self.__img_pil = pickle.loads(data)
 
-    def __set_background_black(self):
-        #inv = ImageInvertColor.create_from_bytes(self.to_bytes(), library="pil")
-        inv = self.get_invert_color()
-        inv.set_image_bytes(self.get_image_bytes())
-        inv.set_background("black")
-        self.__img_bytes = inv.to_bytes()
+    def to_image_pil(self) -> Image.Image:
+        self.apply_operations()
+        return self.__get_module().copy()
 
-    def __set_background_gray(self):
-        # inv = ImageInvertColor.create_from_bytes(self.to_bytes(), library="pil")
-        inv = self.get_invert_color()
-        inv.set_image_bytes(self.get_image_bytes())
-        inv.set_background("gray")
-        self.__img_bytes = inv.to_bytes()
+    def to_image_opencv(self) -> cv2.typing.MatLike:
+        self.apply_operations()
+        # Mesmo resultado de image_bytes_to_opencv() (escala de cinza), sem codificar.
+        return np.asarray(self.__get_module().convert("L"))
 
-    def is_paisagem(self) -> bool:
-        """
-        Retorna True se a imagem estiver em modo paisagem.
-        """
-        width, height = self.get_width(), self.get_height()
-        return width > height
+    def _get_gray_pixels(self) -> np.ndarray:
+        img = self.__get_module()
+        return np.asarray(img if img.mode == "L" else img.convert("L"))
 
-    def set_rotation(self, rotation: RotationAngle):
-        img = Image.open(BytesIO(self.__img_bytes))
+    def _run_crop(self, x: int, y: int, width: int, height: int):
+        self.__set_module(self.__get_module().crop((x, y, x + width, y + height)))
+
+    def _run_deskew(self, angle: float):
+        img = self.__get_module()
+        # No modo '1' o PIL usa NEAREST e a imagem continua binária.
+        self.__set_module(img.rotate(angle, Image.Resampling.BICUBIC, expand=True, fillcolor="white"))
+        if img.mode != "1" and self.get_color_mode() == "binary":
+            self._update_color_mode("gray")
+
+    def _run_background(self, color: BackgroundColor):
+        inv = self.get_invert_color()
+        inv.set_real_module(self.__get_module())
+        inv.set_background(color)
+        self.__set_module(inv.get_real_module())
+        # gray no PIL gera 0/150, apenas sauvola/niblack resultam em 0/255.
+        self._update_color_mode("binary" if color in ("sauvola", "niblack") else "gray")
+
+    def _run_rotation(self, rotation: int):
+        img = self.__get_module()
         if rotation == 90:
             img = img.transpose(Image.Transpose.ROTATE_90)
         elif rotation == 180:
@@ -527,154 +1413,346 @@ class ImageObjectPIL(InterfaceImageObject):
             img = img.transpose(Image.Transpose.ROTATE_270)
         else:
             return
-        new_bytes = BytesIO()
-        img.save(new_bytes, format='png')
-        self.__img_bytes = new_bytes.getvalue()
-        new_bytes.close()
-
-    def set_paisagem(self):
-        if not self.is_paisagem():
-            img = Image.open(BytesIO(self.__img_bytes))
-            img = img.transpose(Image.Transpose.ROTATE_90)  # Rotaciona -90 graus
-            new_bytes = BytesIO()
-            img.save(new_bytes, format='png')
-            self.__img_bytes = new_bytes.getvalue()
-            new_bytes.close()
+        self.__set_module(img)
+
+    def _run_resize(self, max_width: int, max_height: int):
+        img = self.__get_module()
+        new_size = fit_size(img.width, img.height, max_width, max_height)
+        if new_size != img.size:
+            self.__set_module(img.resize(new_size, Image.Resampling.LANCZOS))
+            # No modo '1' o PIL redimensiona com NEAREST e a imagem continua binária.
+            if img.mode != "1" and self.get_color_mode() == "binary":
+                self._update_color_mode("gray")
+
+    def _run_optimize(self):
+        # Os pixels não mudam, apenas a codificação dos bytes.
+        self.__img_bytes = encode_pil(
+            self.__get_module(), "png", "smallest", bilevel=self.get_color_mode() == "binary"
+        )
+        self.__bytes_preset = "smallest"
+        self.__passthrough = False
 
-    def set_optimize(self):
-        optimized_bytes = BytesIO()
-        img = self.to_image_pil()
-        img.save(optimized_bytes, format='PNG', optimize=True, quality=80)
-        self.__img_bytes = optimized_bytes.getvalue()
-        optimized_bytes.close()
+    def _encode_pixels(self, fmt: str) -> bytes:
+        return encode_pil(
+            self.__get_module(), fmt, self.get_codec_preset(), bilevel=self.get_color_mode() == "binary"
+        )
 
-    def set_gaussian(self):
-        inv = ImageInvertColor.create_from_bytes(self.to_bytes(), library="pil")
+    def _write_file(self, path: str):
+        try:
+            self.__get_module().save(path)
+        except Exception as e:
+            raise ValueError(f"{__class__.__name__} Erro ao salvar imagem PIL: {e}")
+
+    def _run_gaussian(self):
+        img = self.__get_module()
+        if img.mode == "1":
+            # ImageFilter não aceita imagens de 1 bit.
+            img = img.convert("L")
+        inv = ImageInvertColor.create_from_pil(img)
         inv.set_gaussian_blur()
-        self.__img_bytes = inv.to_bytes()
+        self.__set_module(inv.get_real_module())
+        if self.get_color_mode() == "binary":
+            self._update_color_mode("gray")
+
+    def _run_color(self, mode: ColorMode):
+        img = self.__get_module()
+        if mode == "bgr":
+            if img.mode != "RGB":
+                self.__set_module(img.convert("RGB"))
+        elif mode == "gray":
+            if img.mode != "L":
+                self.__set_module(img.convert("L"))
+        elif mode == "binary":
+            _gray = np.asarray(img if img.mode == "L" else img.convert("L"))
+            _, binary = cv2.threshold(_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+            self.__set_module(Image.fromarray(binary))
+        self._update_color_mode(mode)
 
 
 class ImageObjectOpenCV(InterfaceImageObject):
     """
         Implementação de ImageObject usando OpenCV.
+
+        A matriz (MatLike) decodificada é o estado principal do objeto, os bytes
+    PNG só são (re)gerados quando to_bytes()/get_image_bytes() for chamado.
     """
 
-    def __init__(self, image_bytes):
+    def __init__(
+                self, image_bytes: Union[bytes, memoryview, MatLike], *,
+                max_size: Tuple[int, int] | None = DEFAULT_MAX_SIZE,
+            ):
         super().__init__()
-        if not isinstance(image_bytes, bytes):
-            raise ValueError(f'{__class__.__name__} Use: bytes, não {type(image_bytes)}')
-        self.__image_bytes = image_bytes
-        self.max_size: Tuple[int, int] = (1980, 720)
+        self.__image_bytes: bytes | None = None
+        # Preset usado nos bytes gerados a partir dos pixels (None: bytes originais ou ainda não gerados).
+        self.__bytes_preset: CodecPreset | None = None
+        # Dimensões máximas, None mantém imagens grandes (processadas em blocos, ver tiles).
+        self.max_size: Tuple[int, int] | None = max_size
+        new_size: Tuple[int, int] | None = None
+
+        color_mode: ColorMode | None = None
+        self.__passthrough: bool = False
+        if isinstance(image_bytes, np.ndarray):
+            # Imagem já decodificada (ex: vinda de image_pil_to_opencv()).
+            image_opencv: MatLike = image_bytes
+        elif isinstance(image_bytes, (bytes, memoryview)):
+            # Tamanho final e modo de cor obtidos do cabeçalho, se possível, para decodificar
+            # já reduzido e sem converter imagens em escala de cinza para BGR.
+            # memoryview (arquivo mapeado): decodificado direto do buffer, copiado apenas se mantido.
+            _flag: int = cv2.IMREAD_ANYCOLOR
+            _header: ImageMetadata | None = probe_image_header(image_bytes)
+            if _header is not None:
+                color_mode = _header.get_color_mode()
+                new_size = fit_max_size(_header.width, _header.height, self.max_size)
+                if new_size == (_header.width, _header.height):
+                    # Sem redução: mantém os bytes originais, os pixels são decodificados
+                    # apenas quando forem usados. Arquivos truncados são rejeitados aqui.
+                    if not is_image_complete(image_bytes):
+                        raise ValueError(f"{__class__.__name__}: Bytes de imagem OpenCV inválidos (incompletos)")
+                    self.__image_bytes = bytes(image_bytes)
+                    self.__image_opencv: MatLike | None = None
+                    self.__passthrough = True
+                    self._update_color_mode(color_mode)
+                    return
+                _flag = get_reduced_flag(
+                    _header.width, _header.height, new_size, gray=color_mode != "bgr"
+                )
 
-        try:
-            nparr = np.frombuffer(self.__image_bytes, np.uint8)
-            image_opencv: MatLike = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        except Exception as e:
-            print('-' * 80)
-            raise ValueError(f"{__class__.__name__}: Bytes de imagem OpenCV inválidos")
+            try:
+                nparr = np.frombuffer(image_bytes, np.uint8)
+                image_opencv: MatLike = cv2.imdecode(nparr, _flag)
+            except Exception as e:
+                raise ValueError(f"{__class__.__name__}: Bytes de imagem OpenCV inválidos")
+            if image_opencv is None:
+                raise ValueError(f"{__class__.__name__}: Bytes de imagem OpenCV inválidos")
         else:
-            _dimensions = (image_opencv.shape[1], image_opencv.shape[0])  # (largura, altura)
+            raise ValueError(f'{__class__.__name__} Use: bytes|memoryview|MatLike, não {type(image_bytes)}')
 
-        # Redimensionar se necessário
-        if _dimensions[0] > self.max_size[0] or _dimensions[1] > self.max_size[1]:
-            h, w = image_opencv.shape[:2]
-            scale = min(self.max_size[0] / w, self.max_size[1] / h)
-            new_size = (int(w * scale), int(h * scale))
+        # Redimensionamento final (preciso) se necessário
+        h, w = image_opencv.shape[:2]
+        if new_size is None:
+            new_size = fit_max_size(w, h, self.max_size)
+        if new_size != (w, h):
             image_opencv = cv2.resize(image_opencv, new_size, interpolation=cv2.INTER_LANCZOS4)
-            # Converter a imagem de volta para bytes
-        _, encoded_img = cv2.imencode('.png', image_opencv)
-        self.__image_bytes = encoded_img.tobytes()
-
-    def set_landscape(self):
-        if self.is_vertical():
-            _module_image = cv2.rotate(
-                self.to_image_opencv(), cv2.ROTATE_90_COUNTERCLOCKWISE
-            )
-            self.set_image_bytes(image_opencv_to_bytes(_module_image))
-
-    def set_vertical(self):
-        if self.is_landscape():
-            self.set_rotation(90)
+            if color_mode == "binary":
+                color_mode = "gray"
+        elif isinstance(image_bytes, (bytes, memoryview)):
+            # Formato sem leitura de cabeçalho (webp, tiff...) e sem redução: bytes originais.
+            self.__image_bytes = bytes(image_bytes)
+            self.__passthrough = True
+        self.__image_opencv: MatLike | None = image_opencv
+        self._update_color_mode(color_mode)
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        if self.__passthrough and self.__image_bytes is not None:
+            # Bytes originais: envia apenas os bytes, os pixels são decodificados se necessário.
+            state['_ImageObjectOpenCV__image_opencv'] = None
+        elif self.__image_opencv is not None:
+            # Envia apenas os pixels (buffer bruto), os bytes são gerados de novo se necessário
+            # com o mesmo preset (ex: smallest após set_optimize()), o resultado é o mesmo.
+            state['_ImageObjectOpenCV__image_bytes'] = None
+            state['_ImageObjectOpenCV__bytes_preset'] = None
+        return state
+
+    def __get_module(self) -> MatLike:
+        self.load_spilled()
+        if self.__image_opencv is None:
+            nparr = np.frombuffer(self.__image_bytes, np.uint8)
+            # ANYCOLOR: escala de cinza continua com 1 canal, cores em BGR. Com cabeçalho
+            # conhecido a decodificação segue ImageMetadata.to_opencv() (ex: LA => 1 canal).
+            _flag: int = cv2.IMREAD_ANYCOLOR
+            _header: ImageMetadata | None = probe_image_header(self.__image_bytes)
+            if _header is not None:
+                _flag = cv2.IMREAD_GRAYSCALE if _header.to_opencv().channels == 1 else cv2.IMREAD_COLOR
+            self.__image_opencv = cv2.imdecode(nparr, _flag)
+            if self.__image_opencv is None:
+                raise ValueError(f"{__class__.__name__}: Bytes de imagem OpenCV inválidos")
+        return self.__image_opencv
+
+    def __set_module(self, module: MatLike):
+        self.__image_opencv = module
+        self.__image_bytes = None
+        self.__bytes_preset = None
+        self.__passthrough = False
+        self.clear_metadata()
 
     def get_real_module(self) -> "cv2.typing.MatLike":
-        return image_bytes_to_opencv(self.get_image_bytes())
-
-    def get_width(self) -> int:
-        return self.to_image_opencv().shape[1]
-
-    def get_height(self) -> int:
-        return self.to_image_opencv().shape[0]
+        return self.to_image_opencv()
+
+    def set_real_module(self, module: MatLike):
+        self.clear_operations()
+        self._discard_spill()
+        self.__set_module(module)
+        self._update_color_mode(None)
+        self._reset_crop_box()
+
+    def _probe_metadata(self) -> ImageMetadata:
+        self.load_spilled()
+        if self.__image_opencv is None:
+            _meta = probe_image_header(self.__image_bytes)
+            if _meta is not None:
+                # Mesmos valores antes e depois da decodificação.
+                return _meta.to_opencv()
+        return ImageMetadata.create_from_opencv(self.__get_module())
 
     def set_image_bytes(self, img_bytes: bytes):
+        self.clear_operations()
+        self._discard_spill()
         self.__image_bytes = img_bytes
+        self.__image_opencv = None
+        self.__bytes_preset = None
+        self.__passthrough = True
+        self.clear_metadata()
+        self._update_color_mode(None)
+        self._reset_crop_box()
 
     def get_image_bytes(self) -> bytes:
+        """Bytes originais ou PNG gerado dos pixels com get_codec_preset()."""
+        self.apply_operations()
+        self.load_spilled()
+        if self.__image_bytes is not None and self.__bytes_preset not in (None, self.get_codec_preset()):
+            if self.__image_opencv is not None:
+                # O preset mudou depois que os bytes foram gerados.
+                self.__image_bytes = None
+        if self.__image_bytes is None:
+            # gray => PNG 8 bits (1 canal), binary => PNG 1 bit.
+            self.__image_bytes = self._encode_pixels("png")
+            self.__bytes_preset = self.get_codec_preset()
         return self.__image_bytes
 
     def get_current_library(self) -> LibImage:
         return 'opencv'
 
-    def set_background(self, color: BackgroundColor = "gray"):
-        if color == "gray":
-            self.__set_background_gray()
-        elif color == "black":
-            self.__set_background_black()
+    def is_passthrough(self) -> bool:
+        self.apply_operations()
+        return self.__passthrough
+
+    def get_resident_bytes(self) -> int:
+        size = 0 if self.__image_bytes is None else len(self.__image_bytes)
+        if self.__image_opencv is not None:
+            size += self.__image_opencv.nbytes
+        return size
+
+    def _dump_data(self) -> Tuple[SpillKind, Union[bytes, np.ndarray], tuple, str]:
+        if self.__image_bytes is not None:
+            return "bytes", self.__image_bytes, (), ""
+        img = np.ascontiguousarray(self.__image_opencv)
+        return "array", img, img.shape, img.dtype.str
+
+    def _drop_data(self):
+        self.__image_bytes = None
+        self.__image_opencv = None
+
+    def _load_data(self, kind: SpillKind, data: Union[bytes, np.ndarray], spilled: SpilledData):
+        if kind == "bytes":
+            self.__image_bytes = data
+        else:
+            self.__image_opencv = data
 
-    def is_paisagem(self) -> bool:
-        """
-        Retorna True se a imagem estiver em modo paisagem.
-        """
-        width, height = self.get_width(), self.get_height()
-        return width > height
+    def to_image_pil(self) -> Image.Image:
+        self.apply_operations()
+        return image_opencv_to_pil(self.__get_module())
 
-    def set_rotation(self, rotation: RotationAngle):
-        nparr = np.frombuffer(self.__image_bytes, np.uint8)
-        img: MatLike = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    def to_image_opencv(self) -> cv2.typing.MatLike:
+        self.apply_operations()
+        # Mantém o mesmo resultado de image_bytes_to_opencv() (escala de cinza).
+        img: MatLike = self.__get_module()
+        if img.ndim == 3:
+            return bgr_to_gray(img)
+        return img.copy()
+
+    def _get_gray_pixels(self) -> np.ndarray:
+        return bgr_to_gray(self.__get_module())
+
+    def _run_crop(self, x: int, y: int, width: int, height: int):
+        # Cópia: a imagem original (maior) pode ser liberada.
+        self.__set_module(self.__get_module()[y:y + height, x:x + width].copy())
+
+    def _run_deskew(self, angle: float):
+        img: MatLike = self.__get_module()
+        h, w = img.shape[:2]
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        # Nova tela com espaço para os cantos rotacionados.
+        cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+        new_w, new_h = int(round(h * sin + w * cos)), int(round(h * cos + w * sin))
+        matrix[0, 2] += new_w / 2 - w / 2
+        matrix[1, 2] += new_h / 2 - h / 2
+        self.__set_module(cv2.warpAffine(
+            img, matrix, (new_w, new_h), flags=cv2.INTER_CUBIC,
+            borderMode=cv2.BORDER_CONSTANT, borderValue=(255, 255, 255),
+        ))
+        # A interpolação gera tons intermediários.
+        if self.get_color_mode() == "binary":
+            self._update_color_mode("gray")
+
+    def _run_rotation(self, rotation: int):
+        img: MatLike = self.__get_module()
         if rotation == 90:
             img: MatLike = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
         elif rotation == 180:
             img: MatLike = cv2.rotate(img, cv2.ROTATE_180)
         elif rotation == 270:
-            img: MatLike = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-            img: MatLike = cv2.rotate(img, cv2.ROTATE_180)
+            img: MatLike = cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
         else:
             return
-        success, encoded_image = cv2.imencode('.png', img)
-        if success:
-            self.__image_bytes = encoded_image.tobytes()
-
-    def set_paisagem(self):
-        if not self.is_paisagem():
-            nparr = np.frombuffer(self.__image_bytes, np.uint8)
-            img: MatLike = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            img: MatLike = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)  # Rotaciona -90 graus
-            success, encoded_image = cv2.imencode('.png', img)
-            if success:
-                self.__image_bytes = encoded_image.tobytes()
-
-    def set_optimize(self):
-        """
-            Reduz o tamanho da imagem, e salva a imagen reduzida na propriedade bytes.
-        """
-        imagem: MatLike = self.to_image_opencv()
-        _status, buffer = cv2.imencode(".png", imagem, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        if _status:
-            self.__image_bytes = buffer.tobytes()
-
-    def __set_background_black(self):
-        inv = ImageInvertColor.create_from_bytes(self.to_bytes(), library="opencv")
-        inv.set_background('black')
-        self.__image_bytes = inv.to_bytes()
+        self.__set_module(img)
+
+    def _run_resize(self, max_width: int, max_height: int):
+        img: MatLike = self.__get_module()
+        h, w = img.shape[:2]
+        new_size = fit_size(w, h, max_width, max_height)
+        if new_size != (w, h):
+            self.__set_module(cv2.resize(img, new_size, interpolation=cv2.INTER_AREA))
+            # A interpolação gera tons intermediários.
+            if self.get_color_mode() == "binary":
+                self._update_color_mode("gray")
+
+    def _run_optimize(self):
+        # Os pixels não mudam, apenas a codificação dos bytes (PNG, nível 9).
+        self.__image_bytes = encode_opencv(
+            self.__get_module(), "png", "smallest", bilevel=self.get_color_mode() == "binary"
+        )
+        self.__bytes_preset = "smallest"
+        self.__passthrough = False
 
-    def __set_background_gray(self):
-        inv = ImageInvertColor.create_from_bytes(self.to_bytes(), library="opencv")
-        inv.set_background("gray")
-        self.__image_bytes = inv.to_bytes()
+    def _encode_pixels(self, fmt: str) -> bytes:
+        return encode_opencv(
+            self.__get_module(), fmt, self.get_codec_preset(), bilevel=self.get_color_mode() == "binary"
+        )
 
-    def set_gaussian(self):
-        inv = ImageInvertColor.create_from_bytes(self.to_bytes(), library=self.get_current_library())
+    def _write_file(self, path: str):
+        try:
+            ok = cv2.imwrite(path, self.__get_module())
+        except cv2.error as e:
+            raise ValueError(f"{__class__.__name__} Erro ao salvar imagem OpenCV: {e}")
+        if not ok:
+            raise ValueError(f"{__class__.__name__} Erro ao salvar imagem OpenCV: {path}")
+
+    def _run_background(self, color: BackgroundColor):
+        inv = ImageInvertColor.create_from_opencv(self.__get_module())
+        inv.set_background(color)
+        self.__set_module(inv.get_real_module())
+        # black gera 105/255 (threshold 150 invertido), os demais 0/255.
+        self._update_color_mode("gray" if color == "black" else "binary")
+
+    def _run_gaussian(self):
+        inv = ImageInvertColor.create_from_opencv(self.__get_module())
         inv.set_gaussian_blur()
-        self.__image_bytes = inv.to_bytes()
+        self.__set_module(inv.get_real_module())
+        self._update_color_mode("gray")
+
+    def _run_color(self, mode: ColorMode):
+        img: MatLike = self.__get_module()
+        if mode == "bgr":
+            if img.ndim == 2:
+                self.__set_module(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
+        else:
+            img = bgr_to_gray(img)
+            if mode == "binary":
+                _, img = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+            if img is not self.__image_opencv:
+                self.__set_module(img)
+        self._update_color_mode(mode)
 
 
 class ImageObject(ObjectAdapter):
@@ -695,18 +1773,80 @@ class ImageObject(ObjectAdapter):
     def get_output_extension(self) -> ImageExtension:
         return self.__implement_img.get_output_extension()
 
+    def get_codec_preset(self) -> CodecPreset:
+        return self.__implement_img.get_codec_preset()
+
+    def set_codec_preset(self, preset: CodecPreset):
+        """Preset de codificação das exportações: fast, balanced ou smallest."""
+        self.__implement_img.set_codec_preset(preset)
+
+    def encode(self, extension: ImageExtension | None = None) -> bytes:
+        """Bytes no formato extension (png, jpg, webp, tiff) com o preset de codificação atual."""
+        return self.__implement_img.encode(extension)
+
     def get_implementation(self) -> InterfaceImageObject:
         return self.__implement_img
 
     def get_real_module(self) -> Union["Image.Image", "cv2.typing.MatLike"]:
         return self.get_implementation().get_real_module()
 
+    def set_real_module(self, module: Union["Image.Image", "cv2.typing.MatLike"]):
+        self.get_implementation().set_real_module(module)
+
     def get_width(self) -> int:
         return self.__implement_img.get_width()
 
     def get_height(self) -> int:
         return self.__implement_img.get_height()
 
+    def get_channels(self) -> int:
+        return self.__implement_img.get_channels()
+
+    def get_mode(self) -> str:
+        return self.__implement_img.get_mode()
+
+    def get_color_mode(self) -> ColorMode:
+        return self.__implement_img.get_color_mode()
+
+    def set_color_mode(self, mode: ColorMode):
+        """Converte para gray, bgr ou binary (executado junto com as demais operações)."""
+        self.__implement_img.set_color_mode(mode)
+
+    def get_crop_box(self) -> CropBox | None:
+        return self.__implement_img.get_crop_box()
+
+    def set_autocrop(self, padding: int = 8):
+        """Recorta bordas do scanner e margens em branco (ver get_crop_box())."""
+        self.__implement_img.set_autocrop(padding)
+
+    def get_orientation(self, *, rotation: int | None = None) -> OrientationEstimate:
+        return self.__implement_img.get_orientation(rotation=rotation)
+
+    def get_hash(self, method: HashMethod = "dhash", size: int = 8) -> ImageHash:
+        """Hash perceptual da imagem (ver DuplicateIndex)."""
+        return self.__implement_img.get_hash(method, size)
+
+    def set_orientation(
+                self,
+                estimate: OrientationEstimate | None = None, *,
+                min_confidence: float = 0.1,
+                min_skew: float = 0.2,
+                min_skew_confidence: float = 0.1,
+            ) -> OrientationEstimate:
+        """Corrige rotação e inclinação do texto de uma só vez (ver get_orientation())."""
+        return self.__implement_img.set_orientation(
+            estimate,
+            min_confidence=min_confidence,
+            min_skew=min_skew,
+            min_skew_confidence=min_skew_confidence,
+        )
+
+    def set_deskew(self, angle: float):
+        self.__implement_img.set_deskew(angle)
+
+    def get_metadata(self) -> ImageMetadata:
+        return self.__implement_img.get_metadata()
+
     def set_image_bytes(self, img_bytes: bytes):
         self.__implement_img.set_image_bytes(img_bytes)
 
@@ -728,6 +1868,17 @@ class ImageObject(ObjectAdapter):
     def set_rotation(self, rotation: RotationAngle = 90):
         self.__implement_img.set_rotation(rotation)
 
+    def set_max_size(self, max_width: int, max_height: int):
+        """Reduz a imagem para caber em max_width x max_height, mantendo a proporção."""
+        self.__implement_img.set_max_size(max_width, max_height)
+
+    def has_operations(self) -> bool:
+        return self.__implement_img.has_operations()
+
+    def apply_operations(self):
+        """Executa as operações pendentes (rotação, fundo, desfoque...)."""
+        self.__implement_img.apply_operations()
+
     def set_paisagem(self):
         self.__implement_img.set_paisagem()
 
@@ -746,36 +1897,124 @@ class ImageObject(ObjectAdapter):
     def is_paisagem(self) -> bool:
         return self.__implement_img.is_paisagem()
 
+    def get_blank_stats(self, detector: BlankPageDetector | None = None) -> BlankPageStats:
+        return self.__implement_img.get_blank_stats(detector)
+
+    def is_blank(self, detector: BlankPageDetector | None = None) -> bool:
+        """True se a imagem for uma página em branco (ou apenas com poeira/ruído)."""
+        return self.__implement_img.is_blank(detector)
+
     def to_bytes(self) -> bytes:
         return self.__implement_img.to_bytes()
 
+    def is_passthrough(self) -> bool:
+        """True se to_bytes() retorna os bytes originais da imagem (sem recodificar)."""
+        return self.__implement_img.is_passthrough()
+
+    def get_bytes_format(self) -> str:
+        """Formato (png, jpg, webp...) dos bytes retornados por to_bytes()."""
+        return self.__implement_img.get_bytes_format()
+
+    def is_spilled(self) -> bool:
+        """True se o conteúdo da imagem está em disco (ver SpillStore)."""
+        return self.__implement_img.is_spilled()
+
+    def get_resident_bytes(self) -> int:
+        return self.__implement_img.get_resident_bytes()
+
     @classmethod
-    def create_from_bytes(cls, image_bytes: bytes, *, library: LibImage = "opencv") -> 'ImageObject':
+    def create_from_bytes(
+                cls, image_bytes: bytes, *,
+                library: LibImage = "opencv",
+                max_size: Tuple[int, int] | None = DEFAULT_MAX_SIZE,
+            ) -> 'ImageObject':
+        """
+        :param max_size: Imagens maiores são reduzidas na criação, None mantém o tamanho
+            original (ex: plantas A0, os filtros passam a rodar em blocos).
+        """
         if library == "pil":
-            img = ImageObjectPIL(image_bytes)
+            img = ImageObjectPIL(image_bytes, max_size=max_size)
         elif library == "opencv":
-            img = ImageObjectOpenCV(image_bytes)
+            img = ImageObjectOpenCV(image_bytes, max_size=max_size)
         else:
             raise ValueError("Biblioteca de imagem inválida.")
         return cls(img)
 
     @classmethod
-    def create_from_file(cls, filepath: File, *, library: LibImage = "opencv") -> 'ImageObject':
+    def create_from_opencv(
+                cls, img: cv2.typing.MatLike, *,
+                library: LibImage = "opencv",
+                max_size: Tuple[int, int] | None = DEFAULT_MAX_SIZE,
+            ) -> 'ImageObject':
+        """Cria o objeto a partir de um MatLike (BGR ou cinza), sem codificar a imagem."""
+        if library == "pil":
+            return cls(ImageObjectPIL(image_opencv_to_pil(img), max_size=max_size))
+        elif library == "opencv":
+            return cls(ImageObjectOpenCV(img, max_size=max_size))
+        raise ValueError("Biblioteca de imagem inválida.")
+
+    @classmethod
+    def create_from_pil(
+                cls, img: Image.Image, *,
+                library: LibImage = "pil",
+                max_size: Tuple[int, int] | None = DEFAULT_MAX_SIZE,
+            ) -> 'ImageObject':
+        """Cria o objeto a partir de uma imagem PIL, sem codificar a imagem."""
+        if library == "pil":
+            return cls(ImageObjectPIL(img, max_size=max_size))
+        elif library == "opencv":
+            return cls(ImageObjectOpenCV(image_pil_to_opencv(img), max_size=max_size))
+        raise ValueError("Biblioteca de imagem inválida.")
+
+    def to_library(self, library: LibImage) -> 'ImageObject':
+        """
+            Retorna este objeto na biblioteca informada, a conversão é feita
+        diretamente entre numpy e PIL (sem PNG).
+        """
+        if library == self.get_current_library():
+            return self
+        if library == "pil":
+            # ImageObjectOpenCV.to_image_pil() já usa image_opencv_to_pil()
+            return ImageObject.create_from_pil(self.to_image_pil(), library="pil", max_size=None)
+        return ImageObject.create_from_pil(self.get_real_module(), library=library, max_size=None)
+
+    @classmethod
+    def create_from_file(
+                cls, filepath: File, *,
+                library: LibImage = "opencv",
+                use_mmap: bool = True,
+                max_size: Tuple[int, int] | None = DEFAULT_MAX_SIZE,
+            ) -> 'ImageObject':
+        """
+        :param use_mmap: O arquivo é mapeado em memória e decodificado direto do buffer,
+            os bytes só são copiados se forem mantidos (imagem sem redução).
+        :param max_size: Ver create_from_bytes().
+        """
+        if library not in ("pil", "opencv"):
+            raise ValueError("Biblioteca de imagem inválida.")
         bt = None
+        mapped: MappedFile | None = None
         try:
-            with open(filepath.absolute(), "rb") as f:
-                bt = f.read()
+            if use_mmap:
+                mapped = MappedFile(filepath)
+            else:
+                with open(filepath.absolute(), "rb") as f:
+                    bt = f.read()
         except FileNotFoundError:
             raise FileNotFoundError(f"{__class__.__name__} [{filepath}] not found")
         except Exception as e:
             raise Exception(f"{__class__.__name__} [{filepath}] {e}")
 
-        if library == "pil":
-            image = ImageObjectPIL(bt)
-        elif library == "opencv":
-            image = ImageObjectOpenCV(bt)
-        else:
-            raise ValueError("Biblioteca de imagem inválida.")
+        try:
+            source = bt if mapped is None else mapped.get_view()
+            if library == "pil":
+                image = ImageObjectPIL(source, max_size=max_size)
+            else:
+                image = ImageObjectOpenCV(source, max_size=max_size)
+        finally:
+            source = None
+            if mapped is not None:
+                mapped.close()
         return cls(image)
 
     @classmethod
@@ -811,9 +2050,12 @@ class BuilderInterfaceImage(BuilderInterface):
 
 
 __all__ = [
-    'image_bytes_to_opencv', 'image_opencv_to_bytes',
+    'image_bytes_to_opencv', 'image_opencv_to_bytes', 'image_opencv_to_pil', 'image_pil_to_opencv',
     'ImageObject', 'ImageInvertColor', 'BuilderInterfaceImage',
-    'LibImage', 'ImageExtension'
+    'LibImage', 'ImageExtension', 'ImageMetadata', 'BackgroundColor', 'BACKGROUND_COLORS',
+    'ColorMode', 'COLOR_MODES', 'probe_image_header', 'probe_image_format', 'is_same_format',
+    'is_image_complete', 'DEFAULT_MAX_SIZE',
+    'get_pixels_digest',
 ]
 
 
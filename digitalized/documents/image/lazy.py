@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#
+"""
+    Fontes de imagens sob demanda: as imagens são lidas/decodificadas apenas
+durante a iteração, com leitura antecipada (prefetch) limitada. Um pipeline que
+processa e descarta cada página usa memória constante.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Iterator
+from soup_files import File, Directory, InputFiles
+from digitalized.documents.image.image import ImageObject, LibImage
+
+
+class ImageSource(ABC):
+    """Origem das imagens de LazyImageStream: quantidade conhecida sem decodificar."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def load(self, index: int) -> ImageObject:
+        pass
+
+    def is_thread_safe(self) -> bool:
+        """False: load() só pode ser chamado na thread que itera (sem prefetch)."""
+        return True
+
+
+class FileImageSource(ImageSource):
+
+    def __init__(self, files: list[File], *, library: LibImage = "opencv"):
+        self.files: list[File] = list(files)
+        self.library: LibImage = library
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def load(self, index: int) -> ImageObject:
+        return ImageObject.create_from_file(self.files[index], library=self.library)
+
+    @classmethod
+    def create_from_dir(cls, dir_img: Directory, *, library: LibImage = "opencv") -> FileImageSource:
+        # Apenas lista os arquivos, nenhuma imagem é lida.
+        return cls(InputFiles(dir_img).images, library=library)
+
+
+class LazyImageStream(object):
+    """
+        Sequência de ImageObject lida sob demanda. A iteração mantém no máximo
+    prefetch imagens carregadas à frente da imagem atual.
+
+    :param prefetch: Imagens lidas antecipadamente, 0 lê cada imagem apenas quando solicitada.
+    :param workers: Threads usadas no prefetch (leitura do arquivo + decodificação).
+    """
+
+    def __init__(self, source: ImageSource, *, prefetch: int = 2, workers: int = 2):
+        if prefetch < 0:
+            raise ValueError(f'{__class__.__name__} prefetch deve ser >= 0, não {prefetch}')
+        self.__source: ImageSource = source
+        self.prefetch: int = prefetch
+        self.workers: int = max(1, workers)
+
+    def get_source(self) -> ImageSource:
+        return self.__source
+
+    def __len__(self) -> int:
+        return len(self.__source)
+
+    def __getitem__(self, index: int) -> ImageObject:
+        """Lê apenas a imagem index (nada fica em cache)."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{__class__.__name__} índice fora do intervalo: {index}')
+        return self.__source.load(index)
+
+    def __iter__(self) -> Iterator[ImageObject]:
+        total = len(self)
+        if self.prefetch == 0 or not self.__source.is_thread_safe():
+            for num in range(total):
+                yield self.__source.load(num)
+            return
+
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                next_num = 0
+                while next_num < total and len(pending) <= self.prefetch:
+                    pending.append(executor.submit(self.__source.load, next_num))
+                    next_num += 1
+                while len(pending) > 0:
+                    img = pending.popleft().result()
+                    yield img
+                    # Nova leitura apenas após o consumidor liberar a imagem atual:
+                    # no máximo prefetch imagens carregadas à frente.
+                    img = None
+                    if next_num < total:
+                        pending.append(executor.submit(self.__source.load, next_num))
+                        next_num += 1
+            finally:
+                # Iteração interrompida: leituras ainda não iniciadas são canceladas.
+                for fut in pending:
+                    fut.cancel()
+
+    def map(self, func: Callable[[ImageObject], Any]) -> Iterator[Any]:
+        """Aplica func a cada imagem durante a iteração, sem manter as imagens."""
+        for img in self:
+            yield func(img)
+
+    @classmethod
+    def create_from_files(
+                cls, files: list[File], *, library: LibImage = "opencv", prefetch: int = 2, workers: int = 2
+            ) -> LazyImageStream:
+        return cls(FileImageSource(files, library=library), prefetch=prefetch, workers=workers)
+
+    @classmethod
+    def create_from_dir(
+                cls, dir_img: Directory, *, library: LibImage = "opencv", prefetch: int = 2, workers: int = 2
+            ) -> LazyImageStream:
+        return cls(FileImageSource.create_from_dir(dir_img, library=library), prefetch=prefetch, workers=workers)
+
+
+__all__ = ['ImageSource', 'FileImageSource', 'LazyImageStream']
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+#
+"""
+    Leitura de muitas imagens em paralelo (ex: diretórios em rede): a leitura dos
+arquivos de uma imagem acontece enquanto outras são decodificadas. O resultado
+mantém a ordem dos arquivos e um erro em um arquivo não interrompe o lote.
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Union
+import asyncio
+from soup_files import File, Directory, InputFiles
+from digitalized.documents.image.image import ImageObject, LibImage
+
+LoaderInput = Union[Iterable[File], InputFiles, Directory]
+
+
+@dataclass
+class LoadResult:
+    """Resultado da leitura de um arquivo: image ou error."""
+    file: File
+    image: ImageObject | None = None
+    error: Exception | None = None
+
+    def is_ok(self) -> bool:
+        return self.error is None
+
+
+def get_input_files(files: LoaderInput) -> list[File]:
+    """Lista de arquivos de imagem de uma lista, InputFiles ou Directory."""
+    if isinstance(files, Directory):
+        files = InputFiles(files)
+    if isinstance(files, InputFiles):
+        return files.images
+    return list(files)
+
+
+class BulkImageLoader(object):
+    """
+    :param concurrency: Máximo de arquivos sendo lidos/decodificados ao mesmo tempo,
+        também é o máximo de imagens carregadas em iter_load(), incluindo a imagem
+        sendo consumida.
+    :param library: Biblioteca das imagens criadas.
+    """
+
+    def __init__(self, *, concurrency: int = 8, library: LibImage = "opencv"):
+        if concurrency < 1:
+            raise ValueError(f'{__class__.__name__} concurrency deve ser >= 1, não {concurrency}')
+        self.concurrency: int = concurrency
+        self.library: LibImage = library
+
+    def load_file(self, file: File) -> LoadResult:
+        """Lê e decodifica um arquivo, o erro é retornado em vez de propagado."""
+        try:
+            # Arquivo mapeado em memória: decodificado sem cópia intermediária em bytes.
+            return LoadResult(file, ImageObject.create_from_file(file, library=self.library))
+        except Exception as e:
+            return LoadResult(file, error=e)
+
+    def iter_load(self, files: LoaderInput) -> Iterator[LoadResult]:
+        """Resultados na ordem dos arquivos, à medida que ficam prontos."""
+        items = get_input_files(files)
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                next_num = 0
+                while next_num < len(items) and len(pending) < self.concurrency:
+                    pending.append(executor.submit(self.load_file, items[next_num]))
+                    next_num += 1
+                while len(pending) > 0:
+                    result: LoadResult = pending.popleft().result()
+                    yield result
+                    # Nova leitura apenas após o consumidor liberar o resultado atual:
+                    # no máximo concurrency imagens carregadas, incluindo a atual.
+                    result = None
+                    if next_num < len(items):
+                        pending.append(executor.submit(self.load_file, items[next_num]))
+                        next_num += 1
+            finally:
+                for fut in pending:
+                    fut.cancel()
+
+    def load(self, files: LoaderInput) -> list[LoadResult]:
+        return list(self.iter_load(files))
+
+    async def load_async(self, files: LoaderInput) -> list[LoadResult]:
+        """Igual a load() para código asyncio, no máximo concurrency leituras simultâneas."""
+        items = get_input_files(files)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+
+            async def _load(file: File) -> LoadResult:
+                async with semaphore:
+                    return await loop.run_in_executor(executor, self.load_file, file)
+            return list(await asyncio.gather(*[_load(f) for f in items]))
+
+
+__all__ = ['BulkImageLoader', 'LoadResult', 'LoaderInput', 'get_input_files']
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+#
+"""
+    Estimativa rápida da orientação (0, 90, 180, 270) e da inclinação (skew) do
+texto com perfis de projeção de uma amostra reduzida, para corrigir a página uma
+única vez antes do OCR.
+
+- Linhas de texto horizontais geram um perfil por linha com grande variação
+  (linhas de texto e espaços), o perfil por coluna é mais uniforme.
+- Texto de cabeça para baixo: em cada linha de texto há mais tinta acima da faixa
+  das letras minúsculas (maiúsculas, b, d, f, h, k, l, t) que abaixo (g, j, p, q, y).
+- Inclinação: o ângulo que deixa o perfil por linha mais concentrado.
+
+    Os ângulos seguem set_rotation(): sentido anti-horário.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Tuple
+import cv2
+import numpy as np
+from digitalized.documents.image.crop import reduce_gray, create_ink_mask
+
+
+@dataclass(frozen=True)
+class OrientationEstimate:
+    """
+    :param rotation: Rotação (0, 90, 180, 270, anti-horário) que deixa o texto na posição correta.
+    :param skew: Inclinação (graus, anti-horário) a aplicar após a rotação para alinhar as linhas.
+    :param confidence: Confiança da rotação (0 a 1).
+    :param skew_confidence: Confiança da inclinação (0 a 1).
+    :param method: projection ou osd.
+    """
+    rotation: int
+    skew: float
+    confidence: float
+    skew_confidence: float
+    method: str = "projection"
+
+    def get_angle(self) -> float:
+        """Correção total (graus, anti-horário)."""
+        return self.rotation + self.skew
+
+
+def _get_profile_score(profile: np.ndarray) -> float:
+    # Variação relativa (coeficiente de variação ao quadrado), independe da quantidade de tinta.
+    mean = float(profile.mean())
+    if mean == 0:
+        return 0.0
+    return float(profile.var()) / (mean * mean)
+
+
+def _get_ascender_ratio(mask: np.ndarray) -> Tuple[float, float]:
+    """
+        Retorna (tinta acima, tinta abaixo) da faixa central de cada linha de texto,
+    somando todas as linhas.
+    """
+    profile = mask.sum(axis=1).astype(np.float64)
+    if profile.max() == 0:
+        return 0.0, 0.0
+    rows = profile > profile.max() * 0.05
+    # Início/fim de cada linha de texto (sequências de linhas com tinta).
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], rows.astype(np.int8), [0]))))
+    above, below = 0.0, 0.0
+    for start, end in zip(edges[::2], edges[1::2]):
+        if end - start < 3:
+            continue
+        line = profile[start:end]
+        # Faixa das letras minúsculas: linhas com pelo menos metade do pico.
+        band = np.flatnonzero(line >= line.max() * 0.5)
+        above += float(line[:band[0]].sum())
+        below += float(line[band[-1] + 1:].sum())
+    return above, below
+
+
+def _search_skew(mask: np.ndarray, max_angle: float, step: float, fine_step: float) -> Tuple[float, float, float]:
+    """Retorna (ângulo, confiança, variação do perfil por linha no ângulo encontrado)."""
+    ys, xs = np.nonzero(mask)
+    if len(xs) < 16:
+        return 0.0, 0.0, 0.0
+    xs = xs.astype(np.float32) - np.float32(mask.shape[1] / 2)
+    ys = ys.astype(np.float32)
+    offset = int(mask.shape[1] / 2 + 1)
+
+    def _profile(angle: float) -> np.ndarray:
+        # Linha (y) de cada ponto após rotacionar a imagem angle graus no sentido anti-horário.
+        rad = np.deg2rad(angle)
+        y_rot = np.rint(ys * np.float32(np.cos(rad)) - xs * np.float32(np.sin(rad))).astype(np.int64)
+        return np.bincount(y_rot + offset)
+
+    def _score(angle: float) -> float:
+        hist = _profile(angle)
+        return float(np.dot(hist, hist))
+
+    coarse = np.arange(-max_angle, max_angle + step / 2, step)
+    scores = [_score(a) for a in coarse]
+    best = float(coarse[int(np.argmax(scores))])
+    fine = np.arange(best - step, best + step + fine_step / 2, fine_step)
+    fine_scores = [_score(a) for a in fine]
+    idx = int(np.argmax(fine_scores))
+    # Confiança: quanto o melhor ângulo se destaca dos demais candidatos.
+    top, median = fine_scores[idx], float(np.median(scores))
+    confidence = 0.0 if top == 0 else (top - median) / top
+    profile = _profile(float(fine[idx]))
+    nonzero = np.flatnonzero(profile)
+    score = _get_profile_score(profile[nonzero[0]:nonzero[-1] + 1])
+    # + 0.0: evita -0.0.
+    return round(float(fine[idx]), 2) + 0.0, float(confidence), score
+
+
+def estimate_skew(
+            mask: np.ndarray, *,
+            max_angle: float = 5.0,
+            step: float = 1.0,
+            fine_step: float = 0.1,
+        ) -> Tuple[float, float]:
+    """
+        Inclinação das linhas de texto de uma máscara de tinta (linhas horizontais).
+    Retorna (ângulo anti-horário a aplicar, confiança).
+    """
+    angle, confidence, _ = _search_skew(mask, max_angle, step, fine_step)
+    return angle, confidence
+
+
+def _deskew_mask(mask: np.ndarray, angle: float) -> np.ndarray:
+    if angle == 0:
+        return mask
+    h, w = mask.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(mask, matrix, (w, h), flags=cv2.INTER_NEAREST, borderValue=0)
+
+
+def estimate_orientation(
+            gray: np.ndarray, *,
+            sample_size: int = 1024,
+            ink_delta: int = 64,
+            rotation: int | None = None,
+            max_skew: float = 5.0,
+        ) -> OrientationEstimate:
+    """
+        Estima a rotação e a inclinação do texto de uma imagem em escala de cinza.
+
+    :param rotation: Rotação já conhecida (ex: tesseract OSD), apenas a inclinação é estimada.
+    :param max_skew: Maior inclinação (graus) procurada.
+    """
+    sample, _ = reduce_gray(gray, sample_size)
+    mask, _ = create_ink_mask(sample, ink_delta)
+    if not mask.any():
+        return OrientationEstimate(0, 0.0, 0.0, 0.0)
+
+    if rotation is not None:
+        rotation %= 360
+        oriented = np.rot90(mask, rotation // 90) if rotation else mask
+        skew, skew_confidence = estimate_skew(oriented, max_angle=max_skew)
+        return OrientationEstimate(rotation, skew, 1.0, skew_confidence)
+
+    # Linhas de texto horizontais ou verticais, comparadas já na melhor inclinação
+    # de cada eixo (rot90 é anti-horário, como set_rotation()).
+    vertical = np.rot90(mask)
+    skew_h, conf_h, score_h = _search_skew(mask, max_skew, 1.0, 0.1)
+    skew_v, conf_v, score_v = _search_skew(vertical, max_skew, 1.0, 0.1)
+    horizontal = score_h >= score_v
+    axis_conf = abs(score_h - score_v) / max(score_h, score_v, 1e-9)
+    if horizontal:
+        lines, skew, skew_confidence = mask, skew_h, conf_h
+    else:
+        lines, skew, skew_confidence = vertical, skew_v, conf_v
+
+    above, below = _get_ascender_ratio(_deskew_mask(lines, skew))
+    upright = above >= below
+    updown_conf = abs(above - below) / max(above + below, 1e-9)
+    # Girar mais 180 graus não muda o sentido da inclinação.
+    if horizontal:
+        rotation = 0 if upright else 180
+    else:
+        rotation = 90 if upright else 270
+    return OrientationEstimate(rotation, skew, float(min(axis_conf, updown_conf)), skew_confidence)
+
+
+__all__ = ['OrientationEstimate', 'estimate_orientation', 'estimate_skew']
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+#
+"""
+    Execução de operações de imagem em um pool de processos.
+
+    Os objetos ImageObject são enviados aos processos com os pixels decodificados
+(buffer bruto numpy/PIL) e as operações pendentes, sem codificar em PNG.
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Any, Callable, Iterable, Sized, TypeVar
+import os
+
+from digitalized.types.array import ArrayList
+
+T = TypeVar('T')
+
+
+def get_default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def apply_operations(img: T) -> T:
+    """Executa as operações pendentes de um ImageObject (usado nos processos filhos)."""
+    img.apply_operations()
+    return img
+
+
+def run_parallel(
+            func: Callable[[T], Any],
+            items: Iterable[T], *,
+            workers: int = None,
+            return_exceptions: bool = False,
+            window: int | None = None,
+        ) -> ArrayList[Any]:
+    """
+        Executa func(item) para cada item em um ProcessPoolExecutor, mantendo a ordem
+    dos itens no resultado.
+
+    :param func: Função no nível do módulo (precisa ser serializável com pickle).
+    :param workers: Quantidade de processos, padrão os.cpu_count().
+    :param return_exceptions: Se True, a exceção de cada item é retornada na posição
+        do item, se False a primeira exceção (na ordem dos itens) é propagada.
+    :param window: Máximo de itens enviados e ainda sem resultado, padrão 2 x workers.
+        Os itens são lidos (e serializados) apenas quando entram na janela.
+    """
+    if workers is None:
+        workers = get_default_workers()
+    if isinstance(items, Sized):
+        if len(items) == 0:
+            return ArrayList()
+        workers = min(workers, len(items))
+    if window is None:
+        window = 2 * workers
+    window = max(window, workers)
+
+    results: ArrayList[Any] = ArrayList()
+    source = iter(items)
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def _submit_next() -> bool:
+            for item in source:
+                pending.append(executor.submit(func, item))
+                return True
+            return False
+
+        while len(pending) < window and _submit_next():
+            pass
+        num = 0
+        while len(pending) > 0:
+            fut = pending.popleft()
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                if not return_exceptions:
+                    for other in pending:
+                        other.cancel()
+                    e.add_note(f'run_parallel: erro no item {num}')
+                    raise
+                results.append(e)
+            num += 1
+            _submit_next()
+    return results
+
+
+__all__ = ['run_parallel', 'apply_operations', 'get_default_workers']
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+#
+"""
+    Hashes perceptuais (aHash, dHash, pHash) para encontrar páginas repetidas
+(digitalizadas de novo, anexos copiados) e reaproveitar o resultado do OCR.
+
+- ahash: cada bit indica se o bloco é mais claro que a média.
+- dhash: cada bit compara o bloco com o vizinho da direita (gradiente), mais
+  estável a variações de brilho/contraste do scanner.
+- phash: sinais das frequências baixas da DCT, mais robusto a ruído e compressão.
+
+    Imagens quase iguais têm hashes com poucos bits diferentes (distância de Hamming).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Hashable, Literal, Tuple
+import cv2
+import numpy as np
+
+HashMethod = Literal["ahash", "dhash", "phash"]
+HASH_METHODS: Tuple[str, ...] = ("ahash", "dhash", "phash")
+
+# Quantidade de bits 1 de cada byte.
+_POPCOUNT = np.array([bin(n).count("1") for n in range(256)], np.uint8)
+
+
+@dataclass(frozen=True)
+class ImageHash:
+    """Hash de size x size bits (value) calculado com method."""
+    value: int
+    method: HashMethod
+    size: int = 8
+
+    def distance(self, other: ImageHash) -> int:
+        """Distância de Hamming (bits diferentes) entre dois hashes do mesmo tipo."""
+        if (self.method, self.size) != (other.method, other.size):
+            raise ValueError(
+                f'{__class__.__name__} hashes incompatíveis: {self.method}/{self.size}, {other.method}/{other.size}'
+            )
+        return hamming_distance(self.value, other.value)
+
+    def __str__(self) -> str:
+        return f'{self.value:0{(self.size * self.size + 3) // 4}x}'
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+def _to_gray(img: np.ndarray) -> np.ndarray:
+    if img.ndim == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+    return img
+
+
+def average_hash(gray: np.ndarray, size: int = 8) -> int:
+    small = cv2.resize(_to_gray(gray), (size, size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small > small.mean())
+
+
+def difference_hash(gray: np.ndarray, size: int = 8) -> int:
+    small = cv2.resize(_to_gray(gray), (size + 1, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def perceptual_hash(gray: np.ndarray, size: int = 8) -> int:
+    # DCT de uma amostra 4x maior que o hash, apenas as frequências baixas são usadas.
+    small = cv2.resize(_to_gray(gray), (size * 4, size * 4), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(small.astype(np.float32))[:size, :size]
+    # A componente DC (brilho médio) não entra na mediana.
+    return _bits_to_int(low > np.median(low.ravel()[1:]))
+
+
+def compute_hash(img: np.ndarray, method: HashMethod = "dhash", size: int = 8) -> ImageHash:
+    """Hash perceptual de uma imagem em escala de cinza (ou BGR)."""
+    if size < 2:
+        raise ValueError(f'Tamanho do hash deve ser >= 2, não {size}')
+    if method == "ahash":
+        return ImageHash(average_hash(img, size), method, size)
+    elif method == "dhash":
+        return ImageHash(difference_hash(img, size), method, size)
+    elif method == "phash":
+        return ImageHash(perceptual_hash(img, size), method, size)
+    raise ValueError(f'Método de hash inválido: {method}, use: {HASH_METHODS}')
+
+
+class DuplicateIndex(object):
+    """
+        Índice de hashes (até 64 bits) para encontrar imagens quase iguais. A busca
+    compara o hash com todos os itens de uma vez (numpy).
+
+    :param max_distance: Maior distância de Hamming considerada duplicata.
+    """
+
+    def __init__(self, *, max_distance: int = 4, method: HashMethod = "dhash", size: int = 8):
+        if method not in HASH_METHODS:
+            raise ValueError(f'{__class__.__name__} método inválido: {method}, use: {HASH_METHODS}')
+        if not 2 <= size <= 8:
+            raise ValueError(f'{__class__.__name__} size deve estar entre 2 e 8, não {size}')
+        self.max_distance: int = max_distance
+        self.method: HashMethod = method
+        self.size: int = size
+        self.__keys: list[Hashable] = []
+        self.__values: np.ndarray = np.empty(0, np.uint64)
+        self.__count: int = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __check(self, h: ImageHash):
+        if (h.method, h.size) != (self.method, self.size):
+            raise ValueError(
+                f'{__class__.__name__} hash {h.method}/{h.size} diferente do índice {self.method}/{self.size}'
+            )
+
+    def add(self, key: Hashable, h: ImageHash):
+        self.__check(h)
+        if self.__count == len(self.__values):
+            # Capacidade dobrada, evita copiar o array a cada item.
+            grown = np.empty(max(16, self.__count * 2), np.uint64)
+            grown[:self.__count] = self.__values[:self.__count]
+            self.__values = grown
+        self.__values[self.__count] = h.value
+        self.__keys.append(key)
+        self.__count += 1
+
+    def find(self, h: ImageHash) -> Tuple[Hashable, int] | None:
+        """Retorna (chave, distância) do item mais parecido até max_distance, ou None."""
+        self.__check(h)
+        if self.__count == 0:
+            return None
+        diff = np.bitwise_xor(self.__values[:self.__count], np.uint64(h.value))
+        distances = _POPCOUNT[diff.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+        idx = int(np.argmin(distances))
+        if distances[idx] > self.max_distance:
+            return None
+        return self.__keys[idx], int(distances[idx])
+
+    def match_or_add(self, key: Hashable, h: ImageHash) -> Hashable | None:
+        """
+            Chave do item já indexado que é duplicata de h, ou None. Apenas itens
+        sem duplicata são adicionados (cada grupo é representado pelo primeiro item).
+        """
+        found = self.find(h)
+        if found is not None:
+            return found[0]
+        self.add(key, h)
+        return None
+
+
+__all__ = [
+    'HashMethod', 'HASH_METHODS', 'ImageHash', 'DuplicateIndex', 'hamming_distance',
+    'average_hash', 'difference_hash', 'perceptual_hash', 'compute_hash',
+]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+#
+"""
+    Cadeia de pré-processamento (blur, threshold, inversão, morfologia) executada
+sobre um único buffer numpy, sem codificar a imagem entre as etapas.
+"""
+from __future__ import annotations
+from typing import Callable, Literal, Tuple
+import cv2
+import numpy as np
+
+MorphologyOp = Literal["open", "close", "erode", "dilate"]
+PreprocessStepName = Literal["bilateral", "gaussian", "adaptive_threshold", "invert", "morphology"]
+
+_MORPHOLOGY_OPS: dict[str, int] = {
+    "open": cv2.MORPH_OPEN,
+    "close": cv2.MORPH_CLOSE,
+    "erode": cv2.MORPH_ERODE,
+    "dilate": cv2.MORPH_DILATE,
+}
+
+# Etapas que podem gravar no mesmo buffer que leem.
+_IN_PLACE_STEPS = ("adaptive_threshold", "adaptive_threshold_inv", "invert", "morphology")
+
+# (src, dst) -> dst
+StepFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+# Pesos (B, G, R) em ponto fixo de 15 bits usados pelo decodificador PNG com IMREAD_GRAYSCALE.
+_GRAY_WEIGHTS: Tuple[int, int, int] = (3737, 19234, 9797)
+
+
+def bgr_to_gray(img: np.ndarray) -> np.ndarray:
+    """
+        Converte BGR/BGRA em escala de cinza com a mesma conta da decodificação PNG
+    em IMREAD_GRAYSCALE (cv2.cvtColor difere em até 1 nível). Assim os pixels
+    convertidos na memória são iguais aos de image_bytes_to_opencv() sobre o PNG.
+    """
+    if img.ndim == 2:
+        return img
+    # Conversão explícita para uint32: no NumPy 1 uint8 * escalar continua em 16 bits (overflow).
+    gray = img[:, :, 0].astype(np.uint32)
+    gray *= _GRAY_WEIGHTS[0]
+    for channel in (1, 2):
+        gray += img[:, :, channel].astype(np.uint32) * _GRAY_WEIGHTS[channel]
+    gray >>= 15
+    return gray.astype(np.uint8)
+
+
+class PreprocessPipeline(object):
+    """
+        Lista de etapas de pré-processamento para imagens em escala de cinza (OpenCV).
+
+        As etapas são compiladas uma única vez: threshold(255) seguido de inversão
+    vira um único THRESH_BINARY_INV e inversões consecutivas se anulam. A execução
+    aloca apenas o buffer de saída, as etapas que suportam operação in-place
+    reutilizam esse mesmo buffer.
+    """
+
+    def __init__(self):
+        self.__steps: list[Tuple[PreprocessStepName, tuple]] = []
+        self.__compiled: list[Tuple[str, StepFunction]] | None = None
+
+    def __repr__(self) -> str:
+        return '|'.join(f'{name}{params}' for name, params in self.__steps)
+
+    def get_steps(self) -> list[Tuple[PreprocessStepName, tuple]]:
+        return list(self.__steps)
+
+    def is_empty(self) -> bool:
+        return len(self.__steps) == 0
+
+    def __add_step(self, name: PreprocessStepName, params: tuple) -> PreprocessPipeline:
+        self.__steps.append((name, params))
+        self.__compiled = None
+        return self
+
+    def add_bilateral(self, d: int = 9, sigma_color: float = 75, sigma_space: float = 75) -> PreprocessPipeline:
+        return self.__add_step("bilateral", (d, sigma_color, sigma_space))
+
+    def add_gaussian(self, ksize: int = 5) -> PreprocessPipeline:
+        return self.__add_step("gaussian", (ksize,))
+
+    def add_adaptive_threshold(
+                self, max_value: int = 255, block_size: int = 11, c: float = 2
+            ) -> PreprocessPipeline:
+        return self.__add_step("adaptive_threshold", (max_value, block_size, c))
+
+    def add_invert(self) -> PreprocessPipeline:
+        return self.__add_step("invert", ())
+
+    def add_morphology(self, op: MorphologyOp = "open", ksize: int = 2) -> PreprocessPipeline:
+        if op not in _MORPHOLOGY_OPS:
+            raise ValueError(f'{__class__.__name__} Use {MorphologyOp}, não {op}')
+        return self.__add_step("morphology", (op, ksize))
+
+    def without_blur(self) -> PreprocessPipeline:
+        """Retorna uma cópia da cadeia sem as etapas de desfoque."""
+        new = PreprocessPipeline()
+        for name, params in self.__steps:
+            if name not in ("bilateral", "gaussian"):
+                new.__add_step(name, params)
+        return new
+
+    def get_halo(self) -> int:
+        """
+            Quantos pixels além de cada borda a cadeia lê (soma dos raios de vizinhança
+        das etapas). Usado para processar a imagem em blocos sem emendas visíveis.
+        """
+        halo = 0
+        for name, params in self.__steps:
+            if name == "bilateral":
+                d, _sigma_color, sigma_space = params
+                halo += d // 2 if d > 0 else round(sigma_space * 1.5)
+            elif name == "gaussian":
+                halo += params[0] // 2
+            elif name == "adaptive_threshold":
+                halo += params[1] // 2
+            elif name == "morphology":
+                op, ksize = params
+                # open/close executam duas operações (erosão e dilatação).
+                halo += 2 * ksize if op in ("open", "close") else ksize
+        return halo
+
+    def __fuse_steps(self) -> list[Tuple[PreprocessStepName, tuple]]:
+        fused: list[Tuple[PreprocessStepName, tuple]] = []
+        for name, params in self.__steps:
+            if name == "invert" and len(fused) > 0:
+                prev_name, prev_params = fused[-1]
+                if prev_name == "invert":
+                    # Duas inversões seguidas se anulam.
+                    fused.pop()
+                    continue
+                if prev_name == "adaptive_threshold" and prev_params[0] == 255:
+                    # threshold(255) + bitwise_not == THRESH_BINARY_INV
+                    fused[-1] = ("adaptive_threshold_inv", prev_params)
+                    continue
+            fused.append((name, params))
+        return fused
+
+    @staticmethod
+    def __create_function(name: str, params: tuple) -> StepFunction:
+        if name == "bilateral":
+            d, sigma_color, sigma_space = params
+            return lambda src, dst: cv2.bilateralFilter(src, d, sigma_color, sigma_space, dst=dst)
+        elif name == "gaussian":
+            (ksize,) = params
+            return lambda src, dst: cv2.GaussianBlur(src, (ksize, ksize), 0, dst=dst)
+        elif name in ("adaptive_threshold", "adaptive_threshold_inv"):
+            max_value, block_size, c = params
+            _type = cv2.THRESH_BINARY_INV if name == "adaptive_threshold_inv" else cv2.THRESH_BINARY
+            return lambda src, dst: cv2.adaptiveThreshold(
+                src, max_value, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, _type, block_size, c, dst=dst
+            )
+        elif name == "invert":
+            return lambda src, dst: cv2.bitwise_not(src, dst=dst)
+        elif name == "morphology":
+            op, ksize = params
+            kernel = np.ones((ksize, ksize), np.uint8)
+            return lambda src, dst: cv2.morphologyEx(src, _MORPHOLOGY_OPS[op], kernel, dst=dst)
+        raise ValueError(f'PreprocessPipeline etapa inválida: {name}')
+
+    def compile(self) -> PreprocessPipeline:
+        if self.__compiled is None:
+            self.__compiled = [
+                (name, self.__create_function(name, params)) for name, params in self.__fuse_steps()
+            ]
+        return self
+
+    def run(self, img: np.ndarray) -> np.ndarray:
+        """
+            Executa a cadeia sobre uma imagem em escala de cinza. A imagem de entrada
+        não é alterada, o resultado é gravado em um único buffer de saída.
+        """
+        self.compile()
+        if len(self.__compiled) == 0:
+            return img.copy()
+        img = bgr_to_gray(img)
+
+        out: np.ndarray = np.empty_like(img)
+        scratch: np.ndarray | None = None
+        src: np.ndarray = img
+        for name, func in self.__compiled:
+            if src is img or name in _IN_PLACE_STEPS:
+                func(src, out)
+            else:
+                # Filtros de vizinhança não podem ler e gravar no mesmo buffer.
+                if scratch is None:
+                    scratch = np.empty_like(img)
+                func(out, scratch)
+                out, scratch = scratch, out
+            src = out
+        return out
+
+    @classmethod
+    def create_background(
+                cls,
+                background: Literal["gray", "black"] = "gray", *,
+                blur: bool = True,
+                morphology: MorphologyOp | None = None,
+            ) -> PreprocessPipeline:
+        """
+            Cria a cadeia usada em ImageInvertColor.set_background().
+        - gray: texto preto, fundo branco.
+        - black: texto branco, fundo preto.
+        """
+        pipeline = cls()
+        if blur:
+            pipeline.add_bilateral(9, 75, 75)
+        if background == "gray":
+            pipeline.add_adaptive_threshold(255, 11, 2)
+        elif background == "black":
+            pipeline.add_adaptive_threshold(150, 11, 2).add_invert()
+        else:
+            raise ValueError(f'{__class__.__name__} Use gray|black, não {background}')
+        if morphology is not None:
+            pipeline.add_morphology(morphology)
+        return pipeline.compile()
+
+
+__all__ = ['PreprocessPipeline', 'MorphologyOp', 'bgr_to_gray']
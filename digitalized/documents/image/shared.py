@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+#
+"""
+    Transporte de ImageObject entre processos por memória compartilhada
+(multiprocessing.shared_memory).
+
+    A imagem é serializada com pickle (protocolo 5): os buffers numpy (pixels do
+OpenCV) ficam fora do pickle e são copiados uma única vez para o segmento. Entre
+os processos trafega apenas um SharedImageHandle (nome, tamanhos e posições), e
+quem recebe monta a imagem com os pixels apontando direto para o segmento (sem
+cópia). Imagens PIL e bytes codificados ficam dentro do pickle, também no segmento.
+
+    O processo principal é o dono dos segmentos: SharedImageStore conta as
+referências de cada handle e remove o segmento quando a contagem chega a zero.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import shared_memory
+from threading import Lock
+from typing import Any, Callable, Iterable, Tuple
+import atexit
+import pickle
+import weakref
+from digitalized.types.array import ArrayList
+from digitalized.documents.image.image import ImageObject
+from digitalized.documents.image.parallel import run_parallel
+
+# Alinhamento dos buffers dentro do segmento (linhas de cache).
+_ALIGNMENT = 64
+# Segmentos que ainda tinham pixels em uso quando a imagem foi descartada.
+_PENDING_CLOSE: list[shared_memory.SharedMemory] = []
+_PENDING_LOCK = Lock()
+
+
+@dataclass(frozen=True)
+class SharedImageHandle:
+    """
+        Referência leve (serializável) a uma imagem em memória compartilhada.
+
+    :param name: Nome do segmento.
+    :param payload_size: Tamanho do pickle no início do segmento.
+    :param buffers: (posição, tamanho) de cada buffer fora do pickle (pixels).
+    """
+    name: str
+    payload_size: int
+    buffers: Tuple[Tuple[int, int], ...] = ()
+
+    def get_size(self) -> int:
+        if len(self.buffers) == 0:
+            return self.payload_size
+        offset, size = self.buffers[-1]
+        return offset + size
+
+
+class _Segment(shared_memory.SharedMemory):
+    """Segmento aberto para leitura, os pixels das imagens apontam para o mapeamento."""
+
+    def __del__(self):
+        try:
+            super().__del__()
+        except BufferError:
+            # Arrays ainda em uso no encerramento do interpretador, o sistema libera o mapeamento.
+            pass
+
+
+def _align(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _close_segment(shm: shared_memory.SharedMemory):
+    with _PENDING_LOCK:
+        pending = _PENDING_CLOSE + [shm]
+        _PENDING_CLOSE.clear()
+        for segment in pending:
+            try:
+                segment.close()
+            except BufferError:
+                # Algum array ainda aponta para o segmento, nova tentativa depois.
+                _PENDING_CLOSE.append(segment)
+
+
+def _unlink_segment(name: str):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def share_image(img: ImageObject) -> SharedImageHandle:
+    """
+        Copia a imagem para um novo segmento e retorna o handle. Usado nos processos
+    filhos: o segmento deve ser registrado no processo principal com SharedImageStore.adopt().
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(img, protocol=5, buffer_callback=buffers.append)
+    raws = [buff.raw() for buff in buffers]
+    layout: list[Tuple[int, int]] = []
+    offset = _align(len(payload))
+    for raw in raws:
+        layout.append((offset, raw.nbytes))
+        offset = _align(offset + raw.nbytes)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+    try:
+        shm.buf[:len(payload)] = payload
+        for (start, size), raw in zip(layout, raws):
+            shm.buf[start:start + size] = raw
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    finally:
+        for raw in raws:
+            raw.release()
+    # O segmento continua existindo até unlink(), apenas o mapeamento deste processo é fechado.
+    shm.close()
+    return SharedImageHandle(shm.name, len(payload), tuple(layout))
+
+
+def load_shared_image(handle: SharedImageHandle) -> ImageObject:
+    """
+        Monta a imagem de um handle sem copiar os pixels (somente leitura, as
+    operações geram novos arrays). O mapeamento é fechado quando a imagem é descartada.
+    """
+    shm = _Segment(name=handle.name)
+    try:
+        img: ImageObject = pickle.loads(
+            shm.buf[:handle.payload_size],
+            buffers=[shm.buf[start:start + size].toreadonly() for start, size in handle.buffers],
+        )
+    except BaseException:
+        _close_segment(shm)
+        raise
+    weakref.finalize(img.get_implementation(), _close_segment, shm)
+    return img
+
+
+class SharedImageStore(object):
+    """
+        Dono dos segmentos de memória compartilhada (processo principal). Cada handle
+    tem uma contagem de referências, o segmento é removido quando ela chega a zero,
+    em close() ou quando o objeto é descartado.
+    """
+
+    def __init__(self):
+        self.__refs: dict[str, int] = {}
+        self.__lock: Lock = Lock()
+        self.__finalizer = weakref.finalize(self, SharedImageStore.__unlink_all, self.__refs)
+
+    @staticmethod
+    def __unlink_all(refs: dict[str, int]):
+        for name in list(refs):
+            _unlink_segment(name)
+        refs.clear()
+
+    def __len__(self) -> int:
+        return len(self.__refs)
+
+    def __enter__(self) -> SharedImageStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def put(self, img: ImageObject) -> SharedImageHandle:
+        """Copia a imagem para a memória compartilhada (contagem 1)."""
+        return self.adopt(share_image(img))
+
+    def adopt(self, handle: SharedImageHandle) -> SharedImageHandle:
+        """Registra um segmento criado em outro processo (share_image()), contagem +1."""
+        with self.__lock:
+            self.__refs[handle.name] = self.__refs.get(handle.name, 0) + 1
+        return handle
+
+    def acquire(self, handle: SharedImageHandle) -> SharedImageHandle:
+        """Mais uma referência ao handle (ex: usado por duas etapas)."""
+        with self.__lock:
+            if handle.name not in self.__refs:
+                raise ValueError(f'{__class__.__name__} handle não registrado: {handle.name}')
+            self.__refs[handle.name] += 1
+        return handle
+
+    def release(self, handle: SharedImageHandle):
+        """Remove uma referência, o segmento é removido na última."""
+        with self.__lock:
+            count = self.__refs.get(handle.name, 0) - 1
+            if count < 0:
+                raise ValueError(f'{__class__.__name__} handle não registrado: {handle.name}')
+            if count > 0:
+                self.__refs[handle.name] = count
+                return
+            del self.__refs[handle.name]
+        # Imagens já carregadas continuam válidas, o sistema libera a memória após o último mapeamento.
+        _unlink_segment(handle.name)
+
+    def get_refcount(self, handle: SharedImageHandle) -> int:
+        return self.__refs.get(handle.name, 0)
+
+    def load(self, handle: SharedImageHandle) -> ImageObject:
+        return load_shared_image(handle)
+
+    def close(self):
+        """Remove todos os segmentos ainda registrados."""
+        with self.__lock:
+            self.__finalizer()
+
+
+def run_shared_item(func: Callable[[ImageObject], Any], handle: SharedImageHandle) -> Any:
+    """
+        Executado no processo filho: monta a imagem do handle, aplica func e, se o
+    resultado for um ImageObject, devolve um novo handle em vez da imagem.
+    """
+    result = func(load_shared_image(handle))
+    if isinstance(result, ImageObject):
+        return share_image(result)
+    return result
+
+
+def run_shared_stage(
+            func: Callable[[ImageObject], Any],
+            handles: Iterable[SharedImageHandle], *,
+            store: SharedImageStore,
+            workers: int = None,
+            release_inputs: bool = False,
+        ) -> ArrayList[Any]:
+    """
+        Executa uma etapa (ex: pré-processamento, OCR) em um pool de processos, cada
+    processo recebe apenas o handle. Imagens retornadas por func voltam como novos
+    handles registrados em store, os demais resultados voltam sem alteração.
+
+    :param func: Função no nível do módulo (serializável com pickle).
+    :param release_inputs: Libera os handles de entrada após a etapa.
+    """
+    handles = list(handles)
+    results = run_parallel(partial(run_shared_item, func), handles, workers=workers)
+    for result in results:
+        if isinstance(result, SharedImageHandle):
+            store.adopt(result)
+    if release_inputs:
+        for handle in handles:
+            store.release(handle)
+    return results
+
+
+def _close_pending():
+    with _PENDING_LOCK:
+        for segment in _PENDING_CLOSE:
+            try:
+                segment.close()
+            except BufferError:
+                pass
+        _PENDING_CLOSE.clear()
+
+
+atexit.register(_close_pending)
+
+
+__all__ = [
+    'SharedImageHandle', 'SharedImageStore', 'share_image', 'load_shared_image',
+    'run_shared_item', 'run_shared_stage',
+]
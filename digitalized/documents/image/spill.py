@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+#
+"""
+    Armazenamento em disco (spill) para listas grandes de imagens.
+
+    SpillStore acompanha as imagens de um ImageStream e, quando a memória ocupada
+passa do limite, grava as imagens mais antigas em arquivos temporários e libera os
+pixels/bytes. A imagem é carregada de volta de forma transparente no próximo acesso
+(ImageObject continua com a mesma API).
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from threading import Lock
+from typing import Literal, TYPE_CHECKING
+import os
+import shutil
+import tempfile
+import weakref
+from soup_files import Directory
+
+if TYPE_CHECKING:
+    from digitalized.documents.image.image import InterfaceImageObject
+
+# bytes: imagem codificada (PNG/JPEG...), array: pixels numpy, pil: buffer bruto de uma imagem PIL.
+SpillKind = Literal["bytes", "array", "pil"]
+
+
+@dataclass(frozen=True)
+class SpilledData:
+    """Conteúdo de uma imagem gravado em disco."""
+    path: str
+    kind: SpillKind
+    shape: tuple
+    # dtype numpy (array) ou modo PIL (pil).
+    dtype: str
+    size: int
+
+
+def remove_spill_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@dataclass
+class SpillStats:
+    resident_bytes: int = 0
+    spilled_bytes: int = 0
+    resident_items: int = 0
+    spilled_items: int = 0
+    spills: int = 0
+    faults: int = 0
+
+
+class SpillStore(object):
+    """
+    :param memory_budget: Memória máxima (bytes) das imagens residentes, as mais
+        antigas são gravadas em disco quando o limite é ultrapassado.
+    :param temp_dir: Diretório dos arquivos, padrão um diretório temporário removido
+        junto com o objeto (ou em close()).
+    """
+
+    def __init__(self, memory_budget: int = 512 * 1024 * 1024, *, temp_dir: Directory | None = None):
+        if memory_budget < 0:
+            raise ValueError(f'{__class__.__name__} memory_budget deve ser >= 0, não {memory_budget}')
+        self.memory_budget: int = memory_budget
+        if temp_dir is None:
+            self.__dir: str = tempfile.mkdtemp(prefix='digitalized-spill-')
+            self.__finalizer = weakref.finalize(self, shutil.rmtree, self.__dir, True)
+        else:
+            temp_dir.mkdir()
+            self.__dir: str = temp_dir.absolute()
+            self.__finalizer = None
+        # Ordem de inserção = ordem de gravação em disco (mais antigas primeiro).
+        self.__items: OrderedDict[int, weakref.ref] = OrderedDict()
+        self.__spilled_ids: set[int] = set()
+        self.__names = count()
+        self.__spills: int = 0
+        self.__faults: int = 0
+        self.__lock: Lock = Lock()
+
+    def get_dir(self) -> str:
+        return self.__dir
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def add(self, img: InterfaceImageObject):
+        """Passa a acompanhar a imagem (implementação de ImageObject) e aplica o limite."""
+        with self.__lock:
+            key = id(img)
+            if key not in self.__items:
+                self.__items[key] = weakref.ref(img)
+        self.enforce(keep=img)
+
+    def __get_alive(self) -> list[InterfaceImageObject]:
+        alive = []
+        for key, ref in list(self.__items.items()):
+            img = ref()
+            if img is None:
+                del self.__items[key]
+                self.__spilled_ids.discard(key)
+            else:
+                alive.append(img)
+        return alive
+
+    def enforce(self, *, keep: InterfaceImageObject | None = None):
+        """
+            Grava em disco as imagens residentes mais antigas até a memória ficar dentro
+        do limite. keep (ex: o item sendo lido) nunca é gravado.
+        """
+        with self.__lock:
+            items = self.__get_alive()
+            resident = 0
+            for img in items:
+                if id(img) in self.__spilled_ids and not img.is_spilled():
+                    # Carregada de volta desde a última verificação.
+                    self.__spilled_ids.discard(id(img))
+                    self.__faults += 1
+                resident += img.get_resident_bytes()
+            for img in items:
+                if resident <= self.memory_budget:
+                    break
+                if img is keep or img.is_spilled():
+                    continue
+                size = img.get_resident_bytes()
+                if size == 0:
+                    continue
+                img.spill(os.path.join(self.__dir, f'{next(self.__names)}.spill'))
+                self.__spilled_ids.add(id(img))
+                self.__spills += 1
+                resident -= size
+
+    def get_stats(self) -> SpillStats:
+        with self.__lock:
+            stats = SpillStats(spills=self.__spills, faults=self.__faults)
+            for img in self.__get_alive():
+                if img.is_spilled():
+                    stats.spilled_items += 1
+                    stats.spilled_bytes += img.get_spilled_bytes()
+                else:
+                    stats.resident_items += 1
+                    stats.resident_bytes += img.get_resident_bytes()
+            return stats
+
+    def close(self):
+        """Carrega de volta as imagens em disco e remove o diretório temporário."""
+        with self.__lock:
+            for img in self.__get_alive():
+                img.load_spilled()
+            self.__items.clear()
+            self.__spilled_ids.clear()
+        if self.__finalizer is not None:
+            self.__finalizer()
+
+
+__all__ = ['SpillStore', 'SpillStats', 'SpilledData', 'SpillKind', 'remove_spill_file']
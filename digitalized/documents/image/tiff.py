@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+#
+"""
+    TIFF com várias páginas (saída dos scanners) sem passar por PDF.
+
+- Leitura: cada página (frame) é decodificada apenas quando solicitada, as
+  demais páginas não são decodificadas.
+- Gravação: cada página é codificada e gravada no arquivo assim que é
+  adicionada, páginas binárias com CCITT Group 4 e as demais com a compressão
+  TIFF do preset (LZW ou Deflate).
+"""
+from __future__ import annotations
+from io import BytesIO
+from typing import IO, Iterable, Iterator, Union
+from PIL import Image, TiffImagePlugin
+from soup_files import File
+from digitalized.io import MappedFile, BufferReader
+from digitalized.documents.image.image import ImageObject, LibImage
+from digitalized.documents.image.codec import CodecPreset, get_codec_options
+from digitalized.documents.image.lazy import ImageSource
+
+TiffInput = Union[File, bytes, memoryview]
+
+
+class _TiffReader(object):
+    """Arquivo TIFF aberto (mapeado em memória quando é um File)."""
+
+    def __init__(self, source: TiffInput):
+        self.__mapped: MappedFile | None = None
+        if isinstance(source, File):
+            self.__mapped = MappedFile(source)
+            source = self.__mapped.get_view()
+        try:
+            self.image: Image.Image = Image.open(BufferReader(source))
+            if self.image.format != "TIFF":
+                raise ValueError(f'Arquivo não é TIFF: {self.image.format}')
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> _TiffReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_num_frames(self) -> int:
+        # Percorre apenas os cabeçalhos (IFD) das páginas, nada é decodificado.
+        return getattr(self.image, "n_frames", 1)
+
+    def load_frame(self, index: int, library: LibImage) -> ImageObject:
+        self.image.seek(index)
+        frame = self.image.copy()
+        # Páginas do scanner na resolução original (OCR).
+        img = ImageObject.create_from_pil(frame, library=library, max_size=None)
+        if frame.mode == "1" and library == "opencv":
+            # Mantém a página binária (gravada de novo com Group 4).
+            img.set_color_mode("binary")
+        return img
+
+    def close(self):
+        if hasattr(self, "image"):
+            self.image.close()
+            del self.image
+        if self.__mapped is not None:
+            self.__mapped.close()
+            self.__mapped = None
+
+
+def get_tiff_num_frames(source: TiffInput) -> int:
+    with _TiffReader(source) as reader:
+        return reader.get_num_frames()
+
+
+def iter_tiff_frames(source: TiffInput, *, library: LibImage = "opencv") -> Iterator[ImageObject]:
+    """Páginas do TIFF em ordem, uma de cada vez (o arquivo fica aberto durante a iteração)."""
+    with _TiffReader(source) as reader:
+        for num in range(reader.get_num_frames()):
+            yield reader.load_frame(num, library)
+
+
+class TiffImageSource(ImageSource):
+    """
+        Páginas de um TIFF para LazyImageStream. Cada load() abre o arquivo e
+    decodifica apenas a página pedida, então o prefetch pode usar várias threads.
+    """
+
+    def __init__(self, source: TiffInput, *, library: LibImage = "opencv"):
+        if isinstance(source, memoryview):
+            source = bytes(source)
+        self.source: TiffInput = source
+        self.library: LibImage = library
+        self.__num_frames: int = get_tiff_num_frames(source)
+
+    def __len__(self) -> int:
+        return self.__num_frames
+
+    def load(self, index: int) -> ImageObject:
+        with _TiffReader(self.source) as reader:
+            return reader.load_frame(index, self.library)
+
+
+class TiffWriter(object):
+    """
+        Grava um TIFF com várias páginas, cada página é gravada em add_image() e
+    apenas uma página codificada fica em memória.
+
+    :param output: Arquivo de saída ou buffer (BytesIO).
+    :param preset: Preset de codificação, define a compressão das páginas não binárias.
+    """
+
+    def __init__(self, output: Union[File, IO[bytes]], *, preset: CodecPreset = "balanced"):
+        self.__options = get_codec_options(preset)
+        self.__fp: IO[bytes] = open(output.absolute(), "w+b") if isinstance(output, File) else output
+        self.__close_fp: bool = isinstance(output, File)
+        self.__writer = TiffImagePlugin.AppendingTiffWriter(self.__fp, new=True)
+        self.__count: int = 0
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __enter__(self) -> TiffWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add_image(self, img: ImageObject):
+        if self.__writer is None:
+            raise ValueError(f'{__class__.__name__} já foi fechado')
+        frame = img.to_image_pil()
+        if img.get_color_mode() == "binary":
+            frame = frame.convert("1", dither=Image.Dither.NONE)
+            compression = "group4"
+        else:
+            compression = self.__options.tiff_compression
+        frame.save(self.__writer, format="TIFF", compression=compression)
+        self.__writer.newFrame()
+        self.__count += 1
+
+    def add_images(self, images: Iterable[ImageObject]):
+        for img in images:
+            self.add_image(img)
+
+    def close(self):
+        if self.__writer is None:
+            return
+        writer, self.__writer = self.__writer, None
+        try:
+            # Ajusta os offsets da última página (IFD), o buffer do chamador continua aberto.
+            writer.close()
+        finally:
+            if self.__close_fp:
+                self.__fp.close()
+
+
+def write_tiff(
+            images: Iterable[ImageObject], output: Union[File, IO[bytes], None] = None, *,
+            preset: CodecPreset = "balanced",
+        ) -> IO[bytes]:
+    """
+        Grava images (lista ou iterador) como um TIFF com várias páginas.
+
+    :param output: Arquivo ou buffer, None grava em um novo BytesIO.
+    :return: O buffer (posição 0) ou output.
+    """
+    if output is None:
+        output = BytesIO()
+    with TiffWriter(output, preset=preset) as writer:
+        writer.add_images(images)
+        if len(writer) == 0:
+            raise ValueError('Nenhuma imagem para gravar no TIFF')
+    if isinstance(output, BytesIO):
+        output.seek(0)
+    return output
+
+
+__all__ = [
+    'TiffInput', 'TiffImageSource', 'TiffWriter', 'get_tiff_num_frames', 'iter_tiff_frames', 'write_tiff',
+]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+#
+"""
+    Execução em blocos (tiles) para imagens muito grandes.
+
+    A imagem é dividida em faixas horizontais sobrepostas: cada faixa recebe
+halo linhas extras acima e abaixo, que são descartadas depois do filtro, então o
+resultado é idêntico ao processamento da imagem inteira. As faixas rodam em um
+pool de threads (o OpenCV e o NumPy liberam o GIL) e a altura das faixas é
+calculada para que a memória de trabalho fique dentro do limite configurado.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import os
+import numpy as np
+
+# (faixa com halo) => faixa processada com as mesmas dimensões
+TileFunction = Callable[[np.ndarray], np.ndarray]
+
+
+class TiledExecutor(object):
+    """
+    :param memory_budget: Memória de trabalho máxima (bytes) somando todas as faixas em execução,
+        sem contar a imagem de entrada e a de saída.
+    :param workers: Threads, padrão os.cpu_count().
+    :param min_pixels: Imagens menores que isso são processadas inteiras.
+    :param buffers: Estimativa de buffers do tamanho da faixa usados por um filtro
+        (entrada, saída, rascunho e temporários internos).
+    """
+
+    def __init__(
+                self,
+                memory_budget: int = 256 * 1024 * 1024, *,
+                workers: int | None = None,
+                min_pixels: int = 16_000_000,
+                buffers: int = 4,
+            ):
+        if memory_budget <= 0:
+            raise ValueError(f'{__class__.__name__} memory_budget deve ser > 0, não {memory_budget}')
+        self.memory_budget: int = memory_budget
+        self.workers: int = workers or os.cpu_count() or 1
+        self.min_pixels: int = min_pixels
+        self.buffers: int = buffers
+
+    def is_tiled(self, img: np.ndarray) -> bool:
+        return img.shape[0] * img.shape[1] >= self.min_pixels
+
+    def get_tile_rows(self, img: np.ndarray, halo: int) -> int:
+        """Altura de cada faixa (sem o halo) para respeitar memory_budget."""
+        row_bytes = img.strides[0] if img.flags.c_contiguous else img[0].nbytes
+        rows = self.memory_budget // (self.workers * self.buffers * row_bytes) - 2 * halo
+        # Faixas menores que o halo gastam mais tempo com a sobreposição que com a faixa.
+        return max(rows, halo, 8)
+
+    def run(self, img: np.ndarray, func: TileFunction, halo: int) -> np.ndarray:
+        """
+            Executa func em faixas de img. func deve retornar uma imagem com as mesmas
+        dimensões (altura/largura) da faixa recebida e não pode alterar a entrada.
+        """
+        if not self.is_tiled(img):
+            return func(img)
+        height = img.shape[0]
+        tile_rows = self.get_tile_rows(img, halo)
+        if tile_rows >= height:
+            return func(img)
+
+        out: np.ndarray | None = None
+        starts = list(range(0, height, tile_rows))
+
+        def _run_tile(y: int) -> np.ndarray | None:
+            top, end = max(0, y - halo), min(height, y + tile_rows)
+            result = func(img[top:min(height, end + halo)])
+            tile = result[y - top:y - top + (end - y)]
+            if out is None:
+                return tile
+            out[y:end] = tile
+            return None
+
+        # A primeira faixa define o tipo e os canais da saída.
+        first = _run_tile(starts[0])
+        out = np.empty((height, *first.shape[1:]), dtype=first.dtype)
+        out[:first.shape[0]] = first
+        del first
+        # Os resultados são gravados direto na saída dentro de cada thread,
+        # nenhuma faixa processada fica acumulada na memória.
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in executor.map(_run_tile, starts[1:]):
+                pass
+        return out
+
+
+# Executor usado por ImageInvertColor, None processa sempre a imagem inteira.
+_TILED_EXECUTOR: TiledExecutor | None = TiledExecutor()
+
+
+def get_tiled_executor() -> TiledExecutor | None:
+    return _TILED_EXECUTOR
+
+
+def set_tiled_executor(executor: TiledExecutor | None) -> TiledExecutor | None:
+    """Define (ou desativa com None) o executor em blocos. Retorna o executor anterior."""
+    global _TILED_EXECUTOR
+    old = _TILED_EXECUTOR
+    _TILED_EXECUTOR = executor
+    return old
+
+
+def run_tiled(img: np.ndarray, func: TileFunction, halo: int) -> np.ndarray:
+    """Executa func com o executor em blocos global (se ativo), senão na imagem inteira."""
+    executor = get_tiled_executor()
+    if executor is None:
+        return func(img)
+    return executor.run(img, func, halo)
+
+
+__all__ = ['TiledExecutor', 'TileFunction', 'get_tiled_executor', 'set_tiled_executor', 'run_tiled']
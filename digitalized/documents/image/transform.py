@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+#
+"""
+    Operações pendentes de ImageObject e regras para combinar a fila antes
+da execução.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Literal, Tuple
+
+OperationName = Literal["rotation", "resize", "background", "gaussian", "optimize", "color", "autocrop", "deskew"]
+
+# Operações que alteram apenas a geometria (largura/altura) da imagem.
+GEOMETRIC_OPERATIONS = ("rotation", "resize")
+# Filtros caros, uma redução de tamanho deve ser executada antes deles.
+FILTER_OPERATIONS = ("background", "gaussian")
+
+
+@dataclass(frozen=True)
+class ImageOperation:
+    """Operação agendada em um ImageObject, executada apenas quando os pixels forem lidos."""
+    name: OperationName
+    params: tuple = ()
+
+    @classmethod
+    def rotation(cls, angle: int) -> ImageOperation:
+        return cls("rotation", (angle % 360,))
+
+    @classmethod
+    def resize(cls, max_width: int, max_height: int) -> ImageOperation:
+        return cls("resize", (max_width, max_height))
+
+    @classmethod
+    def color(cls, mode: str) -> ImageOperation:
+        return cls("color", (mode,))
+
+    @classmethod
+    def autocrop(cls, padding: int) -> ImageOperation:
+        return cls("autocrop", (padding,))
+
+    @classmethod
+    def deskew(cls, angle: float) -> ImageOperation:
+        return cls("deskew", (round(float(angle), 2),))
+
+
+def fit_size(width: int, height: int, max_width: int, max_height: int) -> Tuple[int, int]:
+    """
+        Retorna as dimensões que cabem em max_width x max_height mantendo a proporção.
+    A imagem nunca é ampliada.
+    """
+    if width <= max_width and height <= max_height:
+        return width, height
+    scale = min(max_width / width, max_height / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def get_operations_size(width: int, height: int, operations: list[ImageOperation]) -> Tuple[int, int]:
+    """Calcula as dimensões finais após as operações geométricas, sem processar pixels."""
+    for op in operations:
+        if op.name == "rotation" and op.params[0] in (90, 270):
+            width, height = height, width
+        elif op.name == "resize":
+            width, height = fit_size(width, height, *op.params)
+    return width, height
+
+
+def collapse_operations(operations: list[ImageOperation]) -> list[ImageOperation]:
+    """
+        Reduz a fila de operações:
+    - rotações consecutivas são somadas (90 + 270 = nenhuma rotação);
+    - rotações de 0 graus são descartadas;
+    - uma redução (resize) é movida para antes dos filtros que a precedem;
+    - conversões de cor consecutivas: a primeira é descartada quando não muda o
+      resultado da segunda (bgr => qualquer, qualquer => binary, repetidas);
+    - recortes automáticos consecutivos: vale apenas o último (o conteúdo é o mesmo);
+    - correções de inclinação (deskew) consecutivas são somadas (uma única interpolação);
+    - optimize só é mantido se for a última operação (outra operação descarta os bytes).
+    """
+    collapsed: list[ImageOperation] = []
+    for op in operations:
+        if op.name == "rotation":
+            if len(collapsed) > 0 and collapsed[-1].name == "rotation":
+                op = ImageOperation.rotation(collapsed.pop().params[0] + op.params[0])
+            if op.params[0] != 0:
+                collapsed.append(op)
+        elif op.name == "resize":
+            # Filtros locais e redução comutam, reduzir antes processa menos pixels.
+            idx = len(collapsed)
+            while idx > 0 and collapsed[idx - 1].name in FILTER_OPERATIONS:
+                idx -= 1
+            if idx > 0 and collapsed[idx - 1].name == "resize":
+                # Duas reduções seguidas: vale o menor limite.
+                prev = collapsed[idx - 1]
+                op = ImageOperation.resize(
+                    min(prev.params[0], op.params[0]), min(prev.params[1], op.params[1])
+                )
+                collapsed[idx - 1] = op
+            else:
+                collapsed.insert(idx, op)
+        elif op.name == "color" and len(collapsed) > 0 and collapsed[-1].name == "color" \
+                and (collapsed[-1].params[0] in ("bgr", op.params[0]) or op.params[0] == "binary"):
+            collapsed[-1] = op
+        elif op.name == "autocrop" and len(collapsed) > 0 and collapsed[-1].name == "autocrop":
+            collapsed[-1] = op
+        elif op.name == "deskew":
+            if len(collapsed) > 0 and collapsed[-1].name == "deskew":
+                op = ImageOperation.deskew(collapsed.pop().params[0] + op.params[0])
+            if op.params[0] != 0:
+                collapsed.append(op)
+        else:
+            collapsed.append(op)
+
+    # optimize descartado se houver outra operação depois dele.
+    return [
+        op for num, op in enumerate(collapsed)
+        if (op.name != "optimize") or (num == len(collapsed) - 1)
+    ]
+
+
+__all__ = [
+    'ImageOperation', 'OperationName', 'collapse_operations',
+    'get_operations_size', 'fit_size',
+]
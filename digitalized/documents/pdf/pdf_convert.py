@@ -4,10 +4,14 @@ Módulo para converter PDF em Imagens
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Any, Literal
+from typing import Any, Iterator, Literal, Tuple
 from soup_files import Directory, File
-from digitalized.documents.image import ImageObject, ImageStream, LibImage, ImageExtension
+from digitalized.documents.image import (
+    ImageObject, ImageStream, LibImage, ImageExtension, BlankPageDetector, SpillStore,
+    ImageSource, LazyImageStream, CodecPreset,
+)
 from digitalized.documents.pdf import PageDocumentPdf, DocumentPdf
+from digitalized.documents.pdf.pdf_page import pixmap_to_image
 from digitalized.types.core import ObjectAdapter
 from digitalized.io import ZipOutputStream
 
@@ -24,6 +28,28 @@ except ImportError:
 LibPdfToImage = Literal["fitz"]
 
 
+class PdfPageImageSource(ImageSource):
+    """
+        Páginas do documento renderizadas sob demanda. O PyMuPDF não pode ser usado
+    em várias threads, então a renderização é feita na thread que itera (sem prefetch).
+    """
+
+    def __init__(self, document: DocumentPdf, *, dpi: int = 250, library: LibImage = "opencv"):
+        self.pages: list[PageDocumentPdf] = document.to_pages()
+        self.dpi: int = dpi
+        self.library: LibImage = library
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def is_thread_safe(self) -> bool:
+        return False
+
+    def load(self, index: int) -> ImageObject:
+        pix: fitz.Pixmap = self.pages[index].get_real_module().get_pixmap(dpi=self.dpi)
+        return pixmap_to_image(pix, library=self.library)
+
+
 class InterfacePdfToImages(ABC):
 
     @abstractmethod
@@ -40,6 +66,8 @@ class InterfacePdfToImages(ABC):
                 dpi: int = 250,
                 lib_image: LibImage = "opencv",
                 image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                spill_store: SpillStore | None = None,
             ) -> ImageStream:
         """
             Converte as páginas PDF do documento em lista de objetos imagem ImageObject
@@ -47,9 +75,42 @@ class InterfacePdfToImages(ABC):
         :param dpi: DPI do documento, resolução da renderização.
         :param lib_image: Biblioteca para manipular imagens PIL/OpenCv
         :param image_extension: Extensão das imagens a serem salvas.
+        :param blank_detector: Páginas em branco são descartadas (policy=skip) ou
+            renderizadas em blank_detector.downgrade_dpi (policy=downgrade).
+        :param spill_store: Limite de memória da lista, as páginas mais antigas vão
+            para o disco durante a conversão (documentos com muitas páginas).
+        """
+        pass
+
+    @abstractmethod
+    def iter_page_images(
+                self, *,
+                dpi: int = 250,
+                lib_image: LibImage = "opencv",
+                blank_detector: BlankPageDetector | None = None,
+                pages: list[int] | None = None,
+            ) -> Iterator[Tuple[int, ImageObject]]:
+        """
+            Igual a iter_images(), retorna (índice da página, imagem).
+
+        :param pages: Índices das páginas a renderizar (padrão: todas).
         """
         pass
 
+    def iter_images(
+                self, *,
+                dpi: int = 250,
+                lib_image: LibImage = "opencv",
+                blank_detector: BlankPageDetector | None = None,
+            ) -> Iterator[ImageObject]:
+        """
+            Renderiza e retorna uma página de cada vez, apenas a página atual fica em
+        memória e a primeira imagem fica disponível antes da renderização das demais.
+        Páginas em branco seguem blank_detector (ver to_images()).
+        """
+        for _num, img in self.iter_page_images(dpi=dpi, lib_image=lib_image, blank_detector=blank_detector):
+            yield img
+
     @abstractmethod
     def to_files_image(
             self,
@@ -59,10 +120,14 @@ class InterfacePdfToImages(ABC):
             lib_image: LibImage = "opencv",
             prefix: str = None,
             image_extension: ImageExtension = "png",
+            blank_detector: BlankPageDetector | None = None,
+            codec_preset: CodecPreset = "balanced",
             ) -> None:
         """
             Converte todas as páginas do documento em objeto de imagem e salva no disco
-        em formato de imagem PNG.
+        em formato image_extension (png, jpg, webp, tiff).
+
+        :param codec_preset: Preset de codificação das imagens: fast, balanced ou smallest.
         """
         pass
 
@@ -72,9 +137,32 @@ class InterfacePdfToImages(ABC):
                 dpi: int = 250,
                 lib_image: LibImage = "opencv",
                 image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                codec_preset: CodecPreset = "balanced",
             ) -> BytesIO:
         pass
 
+    @abstractmethod
+    def to_lazy_images(self, *, dpi: int = 250, lib_image: LibImage = "opencv") -> LazyImageStream:
+        """
+            Igual a to_images(), porém cada página é renderizada apenas durante a
+        iteração (len() não renderiza nenhuma página).
+        """
+        pass
+
+    @staticmethod
+    def get_page_dpi(page: PageDocumentPdf, dpi: int, blank_detector: BlankPageDetector | None) -> int | None:
+        """
+            DPI de renderização da página: dpi, blank_detector.downgrade_dpi para páginas
+        em branco rebaixadas ou None se a página em branco deve ser descartada.
+        """
+        if blank_detector is None or not blank_detector.is_flagged(page.get_blank_stats(blank_detector)):
+            return dpi
+        blank_detector.register_flagged()
+        if blank_detector.policy == "skip":
+            return None
+        return min(dpi, blank_detector.downgrade_dpi)
+
 
 class ImplementConvertPdfToImagesFitz(InterfacePdfToImages):
 
@@ -100,40 +188,61 @@ class ImplementConvertPdfToImagesFitz(InterfacePdfToImages):
                 dpi: int = 250,
                 lib_image: LibImage = "pil",
                 image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                codec_preset: CodecPreset = "balanced",
             ) -> BytesIO:
         zip_stream = ZipOutputStream(image_extension)
-        _image_obj: ImageObject
-        images_list: ImageStream = self.to_images(
-            dpi=dpi, lib_image=lib_image, image_extension=image_extension
-        )
 
+        def _encode(img: ImageObject) -> bytes:
+            img.set_codec_preset(codec_preset)
+            return img.encode(image_extension)
+
+        # Cada página é renderizada, codificada e gravada no zip antes da próxima.
         return zip_stream.save_zip(
-            images_list.apply(lambda _image_obj: _image_obj.to_bytes()),
+            map(_encode, self.iter_images(dpi=dpi, lib_image=lib_image, blank_detector=blank_detector)),
             prefix='pdf_para_imagem'
         )
 
+    def iter_page_images(
+                self, *,
+                dpi: int = 250,
+                lib_image: LibImage = "opencv",
+                blank_detector: BlankPageDetector | None = None,
+                pages: list[int] | None = None,
+            ) -> Iterator[Tuple[int, ImageObject]]:
+        pages_fitz: list[PageDocumentPdf] = self._document.to_pages()
+        if pages is None:
+            pages = range(len(pages_fitz))
+        for n in pages:
+            pg: PageDocumentPdf = pages_fitz[n]
+            _dpi = self.get_page_dpi(pg, dpi, blank_detector)
+            if _dpi is None:
+                continue
+            pix: fitz.Pixmap = pg.get_real_module().get_pixmap(dpi=_dpi)
+            img = pixmap_to_image(pix, library=lib_image)
+            # O pixmap é liberado antes de entregar a imagem.
+            del pix
+            yield n, img
+
     def to_images(
                 self, *,
                 dpi: int = 200,
                 lib_image: LibImage = "pil",
                 image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                spill_store: SpillStore | None = None,
             ) -> ImageStream:
         """
             Converte um Documento em lista de objetos ImageObject.
         """
-        final_images = ImageStream()
-        pages_fitz: list[PageDocumentPdf] = self._document.to_pages()
-        _count = len(pages_fitz)
-        pg: PageDocumentPdf
-        for n, pg in enumerate(pages_fitz):
-            pix: fitz.Pixmap = pg.get_real_module().get_pixmap(dpi=dpi)
-            img = ImageObject.create_from_bytes(
-                pix.tobytes('png', jpg_quality=100),
-                library=lib_image,
-            )
+        final_images = ImageStream(lib_image=lib_image, spill_store=spill_store)
+        for img in self.iter_images(dpi=dpi, lib_image=lib_image, blank_detector=blank_detector):
             final_images.add_image(img)
         return final_images
 
+    def to_lazy_images(self, *, dpi: int = 250, lib_image: LibImage = "opencv") -> LazyImageStream:
+        return LazyImageStream(PdfPageImageSource(self._document, dpi=dpi, library=lib_image))
+
     def to_files_image(
                 self,
                 output_dir: Directory, *,
@@ -141,26 +250,26 @@ class ImplementConvertPdfToImagesFitz(InterfacePdfToImages):
                 lib_image: LibImage = "opencv",
                 prefix: str = None,
                 image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                codec_preset: CodecPreset = "balanced",
             ) -> None:
         """
             Converter as páginas do documento em imagem e salvar no disco.
         """
         if prefix is None:
             prefix = "pdf_para_imagem"
-        _pages: list[PageDocumentPdf] = self.get_document().to_pages()
-        _count = len(_pages)
-        for n, pg in enumerate(_pages):
-            out_file: File = output_dir.join_file(f'{prefix}-{n+1}.{image_extension}')
-            if not replace:
-                if out_file.exists():
-                    continue
-            pix: fitz.Pixmap = pg.get_real_module().get_pixmap(dpi=dpi)
-            img = ImageObject.create_from_bytes(
-                pix.tobytes(image_extension, jpg_quality=100),
-                library=lib_image,
-            )
+        _count = self.get_document().size()
+        out_files: list[File] = [
+            output_dir.join_file(f'{prefix}-{n+1}.{image_extension}') for n in range(_count)
+        ]
+        # Arquivos já existentes não são renderizados.
+        _pages = [n for n in range(_count) if replace or not out_files[n].exists()]
+        for n, img in self.iter_page_images(
+                    dpi=dpi, lib_image=lib_image, blank_detector=blank_detector, pages=_pages
+                ):
             img.set_output_extension(image_extension)
-            img.to_file(out_file)
+            img.set_codec_preset(codec_preset)
+            img.to_file(out_files[n])
 
 
 class ConvertPdfToImages(ObjectAdapter):
@@ -185,12 +294,40 @@ class ConvertPdfToImages(ObjectAdapter):
                 self, *,
                 dpi: int = 250,
                 lib_image: LibImage = "opencv",
-                image_extension: ImageExtension = "png"
+                image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                spill_store: SpillStore | None = None,
             ) -> ImageStream:
         return self.converter.to_images(
-            dpi=dpi, lib_image=lib_image, image_extension=image_extension
+            dpi=dpi,
+            lib_image=lib_image,
+            image_extension=image_extension,
+            blank_detector=blank_detector,
+            spill_store=spill_store,
+        )
+
+    def to_lazy_images(self, *, dpi: int = 250, lib_image: LibImage = "opencv") -> LazyImageStream:
+        return self.converter.to_lazy_images(dpi=dpi, lib_image=lib_image)
+
+    def iter_page_images(
+                self, *,
+                dpi: int = 250,
+                lib_image: LibImage = "opencv",
+                blank_detector: BlankPageDetector | None = None,
+                pages: list[int] | None = None,
+            ) -> Iterator[Tuple[int, ImageObject]]:
+        return self.converter.iter_page_images(
+            dpi=dpi, lib_image=lib_image, blank_detector=blank_detector, pages=pages,
         )
 
+    def iter_images(
+                self, *,
+                dpi: int = 250,
+                lib_image: LibImage = "opencv",
+                blank_detector: BlankPageDetector | None = None,
+            ) -> Iterator[ImageObject]:
+        return self.converter.iter_images(dpi=dpi, lib_image=lib_image, blank_detector=blank_detector)
+
     def to_files_image(
                 self,
                 output_dir: Directory, *,
@@ -198,7 +335,9 @@ class ConvertPdfToImages(ObjectAdapter):
                 dpi: int = 250,
                 lib_image: LibImage = "opencv",
                 prefix: str = None,
-                image_extension: ImageExtension = "png"
+                image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                codec_preset: CodecPreset = "balanced",
             ) -> None:
         return self.converter.to_files_image(
             output_dir=output_dir,
@@ -207,16 +346,21 @@ class ConvertPdfToImages(ObjectAdapter):
             lib_image=lib_image,
             prefix=prefix,
             image_extension=image_extension,
+            blank_detector=blank_detector,
+            codec_preset=codec_preset,
         )
 
     def to_zip_bytes(
                 self, *,
                 dpi: int = 250,
                 lib_image: LibImage = "opencv",
-                image_extension: ImageExtension = "png"
+                image_extension: ImageExtension = "png",
+                blank_detector: BlankPageDetector | None = None,
+                codec_preset: CodecPreset = "balanced",
             ) -> BytesIO:
         return self.converter.to_zip_bytes(
-            dpi=dpi, lib_image=lib_image, image_extension=image_extension
+            dpi=dpi, lib_image=lib_image, image_extension=image_extension,
+            blank_detector=blank_detector, codec_preset=codec_preset,
         )
 
     @classmethod
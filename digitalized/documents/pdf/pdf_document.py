@@ -6,7 +6,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Union, Any
+from typing import Union, Any, Iterator
 import pandas as pd
 import cv2
 from reportlab.pdfgen import canvas
@@ -16,10 +16,10 @@ from digitalized.types.core import ObjectAdapter, BuilderInterface
 from digitalized.types.array import ArrayList, ArrayString
 from digitalized.documents.erros import NotImplementedModulePdfError
 from digitalized.documents.pdf.pdf_page import (
-    PageDocumentPdf, InterfacePagePdf, LibPDF, MODULE_FITZ, MODULE_PYPDF
+    PageDocumentPdf, InterfacePagePdf, LibPDF, MODULE_FITZ, MODULE_PYPDF, pixmap_to_image
 )
-from digitalized.documents.image import ImageObject, ImageStream, LibImage
-from digitalized.io import ZipOutputStream
+from digitalized.documents.image import ImageObject, ImageStream, LibImage, HashMethod, DuplicateIndex
+from digitalized.io import ZipOutputStream, MappedFile, BufferReader
 
 
 if MODULE_PYPDF:
@@ -151,6 +151,27 @@ def create_document_from_image(img: ImageObject) -> fitz.Document:
 #======================================================================#
 # Função para converter documentos em imagens
 #======================================================================#
+def iter_images_from_pdf(
+            pdf_bytes: bytes, *,
+            dpi=250,
+            lib_image: LibImage = "pil",
+        ) -> Iterator[ImageObject]:
+    """
+        Páginas de um documento PDF convertidas em imagens uma de cada vez: a
+    primeira página fica disponível antes da renderização das demais.
+    """
+    _document = fitz.Document(stream=pdf_bytes, filetype="pdf")
+    try:
+        page: fitz.Page
+        for page in _document:
+            pix: fitz.Pixmap = page.get_pixmap(dpi=dpi)
+            img_obj = pixmap_to_image(pix, library=lib_image)
+            del pix
+            yield img_obj
+    finally:
+        _document.close()
+
+
 def create_images_from_pdf(
             pdf_bytes: bytes, *,
             dpi=250,
@@ -159,15 +180,8 @@ def create_images_from_pdf(
     """
     Converte as páginas de um documento PDF em imagens.
     """
-    _document = fitz.Document(stream=pdf_bytes, filetype="pdf")
     _stream = ImageStream()
-    page: fitz.Page
-    for page in _document:
-        pix: fitz.Pixmap = page.get_pixmap(dpi=dpi)
-        img_obj = ImageObject.create_from_bytes(
-            pix.tobytes('png', jpg_quality=100),
-            library=lib_image
-        )
+    for img_obj in iter_images_from_pdf(pdf_bytes, dpi=dpi, lib_image=lib_image):
         _stream.add_image(img_obj)
     return _stream
 
@@ -342,8 +356,8 @@ class ImplementDocumentPdfFitz(InterfaceDocumentPdf):
         return pages
 
     @classmethod
-    def create_from_bytes(cls, bt: bytes) -> ImplementDocumentPdfFitz:
-        # Cria documento a partir de BytesIO
+    def create_from_bytes(cls, bt: Union[bytes, memoryview]) -> ImplementDocumentPdfFitz:
+        # Cria documento a partir de bytes ou memoryview (o fitz usa o buffer sem copiar)
         if not MODULE_FITZ:
             raise ImportError("Módulo fitz|pymupdf não instalado! - Use pip install fitz.")
         doc: fitz.Document = fitz.Document(stream=bt, filetype="pdf")
@@ -354,6 +368,7 @@ class ImplementDocumentPdfFitz(InterfaceDocumentPdf):
         # Cria documento a partir de caminho no disco
         if not MODULE_FITZ:
             raise ImportError("Módulo fitz|pymupdf não instalado!\nUse pip install fitz.")
+        # O MuPDF lê o arquivo sob demanda, sem carregar o arquivo inteiro na memória.
         doc = fitz.open(file.path)
         return cls(doc)
 
@@ -368,10 +383,11 @@ class ImplementDocumentPdfFitz(InterfaceDocumentPdf):
             if not isinstance(page.get_implementation().get_real_module(), fitz.Page):
                 raise TypeError(f"Todas as páginas devem ser do tipo [fitz.Page]")
             # Insere as páginas no novo documento
+            # get_num_page() começa em 1, o índice do fitz em 0.
             pdf_document.insert_pdf(
                 page.get_implementation().get_real_module().parent,
-                from_page=page.get_num_page(),
-                to_page=page.get_num_page()
+                from_page=page.get_num_page() - 1,
+                to_page=page.get_num_page() - 1
             )
         bt = pdf_document.write()
         return cls.create_from_bytes(bt)
@@ -457,11 +473,11 @@ class ImplementDocumentPdfPyPdf(InterfaceDocumentPdf):
         return pages_pdf
 
     @classmethod
-    def create_from_bytes(cls, bt: bytes) -> ImplementDocumentPdfPyPdf:
-        # Usa PdfReader diretamente de BytesIO
+    def create_from_bytes(cls, bt: Union[bytes, memoryview]) -> ImplementDocumentPdfPyPdf:
+        # PdfReader lê o buffer diretamente, sem copiar para um BytesIO.
         if not MODULE_PYPDF:
             raise ImportError("Módulo pypdf não instalado!\nUse pip install pypdf.")
-        reader = PdfReader(BytesIO(bt))
+        reader = PdfReader(BufferReader(bt))
         pdf_writer = PdfWriter()
         for page in reader.pages:
             pdf_writer.add_page(page)
@@ -472,12 +488,15 @@ class ImplementDocumentPdfPyPdf(InterfaceDocumentPdf):
         # Usa PdfReader diretamente de arquivo
         if not MODULE_PYPDF:
             raise ImportError("Módulo pypdf não instalado!\nUse pip install pypdf.")
-        reader = PdfReader(file.absolute())
-        pdf_writer = PdfWriter()
-        for p in reader.pages:
-            pdf_writer.add_page(p)
-        _obj_doc = cls(pdf_writer)
-        reader.close()
+        # PdfReader(caminho) copia o arquivo inteiro para um BytesIO, o arquivo
+        # mapeado em memória é lido sob demanda.
+        with MappedFile(file) as mapped:
+            reader = PdfReader(BufferReader(mapped.get_view()))
+            pdf_writer = PdfWriter()
+            for p in reader.pages:
+                pdf_writer.add_page(p)
+            _obj_doc = cls(pdf_writer)
+            reader.close()
         return _obj_doc
 
     @classmethod
@@ -580,11 +599,23 @@ class DocumentPdf(ObjectAdapter):
     def to_dict(self, separator: str = '\n') -> dict[str, list[str]]:
         raise NotImplementedError()
 
+    def get_duplicates(
+                self, *, method: HashMethod = "dhash", max_distance: int = 4, dpi: int = 36
+            ) -> list[int | None]:
+        """
+            Para cada página, o índice da primeira página anterior quase igual (hash
+        perceptual em baixa resolução), ou None.
+        """
+        index = DuplicateIndex(max_distance=max_distance, method=method)
+        return [
+            index.match_or_add(num, page.get_hash(method, dpi=dpi)) for num, page in enumerate(self.to_pages())
+        ]
+
     def to_data(self, separator: str = '\n') -> pd.DataFrame:
         return pd.DataFrame.from_dict(self.to_dict(separator=separator))
 
     @classmethod
-    def create_from_bytes(cls, bt: bytes, *, lib_pdf: LibPDF = "fitz") -> DocumentPdf:
+    def create_from_bytes(cls, bt: Union[bytes, memoryview], *, lib_pdf: LibPDF = "fitz") -> DocumentPdf:
         if lib_pdf == "fitz":
             return cls(ImplementDocumentPdfFitz.create_from_bytes(bt))
         elif lib_pdf == "pypdf":
@@ -644,5 +675,5 @@ class BuilderInterfaceDocumentPdf(BuilderInterface):
 __all__ = [
     'DocumentPdf', 'BuilderInterfaceDocumentPdf',
     'InterfaceDocumentPdf', 'merge_documents',
-    'merge_pdf_bytes', 'merge_pages_documents',
+    'merge_pdf_bytes', 'merge_pages_documents', 'iter_images_from_pdf',
 ]
@@ -5,9 +5,14 @@
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Literal, Union
+from typing import Any, Literal, Tuple, Union
 
+import numpy as np
+from PIL import Image
 from digitalized.documents.erros import NotImplementedModulePdfError
+from digitalized.documents.image.image import ImageObject, LibImage
+from digitalized.documents.image.blank import BlankPageDetector, BlankPageStats
+from digitalized.documents.image.phash import ImageHash, HashMethod, compute_hash
 from digitalized.types.array import ArrayString, BaseTableString
 from digitalized.types.core import ObjectAdapter, BuilderInterface
 
@@ -37,6 +42,23 @@ except ImportError:
 LibPDF = Literal["fitz", "pypdf"]
 
 
+def pixmap_to_image(
+            pix: fitz.Pixmap, *,
+            library: LibImage = "opencv",
+            max_size: Tuple[int, int] | None = None,
+        ) -> ImageObject:
+    """
+        Pixmap => ImageObject sem codificar a página em PNG (os pixels são codificados uma vez na saída).
+
+    :param max_size: None mantém a resolução do dpi usado na renderização (OCR).
+    """
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}.get(pix.n)
+    if mode is None:
+        return ImageObject.create_from_bytes(pix.tobytes('png'), library=library, max_size=max_size)
+    img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    return ImageObject.create_from_pil(img, library=library, max_size=max_size)
+
+
 class InterfacePagePdf(ABC):
 
     def __init__(self, *args, **kwargs):
@@ -89,6 +111,16 @@ class InterfacePagePdf(ABC):
     def get_current_library(self) -> LibPDF:
         pass
 
+    @abstractmethod
+    def get_blank_stats(self, detector: BlankPageDetector) -> BlankPageStats:
+        """Classifica a página (blank, near_blank, content) sem renderizar em alta resolução."""
+        pass
+
+    @abstractmethod
+    def get_hash(self, method: HashMethod = "dhash", size: int = 8, *, dpi: int = 36) -> ImageHash:
+        """Hash perceptual da página renderizada em baixa resolução (dpi)."""
+        pass
+
 
 class ImplementPagePdfPypdf(InterfacePagePdf):
 
@@ -144,6 +176,23 @@ class ImplementPagePdfPypdf(InterfacePagePdf):
     def extract_box(self):
         raise NotImplementedError()
 
+    def get_blank_stats(self, detector: BlankPageDetector) -> BlankPageStats:
+        """
+            Apenas páginas sem conteúdo (/Contents ausente ou vazio) são classificadas,
+        as demais exigem renderizar a página e o pypdf não renderiza.
+        """
+        contents = self._page_pdf.get_contents()
+        if contents is None or len(contents.get_data().strip()) == 0:
+            return detector.create_empty_stats()
+        raise NotImplementedModulePdfError(
+            f'{__class__.__name__} get_blank_stats() exige renderizar a página, use a biblioteca fitz'
+        )
+
+    def get_hash(self, method: HashMethod = "dhash", size: int = 8, *, dpi: int = 36) -> ImageHash:
+        raise NotImplementedModulePdfError(
+            f'{__class__.__name__} get_hash() exige renderizar a página, use a biblioteca fitz'
+        )
+
     def get_text(self) -> str | None:
         try:
             t = self._page_pdf.extract_text()
@@ -224,6 +273,22 @@ class ImplementPagePdfFitz(InterfacePagePdf):
     def extract_box(self) -> fitz.TextPage:
         return self._page_pdf.get_textpage()
 
+    def get_blank_stats(self, detector: BlankPageDetector) -> BlankPageStats:
+        if len(self._page_pdf.get_contents()) == 0:
+            # Página sem nenhum conteúdo, não precisa renderizar.
+            return detector.create_empty_stats()
+        # Renderização em baixa resolução e escala de cinza, apenas para a análise.
+        pix: fitz.Pixmap = self._page_pdf.get_pixmap(
+            dpi=detector.render_dpi, colorspace=fitz.csGRAY, alpha=False
+        )
+        gray = np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        return detector.analyze(gray)
+
+    def get_hash(self, method: HashMethod = "dhash", size: int = 8, *, dpi: int = 36) -> ImageHash:
+        pix: fitz.Pixmap = self._page_pdf.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+        gray = np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        return compute_hash(gray, method, size)
+
     def get_text(self) -> str:
         try:
             text = self._page_pdf.get_textpage().extractTEXT()
@@ -303,6 +368,19 @@ class PageDocumentPdf(ObjectAdapter):
     def set_rotation(self, num: int):
         self._implement_page.set_rotation(num)
 
+    def get_blank_stats(self, detector: BlankPageDetector | None = None) -> BlankPageStats:
+        if detector is None:
+            detector = BlankPageDetector()
+        return self._implement_page.get_blank_stats(detector)
+
+    def is_blank(self, detector: BlankPageDetector | None = None) -> bool:
+        """True se a página estiver em branco, analisada em baixa resolução (detector.render_dpi)."""
+        return self.get_blank_stats(detector).is_blank()
+
+    def get_hash(self, method: HashMethod = "dhash", size: int = 8, *, dpi: int = 36) -> ImageHash:
+        """Hash perceptual da página em baixa resolução, para encontrar páginas repetidas."""
+        return self._implement_page.get_hash(method, size, dpi=dpi)
+
     @classmethod
     def create_from_page_pypdf(cls, page: PageObject, number: int) -> PageDocumentPdf:
         return cls(ImplementPagePdfPypdf(page, number))
@@ -350,5 +428,5 @@ class BuilderInterfacePagePdf(BuilderInterface):
 
 
 __all__ = [
-    'MODULE_PYPDF', 'MODULE_FITZ', 'LibPDF', 'PageDocumentPdf', 'InterfacePagePdf'
+    'MODULE_PYPDF', 'MODULE_FITZ', 'LibPDF', 'PageDocumentPdf', 'InterfacePagePdf', 'pixmap_to_image',
 ]
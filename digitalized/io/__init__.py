@@ -1,6 +1,9 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from io import BytesIO
+from io import BytesIO, RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+from typing import Iterable, Union
+import mmap
+import os
 import zipfile
 from soup_files import Directory, File
 
@@ -12,7 +15,7 @@ class OutputStream(ABC):
         pass
 
     @abstractmethod
-    def save_zip(self, list_bytes: list[bytes], *, prefix: str) -> BytesIO:
+    def save_zip(self, list_bytes: Iterable[bytes], *, prefix: str) -> BytesIO:
         pass
 
 
@@ -28,7 +31,7 @@ class ZipOutputStream(OutputStream):
         with open(file_path.absolute(), "wb") as f:
             f.write(final_bytes.getvalue())
 
-    def save_zip(self, list_bytes: list[bytes], *, prefix: str) -> BytesIO:
+    def save_zip(self, list_bytes: Iterable[bytes], *, prefix: str) -> BytesIO:
         # Salvar em zip
         buff_zip = BytesIO()
         file_bytes: bytes
@@ -44,4 +47,87 @@ class ZipOutputStream(OutputStream):
         return buff_zip
 
 
-__all__ = ['OutputStream', 'ZipOutputStream']
+class MappedFile(object):
+    """
+        Arquivo mapeado em memória (somente leitura). get_view() expõe o conteúdo sem
+    copiar para um objeto bytes: as páginas são lidas do disco sob demanda e ficam no
+    cache do sistema, fora da memória do processo.
+    """
+
+    def __init__(self, file: File):
+        self.file: File = file
+        self.__mmap: mmap.mmap | None = None
+        with open(file.absolute(), 'rb') as f:
+            # mmap não aceita arquivos vazios, o descritor pode ser fechado após o mapeamento.
+            if os.fstat(f.fileno()).st_size > 0:
+                self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return 0 if self.__mmap is None else len(self.__mmap)
+
+    def __enter__(self) -> MappedFile:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_view(self) -> memoryview:
+        """Conteúdo do arquivo, válido até close()."""
+        if self.__mmap is None:
+            return memoryview(b'')
+        return memoryview(self.__mmap)
+
+    def close(self):
+        if self.__mmap is None:
+            return
+        try:
+            self.__mmap.close()
+        except BufferError:
+            # Ainda há objetos usando o buffer (ex: numpy), o mapeamento é
+            # desfeito quando o último deles for descartado.
+            pass
+        self.__mmap = None
+
+
+class BufferReader(RawIOBase):
+    """Leitura (file-like) de um buffer (memoryview, mmap, bytes) sem copiar o conteúdo."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        super().__init__()
+        self.__view: memoryview = memoryview(buffer).cast('B')
+        self.__pos: int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        size = min(len(b), len(self.__view) - self.__pos)
+        if size <= 0:
+            return 0
+        b[:size] = self.__view[self.__pos:self.__pos + size]
+        self.__pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_CUR:
+            offset += self.__pos
+        elif whence == SEEK_END:
+            offset += len(self.__view)
+        if offset < 0:
+            raise ValueError(f'{__class__.__name__} posição inválida: {offset}')
+        self.__pos = offset
+        return self.__pos
+
+    def tell(self) -> int:
+        return self.__pos
+
+    def close(self):
+        if not self.closed:
+            self.__view.release()
+        super().close()
+
+
+__all__ = ['OutputStream', 'ZipOutputStream', 'MappedFile', 'BufferReader']
@@ -9,3 +9,9 @@ class NotImplementedModuleTesseractError(Exception):
 
     def __init__(self, message: str = 'Erro, módulo tesseract não implementado') -> None:
         super().__init__(message)
+
+
+class EmptyRecognizedDocumentError(ValueError):
+
+    def __init__(self, message: str = 'Nenhuma página reconhecida, todas as páginas foram descartadas') -> None:
+        super().__init__(message)
@@ -14,10 +14,15 @@ from digitalized.types.array import ArrayList
 from digitalized.types.core import ObjectAdapter
 from digitalized.ocr.tesseract import BinTesseract, CheckTesseractSystem
 from digitalized.documents.image.image import ImageObject, LibImage
-from digitalized.documents.pdf.pdf_document import DocumentPdf, LibPDF, PageDocumentPdf
+from digitalized.documents.image.blank import BlankPageDetector
+from digitalized.documents.image.crop import CropBox
+from digitalized.documents.image.orientation import OrientationEstimate
+from digitalized.documents.image.phash import DuplicateIndex, HashMethod
+from digitalized.documents.pdf.pdf_document import DocumentPdf, LibPDF, PageDocumentPdf, iter_images_from_pdf
+from digitalized.documents.pdf.pdf_page import pixmap_to_image
 from digitalized.documents.erros import NotImplementedModuleImageError
 from digitalized.ocr.error import (
-    NotImplementedModuleTesseractError
+    NotImplementedModuleTesseractError, EmptyRecognizedDocumentError
 )
 
 try:
@@ -64,21 +69,17 @@ def create_document_from_image(img: ImageObject) -> fitz.Document:
     return fitz.Document(stream=final_bytes, filetype="pdf")
 
 
+def create_image_from_page(page: fitz.Page, *, dpi=250, lib_image: LibImage = "pil") -> ImageObject:
+    # Pixels da página direto no ImageObject, sem codificar/decodificar PNG.
+    return pixmap_to_image(page.get_pixmap(dpi=dpi), library=lib_image)
+
+
 def create_images_from_pdf(
             pdf_bytes: bytes, *,
             dpi=250,
             lib_image: LibImage = "pil",
         ) -> ArrayList[ImageObject]:
-    _document = fitz.Document(stream=pdf_bytes, filetype="pdf")
-    images = ArrayList()
-    page: fitz.Page
-    for page in _document:
-        pix: fitz.Pixmap = page.get_pixmap(dpi=dpi)
-        img_obj = ImageObject.create_from_bytes(
-            pix.tobytes('png', jpg_quality=100), library=lib_image
-        )
-        images.append(img_obj)
-    return images
+    return ArrayList(list(iter_images_from_pdf(pdf_bytes, dpi=dpi, lib_image=lib_image)))
 
 
 # ======================================================================#
@@ -109,18 +110,27 @@ def include_text_on_image_as_pdf(image: ImageObject, raw_results: list) -> TextR
     """
     Recebe um fitz.Document (com a imagem) e os resultados do OCR,
     retornando um PDF pesquisável (imagem + texto sobreposto).
+
+    Se a imagem foi recortada (set_autocrop()), a página tem o tamanho da imagem
+    de origem e a imagem/texto são posicionados no deslocamento do recorte.
     """
     # Converter o objeto de entrada para imagem OpenCV
     img_w, img_h = image.get_width(), image.get_height()
+    crop_box: CropBox | None = image.get_crop_box()
+    if crop_box is None:
+        crop_box = CropBox(0, 0, img_w, img_h, img_w, img_h)
+    page_h = crop_box.source_height
 
     # Converter a imagem para PDF (imagem de fundo)
     buffer = BytesIO()
-    _pdf_canvas = canvas.Canvas(buffer, pagesize=(img_w, img_h))
+    _pdf_canvas = canvas.Canvas(buffer, pagesize=(crop_box.source_width, page_h))
 
     # Desenha a imagem original como fundo
     success, encoded_image = cv2.imencode('.png', image.to_image_opencv())
     img_stream = BytesIO(encoded_image.tobytes())
-    _pdf_canvas.drawImage(ImageReader(img_stream), 0, 0, width=img_w, height=img_h)
+    _pdf_canvas.drawImage(
+        ImageReader(img_stream), crop_box.x, page_h - crop_box.y - img_h, width=img_w, height=img_h
+    )
 
     # Adiciona o texto OCR como camada "invisível" sobre a imagem
     _pdf_canvas.setFont("Helvetica", 8)
@@ -136,8 +146,8 @@ def include_text_on_image_as_pdf(image: ImageObject, raw_results: list) -> TextR
             continue
         # No PDF (ReportLab), a origem (0,0) é no canto INFERIOR esquerdo.
         # No OCR/OpenCV, a origem é no canto SUPERIOR esquerdo.
-        y_pdf = img_h - item.y_avg
-        _pdf_canvas.drawString(item.x_min, y_pdf, item.text)
+        x_src, y_src = crop_box.map_point(item.x_min, item.y_avg)
+        _pdf_canvas.drawString(x_src, page_h - y_src, item.text)
 
     _pdf_canvas.showPage()
     _pdf_canvas.save()
@@ -147,6 +157,34 @@ def include_text_on_image_as_pdf(image: ImageObject, raw_results: list) -> TextR
     return TextRecognized(output_bytes)
 
 
+def include_crop_offset(recognized: TextRecognized, crop_box: CropBox | None) -> TextRecognized:
+    """
+        Posiciona a página reconhecida (imagem recortada) no deslocamento do recorte,
+    em uma página com o tamanho da imagem de origem. Usado quando o PDF é gerado
+    pelo próprio OCR (ex: tesseract), sem include_text_on_image_as_pdf().
+    """
+    if crop_box is None or crop_box.is_full():
+        return recognized
+    src = fitz.Document(stream=recognized.get_bytes(), filetype="pdf")
+    # Pontos do PDF por pixel da imagem recortada.
+    scale = src[0].rect.width / crop_box.width
+    out = fitz.Document()
+    page: fitz.Page = out.new_page(
+        width=crop_box.source_width * scale, height=crop_box.source_height * scale
+    )
+    page.show_pdf_page(
+        fitz.Rect(
+            crop_box.x * scale, crop_box.y * scale,
+            (crop_box.x + crop_box.width) * scale, (crop_box.y + crop_box.height) * scale,
+        ),
+        src, 0,
+    )
+    output_bytes = out.tobytes()
+    out.close()
+    src.close()
+    return TextRecognized(output_bytes)
+
+
 class TextRecognized(object):
     """
         Recebe os bytes de uma imagem reconhecida com o OCR no formato PDF.
@@ -202,6 +240,10 @@ class InterfaceTesseractOcr(ABC):
     def get_recognized_text(self, img: ImageObject) -> TextRecognized:
         pass
 
+    def get_orientation(self, img: ImageObject) -> OrientationEstimate:
+        """Rotação e inclinação do texto, padrão: perfis de projeção (ImageObject.get_orientation())."""
+        return img.get_orientation()
+
     def get_bin_tess(self) -> BinTesseract:
         return self._bin_tess
 
@@ -284,7 +326,36 @@ class ImplementPyTesseract(InterfaceTesseractOcr):
             extension='pdf',
             timeout=15,
         )
-        return TextRecognized(bt)
+        return include_crop_offset(TextRecognized(bt), img.get_crop_box())
+
+    def get_orientation(self, img: ImageObject) -> OrientationEstimate:
+        """
+            Rotação obtida com o OSD do tesseract, executado uma vez em uma cópia
+        reduzida da imagem, a inclinação é estimada com perfis de projeção.
+        """
+        _im = img.to_image_pil()
+        _im.thumbnail((1600, 1600))
+        try:
+            osd: dict = self._mod_py_tesseract.image_to_osd(
+                _im,
+                config=f'--psm 0 {self.__get_tess_dir_config()}',
+                output_type=pytesseract.Output.DICT,
+                timeout=15,
+            )
+        except (pytesseract.TesseractError, RuntimeError):
+            # Pouco texto para o OSD ou tempo esgotado (RuntimeError do pytesseract),
+            # usa apenas os perfis de projeção.
+            return img.get_orientation()
+        # 'rotate' do OSD é no sentido horário, set_rotation() é anti-horário.
+        est = img.get_orientation(rotation=(360 - int(osd['rotate'])) % 360)
+        return OrientationEstimate(
+            est.rotation,
+            est.skew,
+            # orientation_conf do tesseract não é limitada, ~10 já é uma estimativa segura.
+            min(1.0, float(osd['orientation_conf']) / 10),
+            est.skew_confidence,
+            "osd",
+        )
 
 
 # ======================================================================#
@@ -474,6 +545,9 @@ class TesseractOcr(ObjectAdapter):
     def get_recognized_text(self, img: ImageObject) -> TextRecognized:
         return self.__implement_ocr.get_recognized_text(img)
 
+    def get_orientation(self, img: ImageObject) -> OrientationEstimate:
+        return self.__implement_ocr.get_orientation(img)
+
     @classmethod
     def builder_easyocr(cls) -> BuildEasyOcr:
         return BuildEasyOcr()
@@ -501,15 +575,64 @@ class RecognizePdf(object):
     def __init__(self, tess: TesseractOcr):
         self.tess: TesseractOcr = tess
 
-    def recognize_pdf(self, pdf_document: Union[bytes | DocumentPdf], *, dpi: int = 300) -> DocumentPdf:
+    def recognize_pdf(
+                self,
+                pdf_document: Union[bytes | DocumentPdf], *,
+                dpi: int = 300,
+                blank_detector: BlankPageDetector | None = None,
+                auto_crop: bool = False,
+                auto_rotate: bool = False,
+                dedup_distance: int | None = None,
+                dedup_method: HashMethod = "dhash",
+            ) -> DocumentPdf:
+        """
+        :param dedup_distance: Se informado, páginas quase iguais a uma página já
+            reconhecida (distância de Hamming do hash perceptual <= dedup_distance,
+            ex: 4) reutilizam o resultado do OCR, sem renderizar em dpi.
+        :param auto_rotate: Estima orientação/inclinação (tess.get_orientation()) e corrige a
+            imagem uma única vez antes do OCR.
+        :param auto_crop: Recorta bordas/margens antes do OCR, o texto é posicionado
+            de volta na página com o tamanho original.
+        :param blank_detector: Se informado, cada página é analisada em baixa resolução
+            antes de renderizar em dpi. Páginas em branco não passam pelo OCR: são
+            descartadas (policy=skip) ou mantidas sem texto (policy=downgrade). O total
+            fica em blank_detector.get_report().
+        :raises EmptyRecognizedDocumentError: Todas as páginas foram descartadas
+            (páginas em branco com policy=skip), não há documento a retornar.
+        """
         if isinstance(pdf_document, DocumentPdf):
             pdf_document = pdf_document.to_bytes()
 
-        doc_images: ArrayList[ImageObject] = create_images_from_pdf(pdf_document, dpi=dpi)
+        source: DocumentPdf = DocumentPdf.create_from_bytes(pdf_document)
         recognized_docs: ArrayList[PageDocumentPdf] = ArrayList()
-        for n, im in enumerate(doc_images):
+        dedup_index: DuplicateIndex | None = None
+        if dedup_distance is not None:
+            dedup_index = DuplicateIndex(max_distance=dedup_distance, method=dedup_method)
+        # Páginas reconhecidas de cada página original (reutilizadas nas duplicatas).
+        recognized_pages: dict[int, list[PageDocumentPdf]] = {}
+        for num, page in enumerate(source.to_pages()):
+            if (blank_detector is not None) and blank_detector.is_flagged(page.get_blank_stats(blank_detector)):
+                blank_detector.register_flagged()
+                if blank_detector.policy == "downgrade":
+                    recognized_docs.append(page)
+                continue
+            if dedup_index is not None:
+                original = dedup_index.match_or_add(num, page.get_hash(dedup_method))
+                if original is not None:
+                    recognized_docs.extend(recognized_pages[original])
+                    continue
+            im = create_image_from_page(page.get_real_module(), dpi=dpi)
+            if auto_rotate:
+                im.set_orientation(self.tess.get_orientation(im))
+            if auto_crop:
+                im.set_autocrop()
             txt = self.tess.get_recognized_text(im)
-            recognized_docs.extend(txt.get_document().to_pages())
+            recognized_pages[num] = txt.get_document().to_pages()
+            recognized_docs.extend(recognized_pages[num])
+        if len(recognized_docs) == 0:
+            raise EmptyRecognizedDocumentError(
+                f'{__class__.__name__} nenhuma página reconhecida: as {source.size()} páginas estão em branco'
+            )
         final_doc = DocumentPdf.create_from_pages(recognized_docs)
         return final_doc
 
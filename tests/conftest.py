@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+#
+import os
+import sys
+import cv2
+import numpy as np
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def create_page_pixels(width: int = 320, height: int = 200) -> np.ndarray:
+    """Página sintética BGR: fundo claro, texto escuro e um gradiente (sem simetrias)."""
+    img = np.full((height, width, 3), 235, dtype=np.uint8)
+    img[:, :, 0] = np.linspace(180, 250, width, dtype=np.uint8)
+    cv2.putText(img, "Digitalized 0123", (10, height // 3), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 30, 40), 2)
+    cv2.rectangle(img, (15, height // 2), (width // 2, height - 20), (60, 90, 120), -1)
+    return img
+
+
+@pytest.fixture
+def page_pixels() -> np.ndarray:
+    return create_page_pixels()
+
+
+@pytest.fixture
+def page_png(page_pixels) -> bytes:
+    return cv2.imencode(".png", page_pixels)[1].tobytes()
+
+
+@pytest.fixture
+def page_jpeg(page_pixels) -> bytes:
+    return cv2.imencode(".jpg", page_pixels)[1].tobytes()
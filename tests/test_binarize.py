@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+#
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from digitalized.documents.image.image import ImageInvertColor
+from digitalized.documents.image.binarize import (
+    LUT_INVERT, combine_luts, create_threshold_lut, local_mean, threshold_local_mean,
+    threshold_local, threshold_sauvola,
+)
+
+
+@pytest.fixture
+def noisy_gray() -> np.ndarray:
+    return np.random.default_rng(1).integers(0, 256, (97, 131), dtype=np.uint8)
+
+
+def test_combined_lut_matches_sequential_point(noisy_gray):
+    img = Image.fromarray(noisy_gray)
+    expected = img.point(LUT_INVERT).point(create_threshold_lut(128, above=0, below=150))
+    combined = img.point(combine_luts(LUT_INVERT, create_threshold_lut(128, above=0, below=150)))
+    assert np.array_equal(np.asarray(combined), np.asarray(expected))
+
+
+def test_local_mean_matches_box_filter(noisy_gray):
+    expected = cv2.boxFilter(noisy_gray.astype(np.float32), -1, (11, 11), borderType=cv2.BORDER_REPLICATE)
+    assert np.allclose(local_mean(noisy_gray, 11), expected, atol=1e-3)
+
+
+@pytest.mark.parametrize("block_size, c", [(3, 0), (11, 2), (15, 3.5)])
+def test_threshold_local_mean_matches_opencv(noisy_gray, block_size, c):
+    expected = cv2.adaptiveThreshold(
+        noisy_gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, block_size, c
+    )
+    assert np.array_equal(threshold_local_mean(noisy_gray, block_size, c), expected)
+    inverted = threshold_local_mean(noisy_gray, block_size, c, invert=True)
+    assert np.array_equal(inverted, 255 - expected)
+
+
+@pytest.mark.parametrize("block_size", [2, 1, 10])
+def test_invalid_block_size(noisy_gray, block_size):
+    with pytest.raises(ValueError):
+        threshold_local_mean(noisy_gray, block_size)
+
+
+def test_pil_adaptive_threshold_matches_opencv(noisy_gray):
+    inv = ImageInvertColor.create_from_pil(Image.fromarray(noisy_gray))
+    inv.set_adaptive_threshold(11, 2)
+    expected = cv2.adaptiveThreshold(noisy_gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 11, 2)
+    assert np.array_equal(np.asarray(inv.get_real_module()), expected)
+
+
+# -------------------------------------------------------------------------#
+# Sauvola / Niblack
+# -------------------------------------------------------------------------#
+def _reference_limit(gray: np.ndarray, method: str, block_size: int, k: float, r: float = 128) -> np.ndarray:
+    """Limite T calculado em float64 direto das vizinhanças (sem imagem integral)."""
+    half = block_size // 2
+    padded = np.pad(gray.astype(np.float64), half, mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (block_size, block_size))
+    mean = windows.mean(axis=(2, 3))
+    std = windows.std(axis=(2, 3))
+    if method == "sauvola":
+        return mean * (1 + k * (std / r - 1))
+    return mean + k * std
+
+
+@pytest.mark.parametrize("method, k", [("sauvola", 0.2), ("niblack", -0.2)])
+def test_threshold_local_matches_reference(noisy_gray, method, k):
+    limit = _reference_limit(noisy_gray, method, 15, k)
+    result = threshold_local(noisy_gray, method, 15, k)
+    expected = np.where(noisy_gray > limit, 255, 0)
+    # float32 x float64: diferenças apenas com o pixel praticamente igual ao limite.
+    differ = result != expected
+    assert np.all(np.abs(noisy_gray[differ] - limit[differ]) < 1e-2)
+    assert differ.sum() <= noisy_gray.size * 0.001
+
+
+@pytest.mark.parametrize("method", ["sauvola", "niblack"])
+def test_threshold_local_tiles_match_full_page(noisy_gray, method):
+    full = threshold_local(noisy_gray, method, 25, tile_rows=0)
+    assert np.array_equal(threshold_local(noisy_gray, method, 25, tile_rows=16, workers=3), full)
+
+
+def test_sauvola_keeps_text_on_uneven_background():
+    # Fundo com gradiente forte: o threshold global perde o texto na parte escura.
+    gray = np.tile(np.linspace(90, 250, 200), (80, 1)).astype(np.uint8)
+    gray[30:50, 20:180:10] = gray[30:50, 20:180:10] - 60
+    result = threshold_sauvola(gray, 15)
+    assert np.all(result[30:50, 20:180:10] == 0)
+    assert result[5:25].mean() > 250
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+#
+import cv2
+import numpy as np
+import pytest
+from digitalized.documents.image import BlankPageDetector, ImageObject
+
+
+def _create_white_page(width: int = 1240, height: int = 1754) -> np.ndarray:
+    return np.full((height, width), 245, dtype=np.uint8)
+
+
+def test_blank_page_with_noise():
+    gray = _create_white_page()
+    rng = np.random.default_rng(3)
+    gray = np.clip(gray + rng.normal(0, 4, gray.shape), 0, 255).astype(np.uint8)
+    # Poeira isolada e sombra do scanner na borda.
+    for y, x in rng.integers(200, 1200, (10, 2)):
+        gray[y, x] = 0
+    gray[:, :30] = 20
+    stats = BlankPageDetector().analyze(gray)
+    assert stats.page_class == "blank" and stats.is_blank()
+    # A amostra usa o mínimo de cada bloco, o fundo fica um pouco mais escuro.
+    assert 220 <= stats.background <= 245
+
+
+def test_near_blank_page():
+    gray = _create_white_page()
+    cv2.putText(gray, "1", (600, 900), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+    detector = BlankPageDetector()
+    stats = detector.analyze(gray)
+    assert stats.page_class == "near_blank"
+    assert not detector.is_flagged(stats)
+    assert BlankPageDetector(flag_near_blank=True).is_flagged(stats)
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_content_page(page_pixels, library):
+    img = ImageObject.create_from_opencv(page_pixels, library=library)
+    stats = img.get_blank_stats()
+    assert stats.page_class == "content"
+    assert not img.is_blank()
+
+
+def test_dark_background():
+    gray = np.full((800, 600), 15, dtype=np.uint8)
+    assert BlankPageDetector().analyze(gray).is_blank()
+    cv2.putText(gray, "Texto claro", (40, 400), cv2.FONT_HERSHEY_SIMPLEX, 2, 240, 4)
+    assert BlankPageDetector().analyze(gray).page_class == "content"
+
+
+def test_report_and_policy(page_pixels):
+    detector = BlankPageDetector(policy="downgrade")
+    for gray in (_create_white_page(), page_pixels, _create_white_page()):
+        if detector.is_flagged(detector.analyze(gray)):
+            detector.register_flagged()
+    report = detector.get_report()
+    assert (report.checked, report.blank, report.downgraded, report.skipped) == (3, 2, 2, 0)
+    detector.reset()
+    assert detector.get_report().checked == 0
+    with pytest.raises(ValueError):
+        BlankPageDetector(policy="remove")
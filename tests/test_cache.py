@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#
+import numpy as np
+import pytest
+from soup_files import Directory
+from digitalized.documents.image.image import ImageInvertColor, ImageObject
+from digitalized.documents.image.cache import PreprocessCache, create_cache_key, set_preprocess_cache
+
+
+@pytest.fixture
+def cache():
+    cache = PreprocessCache()
+    old = set_preprocess_cache(cache)
+    yield cache
+    set_preprocess_cache(old)
+
+
+def test_lru_limited_by_bytes():
+    cache = PreprocessCache(max_bytes=250)
+    for num in range(3):
+        cache.put(str(num), np.full(100, num, dtype=np.uint8))
+    # O item mais antigo sai para caber no limite.
+    assert "0" not in cache and "1" in cache and "2" in cache
+    assert cache.get("1")[0] == 1
+    cache.put("3", np.zeros(100, dtype=np.uint8))
+    assert "2" not in cache and "1" in cache
+    assert cache.get("0") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_values_are_read_only_copies():
+    cache = PreprocessCache()
+    data = np.zeros(10, dtype=np.uint8)
+    cache.put("key", data)
+    data[0] = 1
+    cached = cache.get("key")
+    assert cached[0] == 0
+    with pytest.raises(ValueError):
+        cached[0] = 2
+
+
+def test_disk_cache(tmp_path):
+    cache_dir = Directory(str(tmp_path / "cache"))
+    PreprocessCache(cache_dir=cache_dir).put("key", np.arange(12, dtype=np.uint8).reshape(3, 4))
+    # Novo cache (ex: outro processo) lê o valor do disco.
+    other = PreprocessCache(cache_dir=cache_dir)
+    assert np.array_equal(other.get("key"), np.arange(12, dtype=np.uint8).reshape(3, 4))
+    assert other.get_stats().disk_hits == 1
+    other.clear(disk=True)
+    assert PreprocessCache(cache_dir=cache_dir).get("key") is None
+
+
+def test_cache_key_depends_on_all_parts():
+    keys = {
+        create_cache_key("abc", "opencv", "background(gray)"),
+        create_cache_key("abd", "opencv", "background(gray)"),
+        create_cache_key("abc", "pil", "background(gray)"),
+        create_cache_key("abc", "opencv", "background(black)"),
+    }
+    assert len(keys) == 4
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_repeated_background_hits_cache(cache, page_png, library):
+    results = []
+    for _ in range(3):
+        inv = ImageInvertColor.create_from_bytes(page_png, library=library)
+        inv.set_background("gray")
+        results.append(np.asarray(inv.get_real_module()))
+    assert (cache.misses, cache.hits) == (1, 2)
+    assert all(np.array_equal(result, results[0]) for result in results)
+
+
+def test_cached_result_matches_uncached(cache, page_png):
+    set_preprocess_cache(None)
+    expected = ImageObject.create_from_bytes(page_png)
+    expected.set_background("gray")
+    expected = expected.to_image_opencv()
+    set_preprocess_cache(cache)
+    for _ in range(2):
+        img = ImageObject.create_from_bytes(page_png)
+        img.set_background("gray")
+        assert np.array_equal(img.to_image_opencv(), expected)
+    assert cache.hits == 1
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+#
+from io import BytesIO
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from soup_files import File
+from digitalized.documents.image.image import ImageObject
+from digitalized.documents.image.codec import (
+    encode_opencv, encode_pil, get_codec_options, is_codec_extension, normalize_extension
+)
+
+
+def test_normalize_extension():
+    assert normalize_extension(".JPEG") == "jpg"
+    assert normalize_extension("tif") == "tiff"
+    assert is_codec_extension(".webp")
+    assert not is_codec_extension(".bmp")
+    with pytest.raises(ValueError):
+        normalize_extension(".bmp")
+    with pytest.raises(ValueError):
+        get_codec_options("maximum")
+
+
+def test_png_presets_are_lossless(page_pixels):
+    sizes = {}
+    for preset in ("fast", "balanced", "smallest"):
+        data = encode_opencv(page_pixels, "png", preset)
+        assert np.array_equal(cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR), page_pixels)
+        sizes[preset] = len(data)
+    assert sizes["smallest"] <= sizes["balanced"] <= sizes["fast"]
+
+
+def test_jpeg_smallest_is_smaller(page_pixels):
+    img = Image.fromarray(page_pixels[:, :, ::-1])
+    assert len(encode_pil(img, "jpg", "smallest")) < len(encode_pil(img, "jpg", "balanced"))
+
+
+def test_bilevel_png_uses_one_bit(page_pixels):
+    gray = cv2.cvtColor(page_pixels, cv2.COLOR_BGR2GRAY)
+    _, binary = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY)
+    data = encode_opencv(binary, "png", bilevel=True)
+    with Image.open(BytesIO(data)) as img:
+        assert img.mode == "1"
+        assert np.array_equal(np.asarray(img.convert("L")), binary)
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_to_file_uses_preset(tmp_path, page_pixels, library):
+    img = ImageObject.create_from_opencv(page_pixels, library=library)
+    img.set_codec_preset("smallest")
+    output = File(str(tmp_path / "page.png"))
+    img.to_file(output)
+    assert output.path.read_bytes() == img.encode("png")
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_to_file_other_formats(tmp_path, page_pixels, library):
+    # Formatos sem preset são gravados pela própria biblioteca.
+    img = ImageObject.create_from_opencv(page_pixels, library=library)
+    output = tmp_path / "page.bmp"
+    img.to_file(File(str(output)))
+    saved = cv2.imread(str(output), cv2.IMREAD_COLOR)
+    assert np.array_equal(saved, page_pixels)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+import numpy as np
+import pytest
+from digitalized.documents.image import CropBox, ImageObject, find_content_box
+
+# Conteúdo (x0, y0, x1, y1) da página sintética.
+_CONTENT = (300, 400, 900, 1200)
+
+
+def _create_scanned_page() -> np.ndarray:
+    gray = np.full((1754, 1240), 240, dtype=np.uint8)
+    # Bordas escuras do scanner à esquerda e no topo.
+    gray[:, :40] = 10
+    gray[:30, :] = 10
+    x0, y0, x1, y1 = _CONTENT
+    gray[y0:y1:20, x0:x1] = 0
+    gray[y0:y1, x0:x0 + 4] = 0
+    return gray
+
+
+def test_content_box_ignores_borders_and_margins():
+    box = find_content_box(_create_scanned_page(), padding=8)
+    x0, y0, x1, y1 = _CONTENT
+    # Tolerância: padding + um pixel da amostra reduzida (factor 4).
+    assert x0 - 12 <= box.x <= x0 and y0 - 12 <= box.y <= y0
+    assert x1 <= box.x + box.width <= x1 + 12
+    assert y1 <= box.y + box.height <= y1 + 12
+    assert (box.source_width, box.source_height) == (1240, 1754)
+
+
+def test_blank_page_has_no_content_box():
+    assert find_content_box(np.full((600, 400), 250, dtype=np.uint8)) is None
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_autocrop_maps_points_to_source(library):
+    gray = _create_scanned_page()
+    img = ImageObject.create_from_opencv(gray, library=library, max_size=None)
+    img.set_autocrop()
+    cropped = img.to_image_opencv()
+    box = img.get_crop_box()
+    assert cropped.shape == (box.height, box.width)
+    assert np.array_equal(cropped, gray[box.y:box.y + box.height, box.x:box.x + box.width])
+    # Canto do conteúdo na imagem recortada => mesmo ponto na página original.
+    x, y = box.map_point(_CONTENT[0] - box.x, _CONTENT[1] - box.y)
+    assert (x, y) == _CONTENT[:2]
+
+
+@pytest.mark.parametrize("angle, k", [(90, 1), (180, 2), (270, 3)])
+def test_crop_box_rotate(angle, k):
+    source = np.arange(12 * 7).reshape(7, 12)
+    box = CropBox(2, 1, 5, 3, 12, 7)
+    area = source[box.y:box.y + box.height, box.x:box.x + box.width]
+    rotated = box.rotate(angle)
+    # np.rot90 gira no sentido anti-horário, igual a CropBox.rotate().
+    source_rot = np.rot90(source, k)
+    assert (rotated.source_width, rotated.source_height) == (source_rot.shape[1], source_rot.shape[0])
+    expected = np.rot90(area, k)
+    assert np.array_equal(
+        source_rot[rotated.y:rotated.y + rotated.height, rotated.x:rotated.x + rotated.width], expected
+    )
+
+
+def test_crop_box_compose_and_scale():
+    outer = CropBox(10, 20, 100, 80, 400, 300)
+    inner = CropBox(5, 5, 50, 40, 100, 80)
+    composed = outer.compose(inner)
+    assert composed == CropBox(15, 25, 50, 40, 400, 300)
+    assert composed.map_point(1, 1) == outer.map_point(*inner.map_point(1, 1))
+    scaled = outer.scale(50, 40)
+    assert scaled == CropBox(5, 10, 50, 40, 200, 150)
+    assert CropBox(0, 0, 400, 300, 400, 300).is_full()
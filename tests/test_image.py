@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#
+"""
+    Resultados das operações (rotação, fundo) iguais aos do caminho anterior
+(decodificar => processar => codificar PNG).
+"""
+from io import BytesIO
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+from digitalized.documents.image.image import (
+    ImageObject, image_bytes_to_opencv, probe_image_header, is_image_complete
+)
+from digitalized.documents.image.preprocess import bgr_to_gray
+
+_CV2_ROTATIONS = {
+    90: [cv2.ROTATE_90_COUNTERCLOCKWISE],
+    180: [cv2.ROTATE_180],
+    270: [cv2.ROTATE_90_COUNTERCLOCKWISE, cv2.ROTATE_180],
+}
+_PIL_ROTATIONS = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+
+
+def _reference_opencv_rotation(img_bytes: bytes, rotation: int) -> np.ndarray:
+    img = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+    for code in _CV2_ROTATIONS[rotation]:
+        img = cv2.rotate(img, code)
+    return image_bytes_to_opencv(cv2.imencode(".png", img)[1].tobytes())
+
+
+def _reference_opencv_background_gray(img_bytes: bytes) -> np.ndarray:
+    img = image_bytes_to_opencv(img_bytes)
+    img = cv2.bilateralFilter(img, 9, 75, 75)
+    return cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+
+
+def _reference_pil_background_gray(img_bytes: bytes) -> np.ndarray:
+    img = ImageOps.invert(Image.open(BytesIO(img_bytes)).convert("L"))
+    return np.asarray(img.point(lambda x: 0 if x > 128 else 150))
+
+
+# -------------------------------------------------------------------------#
+# Paridade com o caminho anterior (entrada PNG, sem perdas)
+# -------------------------------------------------------------------------#
+@pytest.mark.parametrize("rotation", [90, 180, 270])
+def test_opencv_rotation_matches_reference(page_png, rotation):
+    img = ImageObject.create_from_bytes(page_png, library="opencv")
+    img.set_rotation(rotation)
+    assert np.array_equal(img.to_image_opencv(), _reference_opencv_rotation(page_png, rotation))
+
+
+@pytest.mark.parametrize("rotation", [90, 180, 270])
+def test_pil_rotation_matches_reference(page_png, rotation):
+    img = ImageObject.create_from_bytes(page_png, library="pil")
+    img.set_rotation(rotation)
+    expected = Image.open(BytesIO(page_png)).transpose(_PIL_ROTATIONS[rotation])
+    assert np.array_equal(np.asarray(img.to_image_pil()), np.asarray(expected))
+
+
+def test_opencv_background_gray_matches_reference(page_png):
+    img = ImageObject.create_from_bytes(page_png, library="opencv")
+    img.set_background("gray")
+    assert np.array_equal(img.to_image_opencv(), _reference_opencv_background_gray(page_png))
+
+
+def test_pil_background_gray_matches_reference(page_png):
+    img = ImageObject.create_from_bytes(page_png, library="pil")
+    img.set_background("gray")
+    result = np.asarray(img.to_image_pil().convert("L"))
+    assert np.array_equal(result, _reference_pil_background_gray(page_png))
+
+
+def test_rotation_keeps_original_bytes_until_needed(page_png):
+    img = ImageObject.create_from_bytes(page_png, library="opencv")
+    img.set_rotation(90)
+    img.set_rotation(270)
+    # 90 + 270 se anulam: nenhuma operação, os bytes originais são mantidos.
+    assert img.get_image_bytes() == page_png
+
+
+# -------------------------------------------------------------------------#
+# Cabeçalhos
+# -------------------------------------------------------------------------#
+def test_probe_png_and_jpeg(page_png, page_jpeg, page_pixels):
+    height, width = page_pixels.shape[:2]
+    for img_bytes in (page_png, page_jpeg):
+        meta = probe_image_header(img_bytes)
+        assert (meta.width, meta.height, meta.channels) == (width, height, 3)
+    assert probe_image_header(b"GIF89a" + bytes(20)) is None
+
+
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA", "P"])
+def test_probe_channels_match_decode(page_pixels, mode):
+    buf = BytesIO(b"")
+    Image.fromarray(page_pixels[:, :, ::-1]).convert(mode).save(buf, format="PNG")
+    img = ImageObject.create_from_bytes(buf.getvalue(), library="opencv").get_implementation()
+    before = img.get_metadata()
+    img.get_real_module()
+    assert img.get_metadata() == before
+
+
+# -------------------------------------------------------------------------#
+# Bytes originais (passthrough)
+# -------------------------------------------------------------------------#
+def test_image_complete(page_png, page_jpeg):
+    assert is_image_complete(page_png)
+    assert is_image_complete(page_jpeg)
+    assert not is_image_complete(page_png[:len(page_png) // 2])
+    assert not is_image_complete(page_jpeg[:len(page_jpeg) // 2])
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_truncated_bytes_rejected(page_png, library):
+    with pytest.raises(Exception):
+        ImageObject.create_from_bytes(page_png[:len(page_png) // 2], library=library)
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_untouched_bytes_passthrough(page_jpeg, library):
+    img = ImageObject.create_from_bytes(page_jpeg, library=library)
+    assert img.get_image_bytes() == page_jpeg
+
+
+# -------------------------------------------------------------------------#
+# Escala de cinza
+# -------------------------------------------------------------------------#
+@pytest.mark.parametrize("channels", [3, 4])
+def test_bgr_to_gray_matches_png_decode(channels):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (64, 64, channels), dtype=np.uint8)
+    # Extremos: o produto com os pesos passa de 16 bits.
+    img[0, 0] = 255
+    expected = image_bytes_to_opencv(cv2.imencode(".png", img)[1].tobytes())
+    gray = bgr_to_gray(img)
+    assert gray.dtype == np.uint8
+    assert np.array_equal(gray, expected)
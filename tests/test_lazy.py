@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+from threading import Lock
+import weakref
+import cv2
+import numpy as np
+import pytest
+from digitalized.documents.image.image import ImageObject
+from digitalized.documents.image.lazy import ImageSource, LazyImageStream
+
+
+class CountingSource(ImageSource):
+    """Imagens 8x8 com o índice como valor dos pixels, registra as imagens ainda vivas."""
+
+    def __init__(self, total: int):
+        self.total: int = total
+        self.loaded: list[int] = []
+        self.alive: int = 0
+        self.max_alive: int = 0
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return self.total
+
+    def load(self, index: int) -> ImageObject:
+        with self.__lock:
+            self.loaded.append(index)
+            self.alive += 1
+            self.max_alive = max(self.max_alive, self.alive)
+        img = ImageObject.create_from_opencv(np.full((8, 8), index, dtype=np.uint8))
+        # Contagem decrementada quando o consumidor descarta a imagem.
+        weakref.finalize(img, self.release)
+        return img
+
+    def release(self):
+        with self.__lock:
+            self.alive -= 1
+
+
+def _pixel_value(img: ImageObject) -> int:
+    return int(img.to_image_opencv()[0, 0])
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iteration_order(prefetch):
+    stream = LazyImageStream(CountingSource(10), prefetch=prefetch, workers=3)
+    assert [_pixel_value(img) for img in stream] == list(range(10))
+
+
+@pytest.mark.parametrize("prefetch", [1, 2, 4])
+def test_prefetch_bound(prefetch):
+    source = CountingSource(20)
+    stream = LazyImageStream(source, prefetch=prefetch, workers=4)
+    values = []
+    for img in stream:
+        values.append(_pixel_value(img))
+        del img
+    assert values == list(range(20))
+    # Imagem atual + no máximo prefetch imagens lidas à frente.
+    assert source.max_alive <= prefetch + 1
+    assert sorted(source.loaded) == list(range(20))
+
+
+def test_no_prefetch_loads_on_demand():
+    source = CountingSource(5)
+    iterator = iter(LazyImageStream(source, prefetch=0))
+    next(iterator)
+    assert source.loaded == [0]
+    next(iterator)
+    assert source.loaded == [0, 1]
+
+
+def test_getitem_loads_single_image():
+    source = CountingSource(5)
+    stream = LazyImageStream(source)
+    assert len(stream) == 5
+    assert _pixel_value(stream[-1]) == 4
+    assert source.loaded == [4]
+    with pytest.raises(IndexError):
+        stream[5]
+
+
+def test_negative_prefetch_rejected():
+    with pytest.raises(ValueError):
+        LazyImageStream(CountingSource(1), prefetch=-1)
+
+
+def test_create_from_files(tmp_path):
+    from soup_files import File
+    files = []
+    for num in range(3):
+        path = tmp_path / f"page_{num}.png"
+        cv2.imwrite(str(path), np.full((8, 8), num * 10, dtype=np.uint8))
+        files.append(File(str(path)))
+    stream = LazyImageStream.create_from_files(files, prefetch=1)
+    assert [_pixel_value(img) for img in stream] == [0, 10, 20]
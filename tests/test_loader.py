@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+from threading import Lock
+import asyncio
+import weakref
+import cv2
+import numpy as np
+import pytest
+from soup_files import File
+from digitalized.documents.image.loader import BulkImageLoader, LoadResult
+
+
+class CountingLoader(BulkImageLoader):
+    """Registra quantas imagens carregadas ainda estão vivas."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.alive: int = 0
+        self.max_alive: int = 0
+        self.__lock = Lock()
+
+    def load_file(self, file: File) -> LoadResult:
+        result = super().load_file(file)
+        if result.image is not None:
+            with self.__lock:
+                self.alive += 1
+                self.max_alive = max(self.max_alive, self.alive)
+            weakref.finalize(result.image, self.release)
+        return result
+
+    def release(self):
+        with self.__lock:
+            self.alive -= 1
+
+
+@pytest.fixture
+def image_files(tmp_path) -> list[File]:
+    files = []
+    for num in range(12):
+        path = tmp_path / f"page_{num:02d}.png"
+        cv2.imwrite(str(path), np.full((16, 16), num * 10, dtype=np.uint8))
+        files.append(File(str(path)))
+    return files
+
+
+def _pixel_value(result: LoadResult) -> int:
+    return int(result.image.to_image_opencv()[0, 0])
+
+
+def test_order_and_errors(tmp_path, image_files):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    files = image_files[:3] + [File(str(broken))] + image_files[3:5]
+    results = BulkImageLoader(concurrency=3).load(files)
+    assert [r.is_ok() for r in results] == [True, True, True, False, True, True]
+    assert [_pixel_value(r) for r in results if r.is_ok()] == [0, 10, 20, 30, 40]
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+def test_memory_bound(image_files, concurrency):
+    loader = CountingLoader(concurrency=concurrency)
+    values = []
+    for result in loader.iter_load(image_files):
+        values.append(_pixel_value(result))
+        del result
+    assert values == [num * 10 for num in range(12)]
+    # Imagem atual incluída.
+    assert loader.max_alive <= concurrency
+
+
+def test_load_async(image_files):
+    results = asyncio.run(BulkImageLoader(concurrency=4).load_async(image_files))
+    assert [_pixel_value(r) for r in results] == [num * 10 for num in range(12)]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+import cv2
+import numpy as np
+import pytest
+from digitalized.documents.image import ImageObject, estimate_orientation
+
+_LINES = (
+    "The quick brown fox jumps", "over the lazy dog. Digitalized", "Hello world bright fields",
+    "keeps the page layout tidy", "lorem ipsum dolor sit amet",
+)
+
+
+@pytest.fixture(scope="module")
+def text_page() -> np.ndarray:
+    """Página em escala de cinza com linhas de texto na posição correta."""
+    img = np.full((1400, 1000), 245, dtype=np.uint8)
+    for num in range(20):
+        cv2.putText(img, _LINES[num % 5], (60, 80 + num * 62), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 20, 2)
+    return img
+
+
+def _rotate_skew(gray: np.ndarray, angle: float) -> np.ndarray:
+    h, w = gray.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (w, h), borderValue=245)
+
+
+@pytest.mark.parametrize("turns", [0, 1, 2, 3])
+def test_rotation_recovered(text_page, turns):
+    # np.rot90 gira no sentido anti-horário: a correção completa a volta.
+    rotated = np.ascontiguousarray(np.rot90(text_page, turns))
+    estimate = estimate_orientation(rotated)
+    assert estimate.rotation == (360 - turns * 90) % 360
+    assert estimate.confidence > 0.1
+    assert abs(estimate.skew) <= 0.2
+
+
+@pytest.mark.parametrize("angle", [-3.0, -1.5, 2.0, 4.0])
+def test_skew_recovered(text_page, angle):
+    estimate = estimate_orientation(_rotate_skew(text_page, angle))
+    assert estimate.rotation == 0
+    assert estimate.skew == pytest.approx(-angle, abs=0.25)
+
+
+def test_known_rotation_only_estimates_skew(text_page):
+    rotated = np.ascontiguousarray(np.rot90(_rotate_skew(text_page, 2.0)))
+    estimate = estimate_orientation(rotated, rotation=270)
+    assert (estimate.rotation, estimate.confidence) == (270, 1.0)
+    assert estimate.skew == pytest.approx(-2.0, abs=0.25)
+
+
+def test_blank_page_is_upright():
+    estimate = estimate_orientation(np.full((300, 200), 250, dtype=np.uint8))
+    assert (estimate.rotation, estimate.skew, estimate.confidence) == (0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_set_orientation_restores_page(text_page, library):
+    rotated = np.ascontiguousarray(np.rot90(text_page, 3))
+    img = ImageObject.create_from_opencv(rotated, library=library, max_size=None)
+    assert img.set_orientation().rotation == 90
+    assert img.to_image_opencv().shape == text_page.shape
+    assert img.get_orientation().rotation == 0
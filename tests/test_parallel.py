@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+#
+import numpy as np
+import pytest
+from digitalized.documents.image import ImageObject, ImageStream, run_parallel
+
+
+def _square(num: int) -> int:
+    if num == 5:
+        raise ValueError("item 5")
+    return num * num
+
+
+def _width(img: ImageObject) -> int:
+    return img.get_width()
+
+
+def test_order_and_exceptions():
+    results = run_parallel(_square, range(8), workers=2, return_exceptions=True, window=3)
+    assert [r for r in results if not isinstance(r, Exception)] == [0, 1, 4, 9, 16, 36, 49]
+    assert isinstance(results[5], ValueError)
+    with pytest.raises(ValueError) as exc:
+        run_parallel(_square, list(range(8)), workers=2)
+    assert "erro no item 5" in "".join(exc.value.__notes__)
+    assert len(run_parallel(_square, [], workers=2)) == 0
+
+
+def test_generator_items():
+    # Itens sem len(): lidos conforme a janela libera espaço.
+    results = run_parallel(_square, (num for num in range(40) if num != 5), workers=2, window=2)
+    assert list(results) == [num * num for num in range(40) if num != 5]
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_stream_apply_operations(page_pixels, shared_memory):
+    stream = ImageStream([ImageObject.create_from_opencv(page_pixels) for _ in range(3)])
+    for img in stream:
+        img.set_rotation(90)
+    expected = np.rot90(ImageObject.create_from_opencv(page_pixels).to_image_opencv())
+    stream.parallel_apply_operations(workers=2, shared_memory=shared_memory)
+    assert all(not img.has_operations() for img in stream)
+    assert list(stream.parallel_apply(_width, workers=2)) == [page_pixels.shape[0]] * 3
+    assert all(img.to_image_opencv().shape == expected.shape for img in stream)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+#
+import math
+import pytest
+
+fitz = pytest.importorskip("pymupdf")
+
+from digitalized.documents.pdf.pdf_document import DocumentPdf, iter_images_from_pdf
+from digitalized.documents.pdf.pdf_convert import ConvertPdfToImages
+from digitalized.documents.pdf.pdf_page import pixmap_to_image
+from digitalized.documents.image.blank import BlankPageDetector
+
+# A4 em pontos (1/72 pol.)
+_A4 = (595, 842)
+
+
+def _create_pdf_bytes(num_pages: int = 2) -> bytes:
+    doc = fitz.open()
+    for num in range(num_pages):
+        page = doc.new_page(width=_A4[0], height=_A4[1])
+        page.insert_text((72, 72), f"Pagina {num}", fontsize=24)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _page_size(dpi: int) -> tuple:
+    # O PyMuPDF arredonda o pixmap para cima.
+    return math.ceil(_A4[0] * dpi / 72), math.ceil(_A4[1] * dpi / 72)
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_pixmap_keeps_dpi_resolution(library):
+    doc = fitz.open(stream=_create_pdf_bytes(1), filetype="pdf")
+    pix = doc[0].get_pixmap(dpi=300)
+    img = pixmap_to_image(pix, library=library)
+    assert (img.get_width(), img.get_height()) == (pix.width, pix.height) == _page_size(300)
+    doc.close()
+
+
+def test_pixmap_max_size():
+    doc = fitz.open(stream=_create_pdf_bytes(1), filetype="pdf")
+    img = pixmap_to_image(doc[0].get_pixmap(dpi=300), library="pil", max_size=(1980, 720))
+    assert img.get_height() == 720
+    doc.close()
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_iter_images_from_pdf_dimensions(library):
+    images = list(iter_images_from_pdf(_create_pdf_bytes(2), dpi=200, lib_image=library))
+    assert len(images) == 2
+    assert all((img.get_width(), img.get_height()) == _page_size(200) for img in images)
+
+
+def test_converter_dimensions():
+    document = DocumentPdf.create_from_bytes(_create_pdf_bytes(2))
+    converter = ConvertPdfToImages.create_from_document(document)
+    sizes = [(img.get_width(), img.get_height()) for img in converter.iter_images(dpi=300)]
+    assert sizes == [_page_size(300)] * 2
+
+
+def test_create_from_pages_keeps_selected_pages():
+    document = DocumentPdf.create_from_bytes(_create_pdf_bytes(3))
+    pages = document.to_pages()
+    # get_num_page() começa em 1.
+    assert [page.get_num_page() for page in pages] == [1, 2, 3]
+    merged = DocumentPdf.create_from_pages([pages[2], pages[0]])
+    texts = [page.get_text().strip() for page in merged.to_pages()]
+    assert texts == ["Pagina 2", "Pagina 0"]
+
+
+def test_blank_pdf_pages():
+    doc = fitz.open()
+    doc.new_page(width=_A4[0], height=_A4[1])
+    page = doc.new_page(width=_A4[0], height=_A4[1])
+    page.insert_text((72, 72), "Pagina com texto", fontsize=24)
+    page = doc.new_page(width=_A4[0], height=_A4[1])
+    # Conteúdo apenas com fundo branco: precisa renderizar para classificar.
+    page.draw_rect(page.rect, color=(1, 1, 1), fill=(1, 1, 1))
+    document = DocumentPdf.create_from_bytes(doc.tobytes())
+    doc.close()
+    pages = document.to_pages()
+    assert [page.is_blank() for page in pages] == [True, False, True]
+
+    detector = BlankPageDetector()
+    converter = ConvertPdfToImages.create_from_document(document)
+    images = list(converter.iter_images(dpi=72, blank_detector=detector))
+    assert len(images) == 1
+    report = detector.get_report()
+    assert (report.checked, report.blank, report.skipped) == (3, 2, 2)
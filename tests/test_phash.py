@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+import cv2
+import numpy as np
+import pytest
+from digitalized.documents.image import DuplicateIndex, ImageObject, ImageStream, compute_hash, hamming_distance
+from digitalized.documents.image.phash import HASH_METHODS, ImageHash
+
+
+def _create_page(seed: int) -> np.ndarray:
+    """Página com blocos de texto em posições aleatórias (cada seed gera um layout)."""
+    rng = np.random.default_rng(seed)
+    img = np.full((1100, 800), 240, dtype=np.uint8)
+    for num in range(12):
+        x, y = int(rng.integers(20, 500)), 80 + num * 85
+        cv2.rectangle(img, (x, y), (x + int(rng.integers(100, 280)), y + 40), int(rng.integers(0, 120)), -1)
+    return img
+
+
+def _rescan(gray: np.ndarray) -> np.ndarray:
+    """Mesma página digitalizada de novo: JPEG, brilho diferente, ruído e outra resolução."""
+    jpeg = cv2.imdecode(cv2.imencode(".jpg", gray, [cv2.IMWRITE_JPEG_QUALITY, 60])[1], cv2.IMREAD_GRAYSCALE)
+    noisy = jpeg.astype(np.float64) + np.random.default_rng(0).normal(10, 5, jpeg.shape)
+    noisy = np.clip(noisy, 0, 255).astype(np.uint8)
+    return cv2.resize(noisy, (600, 825), interpolation=cv2.INTER_AREA)
+
+
+@pytest.mark.parametrize("method", HASH_METHODS)
+def test_rescanned_page_is_near(method):
+    page = _create_page(1)
+    h = compute_hash(page, method)
+    assert h.distance(compute_hash(page, method)) == 0
+    assert h.distance(compute_hash(_rescan(page), method)) <= 4
+    assert h.distance(compute_hash(_create_page(2), method)) > 16
+
+
+def test_hash_value_and_errors():
+    h = compute_hash(_create_page(1), "phash", 8)
+    assert 0 <= h.value < 2 ** 64 and len(str(h)) == 16
+    assert hamming_distance(0b1011, 0b0001) == 2
+    with pytest.raises(ValueError):
+        h.distance(compute_hash(_create_page(1), "dhash", 8))
+    with pytest.raises(ValueError):
+        compute_hash(_create_page(1), "whash")
+
+
+def test_duplicate_index():
+    index = DuplicateIndex(max_distance=4)
+    pages = [_create_page(seed) for seed in range(40)]
+    assert all(index.match_or_add(num, compute_hash(page)) is None for num, page in enumerate(pages))
+    assert len(index) == 40
+    key, distance = index.find(compute_hash(_rescan(pages[17])))
+    assert key == 17 and distance <= 4
+    assert index.match_or_add("rescan", compute_hash(_rescan(pages[3]))) == 3
+    assert len(index) == 40
+    with pytest.raises(ValueError):
+        index.add("phash", ImageHash(0, "phash"))
+
+
+def test_stream_duplicates():
+    pages = [_create_page(1), _create_page(2), _rescan(_create_page(1)), _create_page(3), _create_page(2)]
+    stream = ImageStream([ImageObject.create_from_opencv(page) for page in pages])
+    assert stream.get_duplicates() == [None, None, 0, None, 1]
+    assert len(stream.get_unique()) == 3
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+#
+import os
+import numpy as np
+import pytest
+from digitalized.documents.image.image import ImageObject
+from digitalized.documents.image.shared import (
+    SharedImageHandle, SharedImageStore, run_shared_stage
+)
+
+
+def _segment_exists(handle: SharedImageHandle) -> bool:
+    return os.path.exists(f"/dev/shm/{handle.name}")
+
+
+def rotate_image(img: ImageObject) -> ImageObject:
+    # Nível do módulo: enviada aos processos filhos com pickle.
+    img.set_rotation(90)
+    img.apply_operations()
+    return img
+
+
+def get_image_size(img: ImageObject) -> tuple:
+    return img.get_width(), img.get_height()
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_round_trip(page_pixels, library):
+    img = ImageObject.create_from_opencv(page_pixels, library=library)
+    with SharedImageStore() as store:
+        handle = store.put(img)
+        loaded = store.load(handle)
+        assert np.array_equal(np.asarray(loaded.to_image_pil()), np.asarray(img.to_image_pil()))
+        assert loaded.get_color_mode() == img.get_color_mode()
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="Sem /dev/shm")
+def test_release_removes_segment(page_pixels):
+    store = SharedImageStore()
+    handle = store.put(ImageObject.create_from_opencv(page_pixels))
+    store.acquire(handle)
+    assert store.get_refcount(handle) == 2
+    store.release(handle)
+    assert _segment_exists(handle)
+    store.release(handle)
+    assert not _segment_exists(handle)
+    assert len(store) == 0
+    with pytest.raises(ValueError):
+        store.release(handle)
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="Sem /dev/shm")
+def test_close_removes_all_segments(page_pixels):
+    store = SharedImageStore()
+    handles = [store.put(ImageObject.create_from_opencv(page_pixels)) for _ in range(3)]
+    store.close()
+    assert not any(_segment_exists(handle) for handle in handles)
+
+
+def test_run_shared_stage(page_pixels):
+    height, width = page_pixels.shape[:2]
+    with SharedImageStore() as store:
+        handles = [store.put(ImageObject.create_from_opencv(page_pixels)) for _ in range(3)]
+        rotated = run_shared_stage(rotate_image, handles, store=store, workers=2, release_inputs=True)
+        assert len(store) == 3
+        assert all(isinstance(handle, SharedImageHandle) for handle in rotated)
+        sizes = run_shared_stage(get_image_size, rotated, store=store, workers=2)
+        assert list(sizes) == [(height, width)] * 3
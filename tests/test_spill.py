@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+import os
+import cv2
+import numpy as np
+import pytest
+from soup_files import Directory
+from digitalized.documents.image import ImageObject, ImageStream, SpillStore
+
+
+def _create_pages(page_pixels: np.ndarray, library: str, total: int = 6) -> list[ImageObject]:
+    pages = []
+    for num in range(total):
+        pixels = page_pixels.copy()
+        pixels[0, 0] = num
+        pages.append(ImageObject.create_from_opencv(pixels, library=library))
+    return pages
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_spill_round_trip(page_pixels, library):
+    page_size = page_pixels.nbytes
+    store = SpillStore(memory_budget=page_size * 2)
+    stream = ImageStream(_create_pages(page_pixels, library), spill_store=store)
+    stats = stream.get_memory_stats()
+    assert stats.resident_bytes <= page_size * 2
+    assert stats.spilled_items >= 4
+    assert len(os.listdir(store.get_dir())) == stats.spilled_items
+
+    # Pixels iguais depois de carregar de volta, limite mantido durante a leitura.
+    for num, img in enumerate(stream):
+        pixels = cv2.imdecode(np.frombuffer(img.to_bytes(), np.uint8), cv2.IMREAD_COLOR)
+        assert np.all(pixels[0, 0] == num)
+        assert np.array_equal(pixels[1:], page_pixels[1:])
+        # Somente a imagem atual pode passar do limite.
+        assert store.get_stats().resident_bytes <= store.memory_budget + img.get_resident_bytes()
+    assert store.get_stats().faults >= 4
+    store.close()
+    assert not os.path.exists(store.get_dir())
+
+
+def test_spill_encoded_bytes(page_png):
+    store = SpillStore(memory_budget=0)
+    stream = ImageStream([ImageObject.create_from_bytes(page_png) for _ in range(3)], spill_store=store)
+    # Apenas a última imagem adicionada fica em memória.
+    stats = stream.get_memory_stats()
+    assert (stats.resident_items, stats.spilled_items) == (1, 2)
+    assert stats.spilled_bytes == len(page_png) * 2
+    assert all(img.to_bytes() == page_png for img in stream)
+    store.close()
+
+
+def test_without_store_nothing_is_spilled(page_pixels):
+    stream = ImageStream(_create_pages(page_pixels, "opencv", 3))
+    stats = stream.get_memory_stats()
+    assert (stats.resident_items, stats.spilled_items) == (3, 0)
+    assert stats.resident_bytes == page_pixels.nbytes * 3
+
+
+def test_spill_file_removed_with_image(tmp_path, page_pixels):
+    store = SpillStore(memory_budget=0, temp_dir=Directory(str(tmp_path / "spill")))
+    pages = _create_pages(page_pixels, "opencv", 2)
+    for img in pages:
+        store.add(img.get_implementation())
+    assert len(os.listdir(store.get_dir())) == 1
+    del img
+    pages.pop(0)
+    assert os.listdir(store.get_dir()) == []
+
+
+def test_negative_budget():
+    with pytest.raises(ValueError):
+        SpillStore(memory_budget=-1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+from io import BytesIO
+import numpy as np
+import pytest
+from PIL import Image
+from soup_files import File
+from digitalized.documents.image import ImageStream
+from digitalized.documents.image.image import ImageObject
+from digitalized.documents.image.lazy import LazyImageStream
+from digitalized.documents.image.tiff import (
+    TiffImageSource, TiffWriter, get_tiff_num_frames, iter_tiff_frames, write_tiff
+)
+
+
+def _create_pages(page_pixels) -> list[ImageObject]:
+    color = ImageObject.create_from_opencv(page_pixels)
+    gray = ImageObject.create_from_opencv(page_pixels)
+    gray.set_color_mode("gray")
+    binary = ImageObject.create_from_opencv(page_pixels)
+    binary.set_color_mode("binary")
+    return [color, gray, binary]
+
+
+def test_round_trip(page_pixels):
+    pages = _create_pages(page_pixels)
+    buffer = ImageStream(pages).to_tiff()
+    data = buffer.getvalue()
+    assert get_tiff_num_frames(data) == 3
+
+    frames = list(iter_tiff_frames(data))
+    assert len(frames) == 3
+    for page, frame in zip(pages, frames):
+        # LZW e Group 4 não têm perdas.
+        assert np.array_equal(frame.to_image_opencv(), page.to_image_opencv())
+    assert np.array_equal(np.asarray(frames[0].to_image_pil()), np.asarray(pages[0].to_image_pil()))
+    assert frames[2].get_color_mode() == "binary"
+
+
+def test_bitonal_pages_use_group4(page_pixels):
+    buffer = write_tiff(_create_pages(page_pixels))
+    with Image.open(buffer) as tiff:
+        compressions = []
+        for num in range(tiff.n_frames):
+            tiff.seek(num)
+            compressions.append(tiff.info.get("compression"))
+    assert compressions[2] == "group4"
+    assert compressions[0] != "group4"
+
+
+def test_write_to_file_and_lazy_read(tmp_path, page_pixels):
+    output = File(str(tmp_path / "pages.tiff"))
+    pages = _create_pages(page_pixels)
+    write_tiff(pages, output)
+    stream = LazyImageStream(TiffImageSource(output), prefetch=1)
+    assert len(stream) == 3
+    assert np.array_equal(stream[1].to_image_opencv(), pages[1].to_image_opencv())
+
+
+def test_empty_tiff_rejected():
+    with pytest.raises(ValueError):
+        write_tiff([])
+
+
+def test_writer_close(page_pixels):
+    buffer = BytesIO()
+    with TiffWriter(buffer) as writer:
+        for page in _create_pages(page_pixels):
+            writer.add_image(page)
+        assert len(writer) == 3
+    # O buffer do chamador continua aberto e o TIFF está completo.
+    assert not buffer.closed
+    assert get_tiff_num_frames(buffer.getvalue()) == 3
+    with pytest.raises(ValueError):
+        writer.add_image(_create_pages(page_pixels)[0])
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_frames_keep_scanner_resolution(library):
+    # Página A4 em 300 dpi: maior que DEFAULT_MAX_SIZE, não deve ser reduzida.
+    page = ImageObject.create_from_opencv(np.full((3508, 2480), 255, dtype=np.uint8), max_size=None)
+    frame = next(iter_tiff_frames(write_tiff([page]).getvalue(), library=library))
+    assert (frame.get_width(), frame.get_height()) == (2480, 3508)
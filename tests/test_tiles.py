@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+#
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from digitalized.documents.image import PreprocessPipeline, TiledExecutor, set_tiled_executor
+from digitalized.documents.image.image import ImageInvertColor
+
+
+@pytest.fixture
+def noisy_gray() -> np.ndarray:
+    rng = np.random.default_rng(5)
+    gray = np.tile(np.linspace(120, 250, 300), (421, 1)).astype(np.uint8)
+    return np.clip(gray + rng.normal(0, 25, gray.shape), 0, 255).astype(np.uint8)
+
+
+def _create_executor(img: np.ndarray, tile_rows: int = 40) -> TiledExecutor:
+    """Executor que sempre divide img em faixas de aproximadamente tile_rows linhas."""
+    return TiledExecutor(img[0].nbytes * tile_rows * 3 * 4, workers=3, min_pixels=0)
+
+
+@pytest.mark.parametrize("pipeline", [
+    PreprocessPipeline().add_gaussian(5).add_adaptive_threshold(255, 11, 2).add_invert(),
+    PreprocessPipeline().add_bilateral(9, 75, 75).add_morphology("open", 2),
+    PreprocessPipeline().add_adaptive_threshold(255, 31, 5).add_morphology("close", 3),
+])
+def test_tiled_equals_full_image(noisy_gray, pipeline):
+    executor = _create_executor(noisy_gray)
+    halo = pipeline.get_halo()
+    assert executor.get_tile_rows(noisy_gray, halo) < noisy_gray.shape[0]
+    assert np.array_equal(executor.run(noisy_gray, pipeline.run, halo), pipeline.run(noisy_gray))
+
+
+def test_tile_function_may_change_channels(page_pixels):
+    def _to_gray(img: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    result = _create_executor(page_pixels, 16).run(page_pixels, _to_gray, 0)
+    assert result.shape == page_pixels.shape[:2]
+    assert np.array_equal(result, _to_gray(page_pixels))
+
+
+def test_small_image_runs_once(noisy_gray):
+    calls = []
+
+    def _func(img: np.ndarray) -> np.ndarray:
+        calls.append(img.shape)
+        return img.copy()
+
+    TiledExecutor(min_pixels=noisy_gray.size + 1).run(noisy_gray, _func, 2)
+    assert calls == [noisy_gray.shape]
+    with pytest.raises(ValueError):
+        TiledExecutor(0)
+
+
+@pytest.mark.parametrize("library", ["opencv", "pil"])
+def test_invert_color_tiled(noisy_gray, library):
+    def _run(executor: TiledExecutor | None) -> np.ndarray:
+        old = set_tiled_executor(executor)
+        try:
+            if library == "pil":
+                inv = ImageInvertColor.create_from_pil(Image.fromarray(noisy_gray))
+            else:
+                inv = ImageInvertColor.create_from_opencv(noisy_gray)
+            inv.set_adaptive_threshold(15, 3)
+            return np.asarray(inv.get_real_module())
+        finally:
+            set_tiled_executor(old)
+
+    assert np.array_equal(_run(_create_executor(noisy_gray)), _run(None))
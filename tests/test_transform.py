@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+#
+from digitalized.documents.image.image import ImageObject
+from digitalized.documents.image.transform import ImageOperation, collapse_operations, fit_size
+
+
+def test_collapse_opposite_rotations():
+    ops = [ImageOperation.rotation(90), ImageOperation.rotation(270)]
+    assert collapse_operations(ops) == []
+
+
+def test_collapse_sums_rotations():
+    ops = [ImageOperation.rotation(90), ImageOperation.rotation(90)]
+    assert collapse_operations(ops) == [ImageOperation.rotation(180)]
+
+
+def test_collapse_moves_resize_before_filters():
+    ops = [
+        ImageOperation("background", ("gray",)),
+        ImageOperation("gaussian"),
+        ImageOperation.resize(800, 600),
+    ]
+    assert collapse_operations(ops) == [
+        ImageOperation.resize(800, 600),
+        ImageOperation("background", ("gray",)),
+        ImageOperation("gaussian"),
+    ]
+
+
+def test_collapse_keeps_smallest_resize():
+    ops = [ImageOperation.resize(800, 600), ImageOperation("gaussian"), ImageOperation.resize(1000, 400)]
+    assert collapse_operations(ops) == [ImageOperation.resize(800, 400), ImageOperation("gaussian")]
+
+
+def test_collapse_keeps_resize_after_rotation():
+    ops = [ImageOperation.rotation(90), ImageOperation.resize(800, 600)]
+    assert collapse_operations(ops) == ops
+
+
+def test_collapse_color_conversions():
+    ops = [ImageOperation.color("bgr"), ImageOperation.color("gray")]
+    assert collapse_operations(ops) == [ImageOperation.color("gray")]
+    ops = [ImageOperation.color("gray"), ImageOperation.color("bgr")]
+    assert collapse_operations(ops) == ops
+
+
+def test_collapse_keeps_only_last_optimize():
+    ops = [ImageOperation("optimize"), ImageOperation.rotation(90)]
+    assert collapse_operations(ops) == [ImageOperation.rotation(90)]
+    ops = [ImageOperation.rotation(90), ImageOperation("optimize")]
+    assert collapse_operations(ops) == ops
+
+
+def test_queued_operations_final_size(page_png, page_pixels):
+    height, width = page_pixels.shape[:2]
+    img = ImageObject.create_from_bytes(page_png, library="opencv")
+    img.set_rotation(90)
+    img.set_max_size(100, 100)
+    # Apenas operações geométricas: dimensões calculadas sem processar os pixels.
+    expected = fit_size(height, width, 100, 100)
+    assert (img.get_width(), img.get_height()) == expected
+    assert img.get_implementation().has_operations()
+    result = img.to_image_opencv()
+    assert (result.shape[1], result.shape[0]) == expected
+
+
+def test_queued_resize_runs_before_background(page_png):
+    img = ImageObject.create_from_bytes(page_png, library="opencv")
+    img.set_background("gray")
+    img.set_max_size(100, 100)
+    operations = collapse_operations(img.get_implementation().get_operations())
+    assert [op.name for op in operations] == ["resize", "background"]
+    result = img.to_image_opencv()
+    assert (result.shape[1], result.shape[0]) == (100, 62)